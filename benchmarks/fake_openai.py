@@ -0,0 +1,342 @@
+"""
+A local OpenAI-compatible server for load tests, answering with canned completions after a simulated latency.
+
+It serves the two endpoints the chatbot uses, `GET /v1/models/{model}` and `POST /v1/chat/completions`,
+the latter with or without streaming. JSON-mode completions answer the topic classification and topic
+change prompts; other completions answer with a canned counter-argument. A share of the completions
+can fail with a server error, to exercise the retries and fallbacks.
+
+Point the chatbot at it with OPENAI_BASE_URL, which the OpenAI client reads on creation.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.fake_openai --port 8089 --latency lognormal:0.4,0.5 --error-rate 0.01
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=fake uvicorn chatbot.adapters.api.main:app
+"""
+import argparse
+import http.server
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+COUNTER_ARGUMENT = (
+    "That claim ignores the evidence. The sources you rely on have been questioned for decades, "
+    "and the people who repeat them rarely check where they came from."
+)
+
+# Keywords of the scripted debates, mapped to the topic and stance the classifier answers for them.
+CLASSIFICATIONS = (
+    ("moon", "Moon Landing", "anti-moon-landing"),
+    ("vaccin", "Vaccines", "pro-vaccine"),
+    ("climate", "Climate Change", "pro-climate-change"),
+    ("flat", "Flat Earth", "anti-flat-earth"),
+)
+
+
+def parse_latency(spec: str, rng: random.Random) -> Callable[[], float]:
+    """
+    Parses a latency distribution.
+
+    Args:
+        spec (str): "constant:S", "uniform:MIN,MAX" or "lognormal:MEDIAN,SIGMA", in seconds. "0" disables
+            the latency.
+        rng (random.Random): The random generator to sample with.
+
+    Returns:
+        Callable[[], float]: A function sampling a latency, in seconds.
+
+    Raises:
+        ValueError: If the spec is not valid.
+    """
+    if spec in ("", "0"):
+        return lambda: 0.0
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(value) for value in params.split(",")]
+    except ValueError:
+        raise ValueError(f"Invalid latency parameters: {spec}") from None
+    if kind == "constant" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: rng.uniform(values[0], values[1])
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0])
+        return lambda: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Invalid latency distribution: {spec}")
+
+
+def _completion_content(body: Dict[str, Any]) -> str:
+    """
+    Builds the answer of a completion request.
+
+    Args:
+        body (Dict[str, Any]): The request body.
+
+    Returns:
+        str: The content of the assistant message.
+    """
+    messages: List[Dict[str, Any]] = body.get("messages", [])
+    if (body.get("response_format") or {}).get("type") != "json_object":
+        return COUNTER_ARGUMENT
+
+    prompt = " ".join(str(message.get("content", "")) for message in messages)
+    if "is_topic_change" in prompt:
+        return '{"is_topic_change": false}'
+    user_message = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "").lower()
+    for keyword, topic, stance in CLASSIFICATIONS:
+        if keyword in user_message:
+            return orjson.dumps({"topic": topic, "stance": stance}).decode()
+    return '{"topic": "General", "stance": "neutral"}'
+
+
+def _usage(body: Dict[str, Any], content: str) -> Dict[str, int]:
+    """
+    Estimates the usage block of a completion, counting a token per four characters.
+
+    Args:
+        body (Dict[str, Any]): The request body.
+        content (str): The content of the answer.
+
+    Returns:
+        Dict[str, int]: The usage block.
+    """
+    prompt_tokens = sum(len(str(message.get("content", ""))) for message in body.get("messages", [])) // 4
+    completion_tokens = len(content) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens
+    }
+
+
+class FakeOpenAIServer:
+    """
+    OpenAI-compatible HTTP server running on a background thread.
+
+    Each completion waits for a latency sampled from the configured distribution before answering, or
+    before the first chunk when streaming, and fails with `error_status` with probability `error_rate`.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: str = "0",
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        chunk_delay_seconds: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Initializes the FakeOpenAIServer and binds its port.
+
+        Args:
+            host (str): The interface to listen on.
+            port (int): The port to listen on, 0 for any free port.
+            latency (str): The latency distribution of the completions, see `parse_latency`.
+            error_rate (float): The share of completions failing, between 0 and 1.
+            error_status (int): The HTTP status of the failed completions.
+            chunk_delay_seconds (float): The delay between two chunks of a streamed completion.
+            seed (Optional[int]): The seed of the latency and error sampling.
+        """
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._sample_latency = parse_latency(latency, self._rng)
+        self._error_rate = error_rate
+        self._error_status = error_status
+        self._chunk_delay_seconds = chunk_delay_seconds
+        self._counts_lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self._server = http.server.ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """
+        The URL to set as OPENAI_BASE_URL.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        """
+        Starts serving on a daemon thread.
+
+        Returns:
+            FakeOpenAIServer: The server itself.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops serving and closes the port.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _next_outcome(self) -> Tuple[float, bool]:
+        """
+        Samples the latency of a completion and whether it fails, and counts it.
+
+        Returns:
+            Tuple[float, bool]: The latency, in seconds, and True if the completion must fail.
+        """
+        with self._rng_lock:
+            latency = max(0.0, self._sample_latency())
+            failed = self._rng.random() < self._error_rate
+        with self._counts_lock:
+            self.requests += 1
+            self.errors += failed
+        return latency, failed
+
+    def _handler_class(self) -> type:
+        """
+        Builds the request handler class bound to this server.
+
+        Returns:
+            type: The BaseHTTPRequestHandler subclass.
+        """
+        fake = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # The headers and the body are written separately; with Nagle's algorithm, the body then
+            # waits for the client's delayed ACK, adding about 40 ms to every completion.
+            disable_nagle_algorithm = True
+
+            def _send_json(self, status: int, payload: Dict[str, Any]):
+                data = orjson.dumps(payload)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                match = re.fullmatch(r"/v1/models/(.+)", self.path)
+                if not match:
+                    self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+                    return
+                self._send_json(200, {"id": match.group(1), "object": "model", "created": 0, "owned_by": "fake"})
+
+            def do_POST(self):
+                body = orjson.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path != "/v1/chat/completions":
+                    self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+                    return
+
+                latency, failed = fake._next_outcome()
+                time.sleep(latency)
+                if failed:
+                    self._send_json(
+                        fake._error_status, {"error": {"message": "Injected failure", "type": "server_error"}}
+                    )
+                    return
+
+                content = _completion_content(body)
+                completion = {
+                    "id": f"chatcmpl-{uuid.uuid4().hex}",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                }
+                if body.get("stream"):
+                    self._stream(completion, content, body)
+                    return
+                self._send_json(200, {
+                    **completion,
+                    "object": "chat.completion",
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop"
+                    }],
+                    "usage": _usage(body, content)
+                })
+
+            def _stream(self, completion: Dict[str, Any], content: str, body: Dict[str, Any]):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+
+                def send(delta: Dict[str, Any], finish_reason: Optional[str] = None, **extra):
+                    chunk = {
+                        **completion,
+                        "object": "chat.completion.chunk",
+                        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                        **extra
+                    }
+                    self.wfile.write(b"data: " + orjson.dumps(chunk) + b"\n\n")
+                    self.wfile.flush()
+
+                send({"role": "assistant", "content": ""})
+                for word in re.findall(r"\S+\s*", content):
+                    time.sleep(fake._chunk_delay_seconds)
+                    send({"content": word})
+                send({}, finish_reason="stop")
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    self.wfile.write(
+                        b"data: " + orjson.dumps({
+                            **completion, "object": "chat.completion.chunk", "choices": [],
+                            "usage": _usage(body, content)
+                        }) + b"\n\n"
+                    )
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    """
+    Serves the fake OpenAI API until interrupted.
+    """
+    parser = argparse.ArgumentParser(description="Serve a fake OpenAI-compatible API for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", default="lognormal:0.4,0.5",
+                        help="constant:S, uniform:MIN,MAX or lognormal:MEDIAN,SIGMA, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--chunk-delay-ms", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        chunk_delay_seconds=args.chunk_delay_ms / 1000,
+        seed=args.seed
+    ).start()
+    print(f"Serving a fake OpenAI API at {server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,509 @@
+"""
+Drives scripted multi-turn debates against /chat and reports the throughput and latency percentiles.
+
+By default the API runs in process, with the OpenAI provider pointed at a local fake OpenAI server (see
+`benchmarks.fake_openai`) through OPENAI_BASE_URL, and the load test is run once per repository:
+in memory, fakeredis, or a Redis server. Each virtual user sends its own X-API-Key, so the per-client
+limits apply as they would in production; the rate limiter is disabled. With --url, a running service
+is driven over HTTP instead, and must be pointed at a fake server started separately.
+
+The end-to-end latency is measured by the client. In process, the per-stage percentiles are computed
+from the exact duration of every stage, collected with a stage observer. Against a running service,
+they are read from the `chatbot_stage_duration_seconds` histograms of /metrics, scraped before and after
+the run, and interpolated within the histogram buckets, which are up to hundreds of milliseconds wide:
+the report marks them as approximate.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.load_test --repository memory fakeredis --users 16 --debates 200
+    PYTHONPATH=src python -m benchmarks.load_test --latency lognormal:0.3,0.6 --error-rate 0.02 --json report.json
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import httpx
+import orjson
+import redis
+from fakeredis import FakeStrictRedis
+from prometheus_client.parser import text_string_to_metric_families
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from chatbot.adapters.api import main as api
+from chatbot.adapters.api.main import app
+from chatbot.adapters.llm.http_client import build_http_client
+from chatbot.adapters.llm.openai_provider import OpenAIProvider
+from chatbot.adapters.observability.metrics import add_stage_observer, remove_stage_observer
+from chatbot.adapters.storage.idempotency import InMemoryIdempotencyStore
+from chatbot.adapters.storage.in_memory import InMemoryConversationRepository
+from chatbot.adapters.storage.jobs import InMemoryJobQueue
+from chatbot.adapters.storage.redis_repository import RedisConversationRepository
+from chatbot.bootstrap import get_chat_service, get_idempotency_store, get_job_queue
+from chatbot.domain.ports import ConversationRepository
+from chatbot.domain.services import ChatService, MAX_USER_MESSAGES
+
+REPOSITORIES = ("memory", "fakeredis", "redis")
+STAGE_HISTOGRAM = "chatbot_stage_duration_seconds"
+FALLBACK_COUNTER = "chatbot_fallbacks_total"
+
+# Each debate opens on a stance the fake classifier recognizes and follows up on the same topic.
+DEBATES: Tuple[Tuple[str, ...], ...] = (
+    (
+        "The moon landing was staged in a studio.",
+        "The flag is waving even though there is no air on the moon.",
+        "There are no stars in any of the photos.",
+        "The shadows point in different directions.",
+        "Nobody has been back in fifty years.",
+    ),
+    (
+        "Vaccines are safe and save millions of lives.",
+        "Smallpox was eradicated thanks to vaccination.",
+        "Side effects are rare and closely monitored.",
+        "Herd immunity protects those who cannot be vaccinated.",
+        "Clinical trials involve tens of thousands of people.",
+    ),
+    (
+        "Climate change is caused by human activity.",
+        "CO2 levels are higher than in the last 800,000 years.",
+        "Glaciers are retreating on every continent.",
+        "The last decade was the warmest on record.",
+        "Sea levels are rising faster every year.",
+    ),
+    (
+        "The earth is flat and the horizon proves it.",
+        "Water always finds its level, it never curves.",
+        "Pilots never adjust for the curvature.",
+        "You can see distant cities that should be hidden.",
+        "The photos from space are all edited.",
+    ),
+)
+
+
+class StageStats(NamedTuple):
+    """Latency percentiles of a stage, in seconds."""
+    count: int
+    p50: float
+    p95: float
+    p99: float
+
+
+class LoadTestReport(NamedTuple):
+    """Outcome of a load test run."""
+    target: str
+    turns: int
+    failures: int
+    seconds: float
+    throughput: float
+    latency: StageStats
+    stages: Dict[str, StageStats]
+    approximate_stages: bool
+    statuses: Dict[int, int]
+    fallbacks: Dict[str, int]
+
+
+def _percentile(sorted_values: Sequence[float], quantile: float) -> float:
+    """
+    Returns a percentile of sorted values, by the nearest-rank method.
+
+    Args:
+        sorted_values (Sequence[float]): The values, in ascending order.
+        quantile (float): The quantile, between 0 and 1.
+
+    Returns:
+        float: The percentile, or 0 if there are no values.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * quantile // 1))
+    return sorted_values[int(rank) - 1]
+
+
+def _histogram_quantile(buckets: List[Tuple[float, float]], quantile: float) -> float:
+    """
+    Estimates a quantile from cumulative histogram buckets, interpolating linearly within the bucket it falls
+    in, as Prometheus' histogram_quantile does.
+
+    Args:
+        buckets (List[Tuple[float, float]]): The (upper bound, cumulative count) pairs, in ascending order,
+            ending with the +Inf bucket.
+        quantile (float): The quantile, between 0 and 1.
+
+    Returns:
+        float: The estimated quantile, in the unit of the bounds.
+    """
+    total = buckets[-1][1]
+    if total <= 0:
+        return 0.0
+    rank = quantile * total
+    lower_bound, lower_count = 0.0, 0.0
+    for upper_bound, count in buckets:
+        if count >= rank:
+            if upper_bound == float("inf"):
+                return lower_bound
+            if count == lower_count:
+                return upper_bound
+            return lower_bound + (upper_bound - lower_bound) * (rank - lower_count) / (count - lower_count)
+        lower_bound, lower_count = upper_bound, count
+    return lower_bound
+
+
+def _parse_metrics(text: str) -> Tuple[Dict[str, Dict[float, float]], Dict[str, float]]:
+    """
+    Extracts the stage histogram buckets and the fallback counts from a /metrics exposition.
+
+    Args:
+        text (str): The exposition, in the Prometheus text format.
+
+    Returns:
+        Tuple[Dict[str, Dict[float, float]], Dict[str, float]]: The cumulative counts by stage and bucket
+            upper bound, and the fallback counts by operation.
+    """
+    buckets: Dict[str, Dict[float, float]] = {}
+    fallbacks: Dict[str, float] = {}
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            if sample.name == f"{STAGE_HISTOGRAM}_bucket":
+                buckets.setdefault(sample.labels["stage"], {})[float(sample.labels["le"])] = sample.value
+            elif sample.name == FALLBACK_COUNTER:
+                fallbacks[sample.labels["operation"]] = sample.value
+    return buckets, fallbacks
+
+
+def _histogram_stage_stats(
+    before: Dict[str, Dict[float, float]], after: Dict[str, Dict[float, float]]
+) -> Dict[str, StageStats]:
+    """
+    Estimates the percentiles of the observations each stage histogram received between two scrapes.
+
+    Args:
+        before (Dict[str, Dict[float, float]]): The buckets scraped before the run.
+        after (Dict[str, Dict[float, float]]): The buckets scraped after the run.
+
+    Returns:
+        Dict[str, StageStats]: The percentiles of every stage observed during the run.
+    """
+    stats = {}
+    for stage, counts in sorted(after.items()):
+        previous = before.get(stage, {})
+        buckets = [(bound, count - previous.get(bound, 0.0)) for bound, count in sorted(counts.items())]
+        total = int(buckets[-1][1])
+        if total > 0:
+            stats[stage] = StageStats(
+                total, *(_histogram_quantile(buckets, quantile) for quantile in (0.5, 0.95, 0.99))
+            )
+    return stats
+
+
+def _sampled_stage_stats(samples: Dict[str, List[float]]) -> Dict[str, StageStats]:
+    """
+    Computes the percentiles of the exact durations of each stage.
+
+    Args:
+        samples (Dict[str, List[float]]): The durations of every stage, in seconds.
+
+    Returns:
+        Dict[str, StageStats]: The percentiles of every stage observed during the run.
+    """
+    stats = {}
+    for stage, durations in sorted(samples.items()):
+        durations = sorted(durations)
+        stats[stage] = StageStats(len(durations), *(_percentile(durations, q) for q in (0.5, 0.95, 0.99)))
+    return stats
+
+
+@contextmanager
+def recording_stage_durations() -> Iterator[Dict[str, List[float]]]:
+    """
+    Collects the exact duration of every stage run in this process while the block runs.
+
+    Yields:
+        Dict[str, List[float]]: The durations by stage, in seconds, appended to as stages complete.
+    """
+    samples: Dict[str, List[float]] = {}
+    lock = threading.Lock()
+
+    def observe(stage: str, seconds: float):
+        with lock:
+            samples.setdefault(stage, []).append(seconds)
+
+    add_stage_observer(observe)
+    try:
+        yield samples
+    finally:
+        remove_stage_observer(observe)
+
+
+async def _run_debates(
+    client: httpx.AsyncClient,
+    user: str,
+    debates: Iterator[int],
+    turns: int,
+    think_seconds: float,
+    latencies: List[float],
+    statuses: Counter
+):
+    """
+    Runs debates as one virtual user until none are left to run.
+
+    A debate stops at its first failed turn, as the following turns would be sent without context.
+
+    Args:
+        client (httpx.AsyncClient): The client of the API.
+        user (str): The API key of the virtual user.
+        debates (Iterator[int]): The numbers of the debates left to run, shared by every virtual user.
+        turns (int): The number of messages sent per debate.
+        think_seconds (float): The pause between two turns of a debate.
+        latencies (List[float]): The list the latency of every turn is appended to, in seconds.
+        statuses (Counter): The counter of the response status codes.
+    """
+    for number in debates:
+        conversation_id = None
+        for message in DEBATES[number % len(DEBATES)][:turns]:
+            payload = {"message": message}
+            if conversation_id:
+                payload["conversation_id"] = conversation_id
+            start = time.perf_counter()
+            response = await client.post("/chat", json=payload, headers={"X-API-Key": user})
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+            if response.status_code != 200:
+                break
+            conversation_id = response.json()["conversation_id"]
+            if think_seconds:
+                await asyncio.sleep(think_seconds)
+
+
+async def run_load_test(
+    client: httpx.AsyncClient,
+    target: str,
+    users: int,
+    debates: int,
+    turns: int = MAX_USER_MESSAGES,
+    think_seconds: float = 0.0,
+    in_process: bool = False
+) -> LoadTestReport:
+    """
+    Runs a load test against the API served to a client.
+
+    Args:
+        client (httpx.AsyncClient): The client of the API.
+        target (str): The name of the target in the report.
+        users (int): The number of concurrent virtual users.
+        debates (int): The total number of debates to run.
+        turns (int): The number of messages sent per debate.
+        think_seconds (float): The pause of a virtual user between two turns of a debate.
+        in_process (bool): Whether the API runs in this process, so that the exact stage durations can be
+            collected instead of being estimated from the /metrics histograms.
+
+    Returns:
+        LoadTestReport: The throughput and latencies of the run.
+    """
+    before, fallbacks_before = _parse_metrics((await client.get("/metrics")).text)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    remaining = iter(range(debates))
+
+    with recording_stage_durations() as samples:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            _run_debates(client, f"load-test-{user}", remaining, turns, think_seconds, latencies, statuses)
+            for user in range(users)
+        ))
+        seconds = time.perf_counter() - start
+
+    after, fallbacks_after = _parse_metrics((await client.get("/metrics")).text)
+    latencies.sort()
+    return LoadTestReport(
+        target=target,
+        turns=len(latencies),
+        failures=sum(count for status, count in statuses.items() if status != 200),
+        seconds=seconds,
+        throughput=len(latencies) / seconds if seconds else 0.0,
+        latency=StageStats(len(latencies), *(_percentile(latencies, q) for q in (0.5, 0.95, 0.99))),
+        stages=_sampled_stage_stats(samples) if in_process else _histogram_stage_stats(before, after),
+        approximate_stages=not in_process,
+        statuses=dict(statuses),
+        fallbacks={
+            operation: int(count - fallbacks_before.get(operation, 0.0))
+            for operation, count in sorted(fallbacks_after.items())
+            if count > fallbacks_before.get(operation, 0.0)
+        }
+    )
+
+
+def build_repository(kind: str, redis_url: Optional[str] = None) -> ConversationRepository:
+    """
+    Builds the conversation repository of a load test.
+
+    Args:
+        kind (str): "memory", "fakeredis" or "redis".
+        redis_url (Optional[str]): The URL of the Redis server, for "redis".
+
+    Returns:
+        ConversationRepository: The repository.
+    """
+    if kind == "memory":
+        return InMemoryConversationRepository()
+    if kind == "fakeredis":
+        return RedisConversationRepository(client=FakeStrictRedis(decode_responses=True))
+    return RedisConversationRepository(
+        client=redis.from_url(redis_url or "redis://localhost:6379", decode_responses=True)
+    )
+
+
+@asynccontextmanager
+async def in_process_client(repository: ConversationRepository) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Serves the API in process over a repository, with the OpenAI provider sending its requests to
+    OPENAI_BASE_URL.
+
+    The API dependencies are overridden and the rate limit is lifted for the duration of the context, and
+    the application lifespan is not run, so that nothing connects to the Redis server configured by the
+    environment.
+
+    Args:
+        repository (ConversationRepository): The conversation repository.
+
+    Yields:
+        httpx.AsyncClient: A client of the API.
+    """
+    http_client = build_http_client()
+    summary_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="summary")
+    chat_service = ChatService(
+        repository=repository,
+        ai_provider=OpenAIProvider(http_client=http_client),
+        summary_executor=summary_executor
+    )
+    job_queue = InMemoryJobQueue()
+    idempotency_store = InMemoryIdempotencyStore()
+    app.dependency_overrides.update({
+        get_chat_service: lambda: chat_service,
+        get_job_queue: lambda: job_queue,
+        get_idempotency_store: lambda: idempotency_store,
+    })
+    rate_limiter, api.rate_limiter = api.rate_limiter, None
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://chatbot", timeout=None
+        ) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+        api.rate_limiter = rate_limiter
+        summary_executor.shutdown(wait=True)
+        http_client.close()
+
+
+def format_report(report: LoadTestReport) -> str:
+    """
+    Renders a report as a table.
+
+    Args:
+        report (LoadTestReport): The report.
+
+    Returns:
+        str: The table.
+    """
+    lines = [
+        f"{report.target}: {report.turns} turns in {report.seconds:.1f} s, {report.throughput:.1f} turns/s, "
+        f"{report.failures} failed, statuses {report.statuses}",
+        f"  {'stage':<20} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}",
+    ]
+    if report.approximate_stages:
+        lines.insert(1, "  stage percentiles are approximate, interpolated within the /metrics histogram buckets")
+    for stage, stats in [("end_to_end", report.latency)] + list(report.stages.items()):
+        lines.append(
+            f"  {stage:<20} {stats.count:>7} {stats.p50 * 1000:>9.1f} {stats.p95 * 1000:>9.1f} {stats.p99 * 1000:>9.1f}"
+        )
+    if report.fallbacks:
+        lines.append(f"  fallbacks: {report.fallbacks}")
+    return "\n".join(lines)
+
+
+def _report_json(report: LoadTestReport) -> Dict:
+    """
+    Converts a report to a JSON-serializable dict.
+
+    Args:
+        report (LoadTestReport): The report.
+
+    Returns:
+        Dict: The report, with the latencies as dicts.
+    """
+    return {
+        **report._asdict(),
+        "latency": report.latency._asdict(),
+        "stages": {stage: stats._asdict() for stage, stats in report.stages.items()},
+        "statuses": {str(status): count for status, count in report.statuses.items()},
+    }
+
+
+async def _main(args: argparse.Namespace) -> List[LoadTestReport]:
+    """
+    Runs the load tests requested on the command line.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        List[LoadTestReport]: The report of every run.
+    """
+    run = dict(users=args.users, debates=args.debates, turns=args.turns, think_seconds=args.think_ms / 1000)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=None) as client:
+            return [await run_load_test(client, args.url, **run)]
+
+    reports = []
+    with FakeOpenAIServer(
+        latency=args.latency, error_rate=args.error_rate, chunk_delay_seconds=0.0, seed=args.seed
+    ) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "fake")
+        for kind in args.repository:
+            async with in_process_client(build_repository(kind, args.redis_url)) as client:
+                reports.append(await run_load_test(client, kind, in_process=True, **run))
+    return reports
+
+
+def main():
+    """
+    Runs the load tests and prints their reports, failing if a p95 budget is exceeded.
+    """
+    parser = argparse.ArgumentParser(description="Load test /chat with scripted debates.")
+    parser.add_argument("--repository", nargs="+", choices=REPOSITORIES, default=["memory", "fakeredis"])
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL"))
+    parser.add_argument("--url", help="Drive a running service instead of serving the API in process")
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--debates", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=MAX_USER_MESSAGES, choices=range(1, MAX_USER_MESSAGES + 1))
+    parser.add_argument("--think-ms", type=float, default=0.0)
+    parser.add_argument("--latency", default="lognormal:0.2,0.5",
+                        help="Latency of the fake completions: constant:S, uniform:MIN,MAX or lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", help="Also write the reports to this file")
+    parser.add_argument("--max-p95-ms", type=float, help="Exit with status 1 if an end-to-end p95 exceeds it")
+    parser.add_argument("--log-level", default="WARNING", help="Level of the API logs, which go to stderr")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(args.log_level)
+
+    reports = asyncio.run(_main(args))
+    for report in reports:
+        print(format_report(report))
+    if args.json:
+        with open(args.json, "wb") as file:
+            file.write(orjson.dumps([_report_json(report) for report in reports], option=orjson.OPT_INDENT_2))
+    if args.max_p95_ms is not None and any(r.latency.p95 * 1000 > args.max_p95_ms for r in reports):
+        print(f"End-to-end p95 over the {args.max_p95_ms} ms budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
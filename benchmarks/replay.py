@@ -0,0 +1,380 @@
+"""
+Replays a traffic recording through ChatService, with the AI provider answering from the recording.
+
+Record a session by running the API with TRAFFIC_RECORDING_PATH set (see `TrafficRecordingMiddleware`).
+Each recorded chat turn is then sent to ChatService at its original offset divided by --speed, and
+every provider call it makes waits for the recorded duration, also divided by --speed, before returning
+the recorded result. Turns of a conversation are replayed in order, each after the previous one
+finished.
+
+Only the turns that were processed are replayed. Turns answered with an error, replayed from the
+idempotency store or queued for a worker are skipped, and so are turns of conversations that started
+before the recording. Provider calls that were not recorded, like the summaries refreshed in the
+background, answer at once with a neutral result.
+
+Recorded classifications keep their known debate stance, so new conversations take the same path as
+when they were recorded. Those that were answered from the opening argument pool, with no debate
+response recorded, are answered from an in-memory pool stocked with as many openings before the run.
+Recordings masking every classification label replay every turn through a live debate response.
+
+The report gives the throughput, the latency percentiles of ChatService, how late turns started
+compared to the schedule, and the CPU used by the process per turn, to compare two versions of the
+code on the same load shape.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.replay traffic.ndjson --speed 10 --repository fakeredis --json replay.json
+"""
+import argparse
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+
+import orjson
+
+from benchmarks.load_test import REPOSITORIES, StageStats, _percentile, build_repository
+from chatbot.adapters.storage.opening_pool import InMemoryOpeningArgumentPool
+from chatbot.domain.models import ChatMessage
+from chatbot.domain.ports import ConversationRepository, GenerativeAIProvider
+from chatbot.domain.services import DEBATE_TOPICS, OPPOSING_STANCES, ChatService
+
+REPLAYED_STATUS = 200
+POOLED_OPENING = "x" * 200
+
+_recorded_calls: ContextVar[Optional[Deque[Dict[str, Any]]]] = ContextVar("recorded_calls", default=None)
+
+
+class ReplayedAIProvider(GenerativeAIProvider):
+    """
+    AI provider answering the calls of the turn being replayed with their recorded results, after their
+    recorded duration divided by the replay speed.
+
+    A call that does not match the next recorded call of the turn answers at once with a neutral result,
+    and is counted as unrecorded.
+    """
+
+    def __init__(self, speed: float = 1.0):
+        """
+        Initializes the ReplayedAIProvider.
+
+        Args:
+            speed (float): How many times faster than recorded the calls answer.
+        """
+        self._speed = speed
+        self._lock = threading.Lock()
+        self.unrecorded = 0
+
+    def _replay(self, operation: str, default: Any) -> Any:
+        """
+        Answers a call with the next recorded call of the turn, if it is of the same operation.
+
+        Args:
+            operation (str): The name of the provider method.
+            default (Any): The result of an unrecorded call.
+
+        Returns:
+            Any: The recorded result, or the default.
+
+        Raises:
+            RuntimeError: If the recorded call failed.
+        """
+        calls = _recorded_calls.get()
+        if not calls or calls[0]["operation"] != operation:
+            with self._lock:
+                self.unrecorded += 1
+            return default
+
+        call = calls.popleft()
+        time.sleep(call["duration_ms"] / 1000 / self._speed)
+        if "error" in call:
+            raise RuntimeError(f"Recorded {operation} failure: {call['error']}")
+        return call["result"]
+
+    def get_debate_response(
+        self, topic: str, position: str, history: List[ChatMessage], summary: Optional[str] = None
+    ) -> str:
+        """
+        Replays a debate response.
+
+        Args:
+            topic (str): The current debate topic.
+            position (str): The position to maintain.
+            history (List[ChatMessage]): The recent chat messages.
+            summary (Optional[str]): A summary of the earlier turns.
+
+        Returns:
+            str: The recorded response.
+        """
+        return self._replay("get_debate_response", "x" * 200)
+
+    def classify_topic_and_stance(self, message: str) -> dict:
+        """
+        Replays a classification.
+
+        Args:
+            message (str): The user's message.
+
+        Returns:
+            dict: The recorded topic and stance.
+        """
+        return self._replay("classify_topic_and_stance", {"topic": "General", "stance": "neutral"})
+
+    def get_opening_argument(self, topic: str, position: str) -> str:
+        """
+        Replays an opening argument.
+
+        Args:
+            topic (str): The debate topic.
+            position (str): The position the argument must defend.
+
+        Returns:
+            str: The recorded argument.
+        """
+        return self._replay("get_opening_argument", "x" * 200)
+
+    def summarize(self, previous_summary: str, messages: List[ChatMessage]) -> str:
+        """
+        Replays a summary update.
+
+        Args:
+            previous_summary (str): The current summary.
+            messages (List[ChatMessage]): The messages to add to the summary.
+
+        Returns:
+            str: The recorded summary, or the previous one.
+        """
+        return self._replay("summarize", previous_summary)
+
+    def is_topic_change(self, message: str, original_topic: str) -> bool:
+        """
+        Replays a topic change check.
+
+        Args:
+            message (str): The user's message.
+            original_topic (str): The current topic of the conversation.
+
+        Returns:
+            bool: The recorded answer.
+        """
+        return self._replay("is_topic_change", False)
+
+
+class ReplayReport(NamedTuple):
+    """Outcome of a replay."""
+    turns: int
+    pooled_openings: int
+    skipped: int
+    failures: int
+    unrecorded_calls: int
+    seconds: float
+    throughput: float
+    latency: StageStats
+    lag: StageStats
+    cpu_seconds: float
+    cpu_ms_per_turn: float
+
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    """
+    Reads the records of a traffic recording, in the order of their arrival.
+
+    Args:
+        path (str): The path of the NDJSON recording.
+
+    Returns:
+        List[Dict[str, Any]]: The records.
+    """
+    with open(path, "rb") as file:
+        records = [orjson.loads(line) for line in file if line.strip()]
+    return sorted(records, key=lambda record: record["offset"])
+
+
+def _is_replayed(record: Dict[str, Any]) -> bool:
+    """
+    Tells whether a recorded turn was processed, and can then be replayed.
+
+    Args:
+        record (Dict[str, Any]): The record.
+
+    Returns:
+        bool: True if the turn was processed.
+    """
+    return record["status"] == REPLAYED_STATUS and not record["replayed"]
+
+
+def stock_opening_pool(records: List[Dict[str, Any]]) -> InMemoryOpeningArgumentPool:
+    """
+    Builds an opening argument pool holding one opening for every new conversation that was answered
+    from the pool when recorded: its only provider call is a classification on a known stance.
+
+    Args:
+        records (List[Dict[str, Any]]): The records.
+
+    Returns:
+        InMemoryOpeningArgumentPool: The stocked pool.
+    """
+    pool = InMemoryOpeningArgumentPool()
+    for record in records:
+        calls = record["provider_calls"]
+        if not _is_replayed(record) or record["conversation_id"] or len(calls) != 1:
+            continue
+        result = calls[0].get("result")
+        if calls[0]["operation"] == "classify_topic_and_stance" and isinstance(result, dict) and (
+            result.get("stance") in OPPOSING_STANCES
+        ):
+            bot_stance = OPPOSING_STANCES[result["stance"]]
+            pool.push(topic=DEBATE_TOPICS[bot_stance], stance=bot_stance, arguments=[POOLED_OPENING])
+    return pool
+
+
+def _pool_size(pool: InMemoryOpeningArgumentPool) -> int:
+    """
+    Counts the opening arguments left in a pool, over every known stance.
+
+    Args:
+        pool (InMemoryOpeningArgumentPool): The pool.
+
+    Returns:
+        int: The number of opening arguments.
+    """
+    return sum(
+        pool.size(topic=DEBATE_TOPICS[bot_stance], stance=bot_stance) for bot_stance in set(OPPOSING_STANCES.values())
+    )
+
+
+def replay(
+    records: List[Dict[str, Any]],
+    repository: ConversationRepository,
+    speed: float = 1.0,
+    workers: int = 64
+) -> ReplayReport:
+    """
+    Replays recorded chat turns through a ChatService over a repository.
+
+    Args:
+        records (List[Dict[str, Any]]): The records, in the order of their arrival.
+        repository (ConversationRepository): The repository of the replayed conversations.
+        speed (float): How many times faster than recorded to replay.
+        workers (int): How many turns can be processed at once.
+
+    Returns:
+        ReplayReport: The latencies and CPU use of the replay.
+    """
+    provider = ReplayedAIProvider(speed=speed)
+    opening_pool = stock_opening_pool(records)
+    stocked_openings = _pool_size(opening_pool)
+    chat_service = ChatService(repository=repository, ai_provider=provider, opening_pool=opening_pool)
+    latencies: List[float] = []
+    lags: List[float] = []
+    failures = 0
+    skipped = 0
+    conversations: Dict[str, Future] = {}
+    lock = threading.Lock()
+
+    def run_turn(record: Dict[str, Any], scheduled: float, previous: Optional[Future]) -> Optional[str]:
+        nonlocal failures
+        conversation_id = previous.result() if previous else None
+        if previous and conversation_id is None:
+            return None
+        started = time.perf_counter()
+        token = _recorded_calls.set(deque(record["provider_calls"]))
+        try:
+            conversation = chat_service.process_message(record["message"], conversation_id)
+        except Exception:
+            with lock:
+                failures += 1
+            return None
+        finally:
+            _recorded_calls.reset(token)
+        with lock:
+            latencies.append(time.perf_counter() - started)
+            lags.append(max(0.0, started - scheduled))
+        return conversation.id
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="replay") as executor:
+        for record in records:
+            previous = conversations.get(record["conversation_id"]) if record["conversation_id"] else None
+            if not _is_replayed(record) or (record["conversation_id"] and previous is None):
+                skipped += 1
+                continue
+            scheduled = start + record["offset"] / speed
+            time.sleep(max(0.0, scheduled - time.perf_counter()))
+            future = executor.submit(run_turn, record, scheduled, previous)
+            if record["response_conversation_id"]:
+                conversations[record["response_conversation_id"]] = future
+    seconds = time.perf_counter() - start
+    cpu_seconds = time.process_time() - cpu_start
+
+    latencies.sort()
+    lags.sort()
+    return ReplayReport(
+        turns=len(latencies),
+        pooled_openings=stocked_openings - _pool_size(opening_pool),
+        skipped=skipped,
+        failures=failures,
+        unrecorded_calls=provider.unrecorded,
+        seconds=seconds,
+        throughput=len(latencies) / seconds if seconds else 0.0,
+        latency=StageStats(len(latencies), *(_percentile(latencies, q) for q in (0.5, 0.95, 0.99))),
+        lag=StageStats(len(lags), *(_percentile(lags, q) for q in (0.5, 0.95, 0.99))),
+        cpu_seconds=cpu_seconds,
+        cpu_ms_per_turn=cpu_seconds * 1000 / len(latencies) if latencies else 0.0
+    )
+
+
+def format_report(report: ReplayReport) -> str:
+    """
+    Renders a replay report as a table.
+
+    Args:
+        report (ReplayReport): The report.
+
+    Returns:
+        str: The table.
+    """
+    lines = [
+        f"{report.turns} turns in {report.seconds:.1f} s, {report.throughput:.1f} turns/s, "
+        f"{report.failures} failed, {report.skipped} skipped, {report.unrecorded_calls} unrecorded provider calls",
+        f"{report.pooled_openings} conversations opened from the opening argument pool",
+        f"CPU: {report.cpu_seconds:.2f} s, {report.cpu_ms_per_turn:.2f} ms per turn",
+        f"  {'':<10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}",
+    ]
+    for name, stats in (("latency", report.latency), ("lag", report.lag)):
+        lines.append(f"  {name:<10} {stats.p50 * 1000:>9.1f} {stats.p95 * 1000:>9.1f} {stats.p99 * 1000:>9.1f}")
+    return "\n".join(lines)
+
+
+def main():
+    """
+    Replays a recording and prints its report.
+    """
+    parser = argparse.ArgumentParser(description="Replay recorded chat traffic through ChatService.")
+    parser.add_argument("recording", help="The NDJSON file written with TRAFFIC_RECORDING_PATH")
+    parser.add_argument("--speed", type=float, default=1.0, help="How many times faster than recorded to replay")
+    parser.add_argument("--repository", choices=REPOSITORIES, default="memory")
+    parser.add_argument("--redis-url")
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = replay(
+        load_recording(args.recording),
+        build_repository(args.repository, args.redis_url),
+        speed=args.speed,
+        workers=args.workers
+    )
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "wb") as file:
+            file.write(orjson.dumps(
+                {**report._asdict(), "latency": report.latency._asdict(), "lag": report.lag._asdict()},
+                option=orjson.OPT_INDENT_2
+            ))
+
+
+if __name__ == "__main__":
+    main()
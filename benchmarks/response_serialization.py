@@ -0,0 +1,111 @@
+"""
+Measures the CPU spent building the /chat response body at different history lengths.
+
+Compares the previous path (building a ChatResponse, re-validating it against the response model and
+dumping it, as FastAPI does for `response_model`) with the lean path used by /chat (a plain dict dumped
+with orjson), both for the full history and for `only_new` deltas.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.response_serialization
+"""
+import time
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+
+from chatbot.adapters.api.main import _chat_response
+from chatbot.adapters.api.models import ChatResponse
+from chatbot.domain.models import ChatMessage, Conversation
+
+HISTORY_LENGTHS = (10, 100, 1000)
+MESSAGE_TEXT = "Have you considered the historical adverse reactions that caused public skepticism? " * 3
+
+_response_adapter = TypeAdapter(ChatResponse)
+
+
+def _conversation(length: int) -> Conversation:
+    """
+    Builds a conversation with the given number of alternating user and bot messages.
+
+    Args:
+        length (int): The number of messages.
+    """
+    return Conversation(
+        topic="Vaccines",
+        strategy="anti-vaccine",
+        messages=[
+            ChatMessage(role="user" if i % 2 == 0 else "bot", message=MESSAGE_TEXT) for i in range(length)
+        ]
+    )
+
+
+def validated_full(conversation: Conversation) -> bytes:
+    """
+    The previous path: build the response model, re-validate it and dump it.
+
+    Args:
+        conversation (Conversation): The conversation to render.
+    """
+    response = ChatResponse(
+        conversation_id=conversation.id,
+        message=conversation.messages,
+        total_messages=len(conversation.messages)
+    )
+    return _response_adapter.dump_json(_response_adapter.validate_python(response))
+
+
+def lean_full(conversation: Conversation) -> bytes:
+    """
+    The lean path, returning the whole history.
+
+    Args:
+        conversation (Conversation): The conversation to render.
+    """
+    return _chat_response(conversation, 0).body
+
+
+def lean_only_new(conversation: Conversation) -> bytes:
+    """
+    The lean path, returning only the last turn.
+
+    Args:
+        conversation (Conversation): The conversation to render.
+    """
+    return _chat_response(conversation, len(conversation.messages) - 2).body
+
+
+def _cpu_per_call(func: Callable[[Conversation], bytes], conversation: Conversation, min_seconds: float = 0.3) -> float:
+    """
+    Measures the average CPU time of a call, repeating it for at least `min_seconds`.
+
+    Args:
+        func (Callable): The serialization path to measure.
+        conversation (Conversation): The conversation to render.
+        min_seconds (float): The minimum measuring time.
+
+    Returns:
+        float: The CPU time per call, in microseconds.
+    """
+    calls = 0
+    start = time.process_time()
+    while time.process_time() - start < min_seconds:
+        for _ in range(10):
+            func(conversation)
+        calls += 10
+    return (time.process_time() - start) / calls * 1_000_000
+
+
+def main():
+    """
+    Prints the CPU per response of each path for every history length.
+    """
+    paths: List[Callable[[Conversation], bytes]] = [validated_full, lean_full, lean_only_new]
+    print(f"{'messages':>8}  " + "  ".join(f"{path.__name__:>16}" for path in paths) + "   (us CPU per response)")
+    for length in HISTORY_LENGTHS:
+        conversation = _conversation(length)
+        timings = [_cpu_per_call(path, conversation) for path in paths]
+        print(f"{length:>8}  " + "  ".join(f"{timing:>16.1f}" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Measures the CPU and memory the domain models cost per chat turn at different history lengths.
+
+A turn loads the conversation from Redis, appends a user message and a bot reply, copies it into the
+write-behind buffer when enabled and saves it. For each step, compares the previous path with the
+current one:
+
+- load: a single-pass `Conversation.model_validate_json` (current), against parsing with orjson and
+  building the models with `model_construct`, skipping validation.
+- copy: a deep `model_copy` (previous) against `Conversation.snapshot`, which shares the immutable
+  messages (current).
+- save: dumping every message (previous) against dumping only the messages added by the turn (current).
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.turn_models
+"""
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+import orjson
+
+from chatbot.domain.models import ChatMessage, Conversation
+
+HISTORY_LENGTHS = (10, 100, 1000)
+MESSAGE_TEXT = "Have you considered the historical adverse reactions that caused public skepticism? " * 3
+
+
+def _stored(length: int) -> Tuple[str, List[str]]:
+    """
+    Builds the Redis documents of a conversation with the given number of alternating messages.
+
+    Args:
+        length (int): The number of messages.
+
+    Returns:
+        Tuple[str, List[str]]: The metadata document and the message documents.
+    """
+    conversation = Conversation(
+        topic="Vaccines",
+        strategy="anti-vaccine",
+        messages=[
+            ChatMessage(role="user" if i % 2 == 0 else "bot", message=MESSAGE_TEXT) for i in range(length)
+        ]
+    )
+    return (
+        conversation.model_dump_json(exclude={"messages"}),
+        [message.model_dump_json() for message in conversation.messages]
+    )
+
+
+def load_validated(metadata: str, messages: List[str]) -> Conversation:
+    """
+    The current load path: validate the assembled document in a single pass.
+
+    Args:
+        metadata (str): The metadata document.
+        messages (List[str]): The message documents.
+    """
+    return Conversation.model_validate_json(f'{metadata[:-1]},"messages":[{",".join(messages)}]}}')
+
+
+def load_constructed(metadata: str, messages: List[str]) -> Conversation:
+    """
+    The unvalidated load path: parse with orjson and build the models without validation.
+
+    Args:
+        metadata (str): The metadata document.
+        messages (List[str]): The message documents.
+    """
+    fields = orjson.loads(metadata)
+    fields["messages"] = [ChatMessage.model_construct(**orjson.loads(message)) for message in messages]
+    return Conversation.model_construct(**fields)
+
+
+def copy_deep(conversation: Conversation) -> Conversation:
+    """
+    The previous write-behind copy: a deep copy of the conversation and its messages.
+
+    Args:
+        conversation (Conversation): The conversation to copy.
+    """
+    return conversation.model_copy(deep=True)
+
+
+def copy_snapshot(conversation: Conversation) -> Conversation:
+    """
+    The current write-behind copy: a new message list sharing the immutable messages.
+
+    Args:
+        conversation (Conversation): The conversation to copy.
+    """
+    return conversation.snapshot()
+
+
+def save_full(conversation: Conversation) -> List[str]:
+    """
+    The previous save path: dump the metadata and every message.
+
+    Args:
+        conversation (Conversation): The conversation to save.
+    """
+    return [conversation.model_dump_json(exclude={"messages"})] + [
+        message.model_dump_json() for message in conversation.messages
+    ]
+
+
+def save_incremental(conversation: Conversation) -> List[str]:
+    """
+    The current save path: dump the metadata and the two messages of the turn.
+
+    Args:
+        conversation (Conversation): The conversation to save.
+    """
+    return [conversation.model_dump_json(exclude={"messages"})] + [
+        message.model_dump_json() for message in conversation.messages[-2:]
+    ]
+
+
+def _measure(func: Callable, *args, min_seconds: float = 0.3) -> Tuple[float, float]:
+    """
+    Measures the average CPU time of a call, repeating it for at least `min_seconds`, and the memory it allocates.
+
+    Args:
+        func (Callable): The path to measure.
+        *args: The arguments of the call.
+        min_seconds (float): The minimum measuring time.
+
+    Returns:
+        Tuple[float, float]: The CPU time per call, in microseconds, and the peak allocation, in KiB.
+    """
+    calls = 0
+    start = time.process_time()
+    while time.process_time() - start < min_seconds:
+        for _ in range(10):
+            func(*args)
+        calls += 10
+    cpu = (time.process_time() - start) / calls * 1_000_000
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu, peak / 1024
+
+
+def main():
+    """
+    Prints the CPU and peak allocation per turn of each path for every history length.
+    """
+    steps = (("load", load_validated, load_constructed), ("copy", copy_deep, copy_snapshot),
+             ("save", save_full, save_incremental))
+    print(f"{'messages':>8}  {'step':>5}  {'path':>17}  {'us CPU':>10}  {'KiB peak':>10}")
+    for length in HISTORY_LENGTHS:
+        metadata, messages = _stored(length)
+        conversation = load_validated(metadata, messages)
+        for step, *paths in steps:
+            for path in paths:
+                args = (metadata, messages) if step == "load" else (conversation,)
+                cpu, peak = _measure(path, *args)
+                print(f"{length:>8}  {step:>5}  {path.__name__:>17}  {cpu:>10.1f}  {peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+
+
+class InFlightLimiter:
+    """
+    Caps how many requests this process handles at once, in total and per client.
+
+    Requests over a cap are meant to be rejected before any work starts, so that the requests already
+    admitted keep their latency while the service is overloaded.
+    """
+
+    def __init__(self, max_total: int, max_per_client: int):
+        """
+        Initializes the InFlightLimiter.
+
+        Args:
+            max_total (int): How many requests can be in flight at once. Zero disables the cap.
+            max_per_client (int): How many requests a client can have in flight at once. Zero disables the cap.
+        """
+        self._max_total = max_total
+        self._max_per_client = max_per_client
+        self._total = 0
+        self._per_client: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def try_acquire(self, client_id: str) -> Optional[str]:
+        """
+        Admits a request if neither cap is reached.
+
+        Args:
+            client_id (str): The client sending the request.
+
+        Returns:
+            Optional[str]: None if the request is admitted and must be released once handled, otherwise
+                the cap that was reached: "global_in_flight" or "client_in_flight".
+        """
+        with self._lock:
+            if self._max_total and self._total >= self._max_total:
+                return "global_in_flight"
+            if self._max_per_client and self._per_client[client_id] >= self._max_per_client:
+                return "client_in_flight"
+            self._total += 1
+            self._per_client[client_id] += 1
+            return None
+
+    def release(self, client_id: str):
+        """
+        Releases an admitted request.
+
+        Args:
+            client_id (str): The client that sent the request.
+        """
+        with self._lock:
+            self._total -= 1
+            self._per_client[client_id] -= 1
+            if not self._per_client[client_id]:
+                del self._per_client[client_id]
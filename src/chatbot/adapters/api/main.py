@@ -1,43 +1,867 @@
-from datetime import datetime
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import secrets
+import time
+import weakref
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, Optional
 
-from fastapi import FastAPI, HTTPException, Depends
+import orjson
 
-from chatbot.bootstrap import get_chat_service
-from chatbot.domain.ports import ChatUseCase
-from .models import ChatRequest, ChatResponse
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
-app = FastAPI(title="Kopi-challenge API", version="1.0.0")
+from chatbot.adapters.observability.metrics import (
+    METRICS_CONTENT_TYPE, record_first_request, record_shed_request, render_metrics, track_stage
+)
+from chatbot.adapters.observability.profiling import MAX_PROFILE_SECONDS, ProfilerBusyError, profile_cpu, profile_memory
+from chatbot.adapters.observability.structured_logging import configure_logging
+from chatbot.adapters.observability.tracing import REQUEST_ID_HEADER, new_request_id, request_id_var, span
+from chatbot.adapters.observability.readiness import ReadinessProbe
+from chatbot.bootstrap import (
+    get_chat_service, get_idempotency_store, get_job_queue, get_rate_limiter, get_readiness_probe,
+    get_traffic_recorder, shutdown, start_opening_pool_refiller, start_warm_up, write_behind_enabled
+)
+from chatbot.domain.models import Conversation, IdempotencyRecord, Job, TokenUsage
+from chatbot.domain.ports import ChatUseCase, IdempotencyStore, JobQueue
+from .load_shedding import InFlightLimiter
+from .recording import TrafficRecordingMiddleware
+from .models import (
+    BatchChatRequest, BatchChatResponse, ChatRequest, ChatResponse, ConversationCount, ConversationIdsPage,
+    JobAccepted, JobStatus, MessagesPage
+)
+from .responses import ORJSONResponse
 
+configure_logging()
 
-@app.post("/chat", response_model=ChatResponse)
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 200
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+MAX_JOB_WAIT_SECONDS = 30.0
+JOB_POLL_INTERVAL_SECONDS = 0.25
+JOB_RUNNING_TIMEOUT_SECONDS = float(os.getenv("JOB_RUNNING_TIMEOUT_SECONDS", "300"))
+IDEMPOTENCY_WAIT_SECONDS = 30.0
+IDEMPOTENCY_POLL_INTERVAL_SECONDS = 0.1
+LIMITED_PATH_PREFIX = "/chat"
+BATCH_PATH = "/chat/batch"
+OVERLOAD_RETRY_AFTER_SECONDS = 1
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Runs the application, warming up its dependencies and starting the opening argument pool refiller
+    in the background on startup, and releasing its resources on shutdown.
+
+    Args:
+        app (FastAPI): The application.
+    """
+    start_warm_up()
+    await run_in_threadpool(start_opening_pool_refiller)
+    yield
+    await run_in_threadpool(shutdown)
+
+
+app = FastAPI(title="Kopi-challenge API", version="1.0.0", lifespan=lifespan)
+
+in_flight_limiter = InFlightLimiter(
+    max_total=int(os.getenv("MAX_IN_FLIGHT_REQUESTS", "64")),
+    max_per_client=int(os.getenv("MAX_IN_FLIGHT_PER_CLIENT", "4"))
+)
+
+rate_limiter = get_rate_limiter()
+
+
+def _client_id(request: Request) -> str:
+    """
+    Identifies the client of a request by its API key, or by its IP address if it sent none.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        str: The client ID. API keys are hashed so that they are not stored in Redis.
+    """
+    api_key = request.headers.get("X-API-Key")
+    if api_key:
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    return "ip:" + (request.client.host if request.client else "unknown")
+
+
+def _shed(status_code: int, reason: str, detail: str, retry_after: float) -> ORJSONResponse:
+    """
+    Builds the response of a request rejected at the API edge, and counts it.
+
+    Args:
+        status_code (int): 429 if the client is over its limits, 503 if the service is overloaded.
+        reason (str): The limit that was reached.
+        detail (str): The error detail.
+        retry_after (float): How many seconds the client should wait before retrying.
+
+    Returns:
+        ORJSONResponse: The error response, with the Retry-After header set.
+    """
+    record_shed_request(reason)
+    return ORJSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+
+async def _rate_limited(client_id: str, cost: int = 1) -> Optional[ORJSONResponse]:
+    """
+    Counts a request against the rate limit of its client, shared through Redis.
+
+    The limiter is called in the threadpool, as it blocks on Redis. It fails open, so that a Redis outage
+    does not reject every request on its own.
+
+    Args:
+        client_id (str): The client sending the request.
+        cost (int): How many requests to count it as.
+
+    Returns:
+        Optional[ORJSONResponse]: None if the request is allowed, otherwise the 429 to answer.
+    """
+    limiter = rate_limiter
+    if limiter is None:
+        return None
+    try:
+        retry_after = await run_in_threadpool(limiter.acquire, client_id, cost)
+    except Exception as e:
+        logger.warning("Rate limiter unavailable, admitting request: %s", e)
+        return None
+    if retry_after is None:
+        return None
+    return _shed(429, "rate_limit", "Rate limit exceeded", retry_after)
+
+
+async def _release_after(body: AsyncIterator[bytes], release: Callable[[], None]) -> AsyncIterator[bytes]:
+    """
+    Streams a response body, then releases what the request held.
+
+    Args:
+        body (AsyncIterator[bytes]): The response body.
+        release (Callable[[], None]): Called once the body is sent or the request is aborted.
+
+    Yields:
+        bytes: The chunks of the body.
+    """
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        release()
+
+
+@app.middleware("http")
+async def load_shedding_middleware(request: Request, call_next):
+    """
+    Rejects chat requests over the in-flight and rate limits before any work starts.
+
+    The in-flight caps of this process are checked first, as they cost nothing, then the per-client rate
+    limit. A request holds its in-flight slot until its whole response is sent, so that a streamed batch
+    keeps counting while its results are produced. Batches are counted against the rate limit by their
+    size once their body is parsed, see `chat_batch`.
+
+    Args:
+        request (Request): The incoming request.
+        call_next: The next handler in the middleware chain.
+
+    Returns:
+        Response: The response, or a 429 or 503 with Retry-After if the request was rejected.
+    """
+    if not request.url.path.startswith(LIMITED_PATH_PREFIX):
+        return await call_next(request)
+
+    client_id = _client_id(request)
+    limiter = in_flight_limiter
+    reason = limiter.try_acquire(client_id)
+    if reason == "global_in_flight":
+        return _shed(503, reason, "Service overloaded, retry later", OVERLOAD_RETRY_AFTER_SECONDS)
+    if reason == "client_in_flight":
+        return _shed(429, reason, "Too many concurrent requests", OVERLOAD_RETRY_AFTER_SECONDS)
+
+    try:
+        shed = None if request.url.path == BATCH_PATH else await _rate_limited(client_id)
+        if shed is not None:
+            limiter.release(client_id)
+            return shed
+        response = await call_next(request)
+    except BaseException:
+        limiter.release(client_id)
+        raise
+    response.body_iterator = _release_after(response.body_iterator, lambda: limiter.release(client_id))
+    return response
+
+
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    """
+    Binds a request ID to the handling of each request and returns it in the response headers.
+
+    The ID sent by the client in the X-Request-ID header is reused, otherwise a new one is generated.
+
+    Args:
+        request (Request): The incoming request.
+        call_next: The next handler in the middleware chain.
+
+    Returns:
+        Response: The response, with the X-Request-ID header set.
+    """
+    request_id = request.headers.get(REQUEST_ID_HEADER) or new_request_id()
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return response
+
+
+# Added last, so that recorded requests include the time spent in the other middlewares.
+if get_traffic_recorder() is not None:
+    app.add_middleware(TrafficRecordingMiddleware, recorder=get_traffic_recorder())
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """
+    Guards the admin endpoints with the token configured in the ADMIN_TOKEN environment variable.
+
+    Admin endpoints are disabled, and answer 404, when ADMIN_TOKEN is not set.
+
+    Args:
+        x_admin_token (Optional[str]): The token sent in the X-Admin-Token header.
+
+    Raises:
+        HTTPException: 404 if admin endpoints are disabled, 401 if the token is missing or wrong.
+    """
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+def _first_requested_message(conversation: Conversation, only_new: bool, since: Optional[int]) -> int:
+    """
+    Determines the index of the first message to return for a chat request.
+
+    Args:
+        conversation (Conversation): The conversation after the turn.
+        only_new (bool): Whether only the messages of the turn were requested.
+        since (Optional[int]): The index of the first requested message, ignored if `only_new` is set.
+
+    Returns:
+        int: The index of the first message to include in the response.
+    """
+    messages = conversation.messages
+    if only_new:
+        for index in range(len(messages) - 1, -1, -1):
+            if messages[index].role == "user":
+                return index
+        return 0
+    if since is not None:
+        return min(since, len(messages))
+    return 0
+
+
+def _chat_body(conversation: Conversation, start: int) -> Dict[str, Any]:
+    """
+    Builds the /chat response body directly from the conversation.
+
+    Args:
+        conversation (Conversation): The conversation after the turn.
+        start (int): The index of the first message to include.
+
+    Returns:
+        Dict[str, Any]: The body, shaped like ChatResponse.
+    """
+    messages = conversation.messages
+    return {
+        "conversation_id": conversation.id,
+        "message": [{"role": msg.role, "message": msg.message} for msg in messages[start:]],
+        "total_messages": len(messages)
+    }
+
+
+def _chat_response(conversation: Conversation, start: int) -> ORJSONResponse:
+    """
+    Builds the /chat response directly from the conversation.
+
+    Args:
+        conversation (Conversation): The conversation after the turn.
+        start (int): The index of the first message to include.
+
+    Returns:
+        ORJSONResponse: The response, shaped like ChatResponse.
+    """
+    return ORJSONResponse(_chat_body(conversation, start))
+
+
+def _process_chat(request: ChatRequest, async_mode: bool, chat_service: ChatUseCase, job_queue: JobQueue) -> Response:
+    """
+    Processes or queues a chat turn.
+
+    Args:
+        request (ChatRequest): The chat request.
+        async_mode (bool): Whether to queue the turn instead of processing it.
+        chat_service (ChatUseCase): The chat service.
+        job_queue (JobQueue): The job queue.
+
+    Returns:
+        Response: The /chat response, or the 202 acknowledgement of the queued job.
+
+    Raises:
+        HTTPException: 400 if the turn is queued while write-behind persistence is enabled, 404 if the
+            conversation does not exist, 500 on any other processing error.
+    """
+    if async_mode:
+        if write_behind_enabled():
+            raise HTTPException(
+                status_code=400, detail="async=true is unavailable while write-behind persistence is enabled"
+            )
+        job = Job(
+            message=request.message,
+            conversation_id=request.conversation_id,
+            only_new=request.only_new,
+            since=request.since
+        )
+        job_queue.enqueue(job)
+        return ORJSONResponse(
+            {"job_id": job.id, "status": job.status},
+            status_code=202,
+            headers={"Location": f"/jobs/{job.id}"}
+        )
+
+    with track_stage("request"):
+        try:
+            with span("ChatService.process_message", conversation_id=request.conversation_id):
+                conversation = chat_service.process_message(
+                    message=request.message,
+                    conversation_id=request.conversation_id
+                )
+            return _chat_response(conversation, _first_requested_message(conversation, request.only_new, request.since))
+        except ValueError as e:
+            if "Conversation not found" in str(e):
+                raise HTTPException(status_code=404, detail=str(e))
+            else:
+                raise HTTPException(status_code=500, detail=f"Internal error: {e}")
+
+
+def _request_fingerprint(request: ChatRequest, async_mode: bool) -> str:
+    """
+    Digests a chat request, to detect an idempotency key being reused for a different request.
+
+    Args:
+        request (ChatRequest): The chat request.
+        async_mode (bool): Whether the turn is queued instead of processed.
+
+    Returns:
+        str: The SHA-256 hex digest of the request.
+    """
+    payload = orjson.dumps([request.model_dump(), async_mode], option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _claimed_chat(
+    key: str,
+    fingerprint: str,
+    store: IdempotencyStore,
+    process: Callable[[], Response]
+) -> Response:
+    """
+    Processes a chat turn whose idempotency key was claimed, and records its response.
+
+    Client errors are recorded like successes, since a retry would get the same answer. The key is
+    released on server errors so that a retry is processed again.
+
+    Args:
+        key (str): The idempotency key.
+        fingerprint (str): The digest of the request.
+        store (IdempotencyStore): The idempotency store.
+        process (Callable[[], Response]): Processes the turn.
+
+    Returns:
+        Response: The response of the turn.
+    """
+    try:
+        response = process()
+    except HTTPException as e:
+        if e.status_code < 500:
+            body = orjson.dumps({"detail": e.detail}).decode()
+            store.complete(key, IdempotencyRecord(fingerprint=fingerprint, status_code=e.status_code, body=body))
+        else:
+            store.release(key)
+        raise
+    except Exception:
+        store.release(key)
+        raise
+    store.complete(key, IdempotencyRecord(
+        fingerprint=fingerprint, status_code=response.status_code, body=response.body.decode()
+    ))
+    return response
+
+
+async def _idempotent_chat(
+    key: str,
+    fingerprint: str,
+    store: IdempotencyStore,
+    process: Callable[[], Response]
+) -> Response:
+    """
+    Processes a chat turn at most once per idempotency key.
+
+    The first request claims the key and records its response. A duplicate sent while it is in flight
+    polls the store until the response is recorded, for up to IDEMPOTENCY_WAIT_SECONDS, and later
+    duplicates get the recorded response straight away, with the Idempotent-Replayed header set. The
+    store is read in the threadpool, as it blocks on Redis.
+
+    Args:
+        key (str): The idempotency key, namespaced by client.
+        fingerprint (str): The digest of the request.
+        store (IdempotencyStore): The idempotency store.
+        process (Callable[[], Response]): Processes the turn.
+
+    Returns:
+        Response: The response of the turn, processed or replayed.
+
+    Raises:
+        HTTPException: 422 if the key was used for a different request, 409 if the first request is still
+            in flight after the wait.
+    """
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        if await run_in_threadpool(store.claim, key, fingerprint):
+            return await run_in_threadpool(_claimed_chat, key, fingerprint, store, process)
+        record = await run_in_threadpool(store.get, key)
+        if record is None:
+            await asyncio.sleep(IDEMPOTENCY_POLL_INTERVAL_SECONDS)
+            continue
+        if record.fingerprint != fingerprint:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+        if record.status_code is not None:
+            return Response(
+                content=record.body,
+                status_code=record.status_code,
+                media_type="application/json",
+                headers={"Idempotent-Replayed": "true"}
+            )
+        if time.monotonic() >= deadline:
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+        await asyncio.sleep(IDEMPOTENCY_POLL_INTERVAL_SECONDS)
+
+
+@app.post("/chat", response_model=ChatResponse, responses={202: {"model": JobAccepted}})
 async def chat(
     request: ChatRequest,
-    chat_service: ChatUseCase = Depends(get_chat_service)
+    http_request: Request,
+    async_mode: bool = Query(False, alias="async"),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    chat_service: ChatUseCase = Depends(get_chat_service),
+    job_queue: JobQueue = Depends(get_job_queue),
+    idempotency_store: IdempotencyStore = Depends(get_idempotency_store)
 ):
     """
     Processes a chat message and returns the conversation.
 
+    With `async=true` the turn is only queued for a worker, and the response is a 202 with the ID of the
+    job to poll with GET /jobs/{job_id}. With an Idempotency-Key header, retries of a request get the
+    response of the first one instead of being processed again. Keys are scoped to the client, so that
+    clients picking the same key do not see each other's responses. Turns are processed in the threadpool,
+    as they block on Redis and on the AI provider.
+
     Args:
         request (ChatRequest): The request body containing the message and optional conversation ID.
+        http_request (Request): The incoming request, identifying the client.
+        async_mode (bool): Whether to queue the turn instead of processing it.
+        idempotency_key (Optional[str]): The key identifying the request across retries.
         chat_service (ChatUseCase): The chat service dependency.
+        job_queue (JobQueue): The job queue dependency.
+        idempotency_store (IdempotencyStore): The idempotency store dependency.
 
     Returns:
-        ChatResponse: The response containing the conversation ID and messages.
+        ChatResponse: The response containing the conversation ID, the requested messages and the total
+            message count. It is serialized straight to JSON, without re-validating it against the model.
     """
+    def process() -> Response:
+        return _process_chat(request, async_mode, chat_service, job_queue)
+
+    start = time.perf_counter()
+    if idempotency_key is None:
+        response = await run_in_threadpool(process)
+    else:
+        response = await _idempotent_chat(
+            f"{_client_id(http_request)}:{idempotency_key}",
+            _request_fingerprint(request, async_mode),
+            idempotency_store,
+            process
+        )
+    if not async_mode and response.status_code == 200 and "Idempotent-Replayed" not in response.headers:
+        record_first_request(time.perf_counter() - start)
+    return response
+
+
+_batch_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _batch_slots_of_loop() -> asyncio.Semaphore:
+    """
+    Returns the semaphore shared by every batch of the running event loop, which bounds how many batch
+    requests this process processes at once to BATCH_MAX_CONCURRENCY.
+
+    Returns:
+        asyncio.Semaphore: The process-wide batch semaphore.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _batch_slots.get(loop)
+    if semaphore is None:
+        semaphore = _batch_slots[loop] = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+    return semaphore
+
+
+async def _process_batch_item(
+    index: int,
+    request: ChatRequest,
+    chat_service: ChatUseCase,
+    semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """
+    Processes one request of a batch once a slot of its batch and a process-wide batch slot are free.
+
+    Errors are reported in the result with the status code /chat would have answered, so that a failing
+    request does not fail the rest of the batch.
+
+    Args:
+        index (int): The position of the request in the batch.
+        request (ChatRequest): The chat request.
+        chat_service (ChatUseCase): The chat service.
+        semaphore (asyncio.Semaphore): The semaphore bounding how many requests of the batch run at once.
+
+    Returns:
+        Dict[str, Any]: The result, shaped like BatchChatResult.
+    """
+    async with semaphore, _batch_slots_of_loop():
+        try:
+            with span("ChatService.process_message", conversation_id=request.conversation_id, batch_index=index):
+                conversation = await run_in_threadpool(
+                    chat_service.process_message,
+                    message=request.message,
+                    conversation_id=request.conversation_id
+                )
+        except ValueError as e:
+            if "Conversation not found" in str(e):
+                return {"index": index, "status_code": 404, "error": str(e)}
+            return {"index": index, "status_code": 500, "error": f"Internal error: {e}"}
+        except Exception as e:
+            logger.exception("Batch item %d failed", index)
+            return {"index": index, "status_code": 500, "error": f"Internal error: {e}"}
+    return {"index": index, "status_code": 200, **_chat_body(conversation, _first_requested_message(conversation, request.only_new, request.since))}
+
+
+@app.post("/chat/batch", response_model=BatchChatResponse)
+async def chat_batch(
+    batch: BatchChatRequest,
+    http_request: Request,
+    chat_service: ChatUseCase = Depends(get_chat_service)
+):
+    """
+    Processes a batch of chat messages concurrently.
+
+    A batch counts against the rate limit of its client as many requests as it holds. The requests of
+    every batch share BATCH_MAX_CONCURRENCY slots per process, so that concurrent batches stay within the
+    rate limits of the AI provider, and `concurrency` only lowers how many of them a batch can take at
+    once. Requests on the same conversation are not ordered with respect to each other and should be sent
+    in separate batches.
+
+    Args:
+        batch (BatchChatRequest): The chat requests and the processing options.
+        http_request (Request): The incoming request, identifying the client.
+        chat_service (ChatUseCase): The chat service dependency.
+
+    Returns:
+        BatchChatResponse: One result per request, in request order. When `stream` is set, the results are
+            instead streamed as NDJSON lines, one per request, in completion order. A 429 if the batch is
+            over the rate limit.
+    """
+    shed = await _rate_limited(_client_id(http_request), cost=len(batch.requests))
+    if shed is not None:
+        return shed
+
+    concurrency = min(batch.concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [
+        asyncio.ensure_future(_process_batch_item(index, request, chat_service, semaphore))
+        for index, request in enumerate(batch.requests)
+    ]
+
+    if batch.stream:
+        async def results():
+            try:
+                for task in asyncio.as_completed(tasks):
+                    yield orjson.dumps(await task) + b"\n"
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(results(), media_type="application/x-ndjson")
+
     try:
-        conversation = chat_service.process_message(
-            message=request.message,
-            conversation_id=request.conversation_id
+        return ORJSONResponse({"results": await asyncio.gather(*tasks)})
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _find_job(job_queue: JobQueue, job_id: str) -> Optional[Job]:
+    """
+    Finds a job, failing it if it has been running for longer than JOB_RUNNING_TIMEOUT_SECONDS.
+
+    Such a job was left behind by a worker that stopped mid-turn. It is not queued again, since its turn
+    may already have been saved.
+
+    Args:
+        job_queue (JobQueue): The job queue.
+        job_id (str): The ID of the job.
+
+    Returns:
+        Optional[Job]: The job, or None if it does not exist.
+    """
+    job = job_queue.get(job_id)
+    if job is None or job.status != "running":
+        return job
+    now = datetime.utcnow()
+    if now - (job.updated_at or job.created_at) > timedelta(seconds=JOB_RUNNING_TIMEOUT_SECONDS):
+        logger.warning("Job %s abandoned by its worker, marking it failed", job.id)
+        job.status = "failed"
+        job.error = "The worker processing the job stopped, submit the message again"
+        job.finished_at = job.updated_at = now
+        job_queue.update(job)
+    return job
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def job_status(
+    job_id: str,
+    wait: float = Query(0.0, ge=0, le=MAX_JOB_WAIT_SECONDS),
+    job_queue: JobQueue = Depends(get_job_queue)
+):
+    """
+    Returns the state of a chat turn submitted with `async=true`, long-polling until it finishes.
+
+    The job is polled every JOB_POLL_INTERVAL_SECONDS without holding a worker thread between polls, so
+    that waiting clients do not take capacity from the requests being processed. A job running for longer
+    than JOB_RUNNING_TIMEOUT_SECONDS is reported as failed.
+
+    Args:
+        job_id (str): The ID of the job.
+        wait (float): How long to wait for the job to finish, in seconds. Zero returns immediately.
+        job_queue (JobQueue): The job queue dependency.
+
+    Returns:
+        JobStatus: The status of the job, with the /chat response once it succeeded.
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        job = await run_in_threadpool(_find_job, job_queue, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if job.status in ("succeeded", "failed") or time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(min(JOB_POLL_INTERVAL_SECONDS, max(deadline - time.monotonic(), 0)))
+
+    result = None
+    if job.result is not None:
+        result = _chat_body(job.result, _first_requested_message(job.result, job.only_new, job.since))
+    return ORJSONResponse({"job_id": job.id, "status": job.status, "result": result, "error": job.error})
+
+
+def _as_naive_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    """
+    Converts a query datetime to the naive UTC convention of the domain.
+
+    Args:
+        moment (Optional[datetime]): The datetime, naive ones are assumed to already be in UTC.
+
+    Returns:
+        Optional[datetime]: The naive UTC datetime, or None.
+    """
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@app.get("/conversations/count", response_model=ConversationCount, dependencies=[Depends(require_admin_token)])
+async def count_conversations(
+    topic: Optional[str] = None,
+    stance: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chat_service: ChatUseCase = Depends(get_chat_service)
+):
+    """
+    Counts the conversations created in a time window, optionally on a topic or with a bot stance.
+
+    Only available with the admin token. The indexes are read in the threadpool, as they block on Redis.
+
+    Args:
+        topic (Optional[str]): Only count conversations on this topic.
+        stance (Optional[str]): Only count conversations where the bot defends this stance.
+        since (Optional[datetime]): Only count conversations created at or after this time.
+        until (Optional[datetime]): Only count conversations created at or before this time.
+        chat_service (ChatUseCase): The chat service dependency.
+
+    Returns:
+        ConversationCount: The number of matching conversations.
+    """
+    try:
+        count = await run_in_threadpool(
+            chat_service.count_conversations,
+            topic=topic, stance=stance, since=_as_naive_utc(since), until=_as_naive_utc(until)
         )
-        return ChatResponse(
-            conversation_id=conversation.id,
-            message=conversation.messages
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ConversationCount(count=count)
+
+
+@app.get("/conversations", response_model=ConversationIdsPage, dependencies=[Depends(require_admin_token)])
+async def list_conversations(
+    topic: Optional[str] = None,
+    stance: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    chat_service: ChatUseCase = Depends(get_chat_service)
+):
+    """
+    Lists the IDs of the conversations created in a time window, optionally on a topic or with a bot stance.
+
+    Only available with the admin token, since knowing the ID of a conversation is enough to read it. The
+    indexes are read in the threadpool, as they block on Redis.
+
+    Args:
+        topic (Optional[str]): Only list conversations on this topic.
+        stance (Optional[str]): Only list conversations where the bot defends this stance.
+        since (Optional[datetime]): Only list conversations created at or after this time.
+        until (Optional[datetime]): Only list conversations created at or before this time.
+        offset (int): The number of matching conversations to skip.
+        limit (int): The maximum number of IDs to return.
+        chat_service (ChatUseCase): The chat service dependency.
+
+    Returns:
+        ConversationIdsPage: The matching conversation IDs, oldest first.
+    """
+    try:
+        conversation_ids = await run_in_threadpool(
+            chat_service.list_conversation_ids,
+            topic=topic, stance=stance, since=_as_naive_utc(since), until=_as_naive_utc(until),
+            offset=offset, limit=limit
         )
     except ValueError as e:
-        if "Conversation not found" in str(e):
-            raise HTTPException(status_code=404, detail=str(e))
-        else:
-            raise HTTPException(status_code=500, detail=f"Internal error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    return ConversationIdsPage(conversation_ids=conversation_ids, offset=offset, limit=limit)
+
+
+@app.get(
+    "/conversations/{conversation_id}/messages",
+    response_model=MessagesPage,
+    dependencies=[Depends(require_admin_token)]
+)
+async def conversation_messages(
+    conversation_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(None),
+    chat_service: ChatUseCase = Depends(get_chat_service)
+):
+    """
+    Returns a page of the messages of a conversation.
+
+    Messages are only ever appended, so the message count identifies the content of every page. It is
+    read together with the page and returned as the ETag. A request with an If-None-Match matching the
+    current count gets a 304 without any messages being read. Only available with the admin token, like
+    the conversation listing, and read in the threadpool, as it blocks on Redis.
+
+    Args:
+        conversation_id (str): The ID of the conversation.
+        offset (int): The index of the first message to return.
+        limit (int): The maximum number of messages to return.
+        if_none_match (Optional[str]): The ETag of the copy the client already has.
+        chat_service (ChatUseCase): The chat service dependency.
+
+    Returns:
+        MessagesPage: The page of messages, or an empty 304 response.
+    """
+    if if_none_match:
+        total = await run_in_threadpool(chat_service.count_messages, conversation_id)
+        if total is None:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+        etag = f'W/"{total}"'
+        if etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    page = await run_in_threadpool(chat_service.get_message_page, conversation_id, offset, limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    total, messages = page
+    headers = {"ETag": f'W/"{total}"', "Cache-Control": "no-cache"}
+    return ORJSONResponse({
+        "conversation_id": conversation_id,
+        "message": [{"role": msg.role, "message": msg.message} for msg in messages],
+        "offset": offset,
+        "limit": limit,
+        "total_messages": total
+    }, headers=headers)
+
+
+@app.get(
+    "/conversations/{conversation_id}/usage",
+    response_model=TokenUsage,
+    dependencies=[Depends(require_admin_token)]
+)
+async def conversation_usage(
+    conversation_id: str,
+    chat_service: ChatUseCase = Depends(get_chat_service)
+):
+    """
+    Returns the tokens and estimated cost spent on a conversation.
+
+    Only available with the admin token. The usage is read in the threadpool, as it blocks on Redis.
+
+    Args:
+        conversation_id (str): The ID of the conversation.
+        chat_service (ChatUseCase): The chat service dependency.
+
+    Returns:
+        TokenUsage: The accumulated usage of the conversation.
+    """
+    usage = await run_in_threadpool(chat_service.get_usage, conversation_id)
+    if usage is None:
+        raise HTTPException(status_code=404, detail="Conversation usage not found")
+    return usage
+
+
+@app.get("/usage", response_model=TokenUsage, dependencies=[Depends(require_admin_token)])
+async def total_usage(chat_service: ChatUseCase = Depends(get_chat_service)):
+    """
+    Returns the tokens and estimated cost spent on all conversations.
+
+    Only available with the admin token. The usage is read in the threadpool, as it blocks on Redis.
+
+    Args:
+        chat_service (ChatUseCase): The chat service dependency.
+
+    Returns:
+        TokenUsage: The aggregate usage.
+    """
+    return await run_in_threadpool(chat_service.get_total_usage)
 
 
 @app.get("/health")
@@ -49,3 +873,51 @@ async def health_check():
         dict: A dictionary indicating the status and current timestamp.
     """
     return {"status": "healthy", "timestamp": datetime.utcnow()}
+
+
+@app.get("/ready")
+async def readiness(probe: ReadinessProbe = Depends(get_readiness_probe)):
+    """
+    Reports whether this process is ready to serve traffic, unlike /health which only reports it is alive.
+
+    Args:
+        probe (ReadinessProbe): The readiness probe dependency.
+
+    Returns:
+        ORJSONResponse: The result of each dependency check, with a 200 status when ready and 503 otherwise.
+    """
+    result = await run_in_threadpool(probe.check)
+    return ORJSONResponse(result, status_code=200 if result["ready"] else 503)
+
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Exposes the service metrics in the Prometheus text exposition format.
+
+    Returns:
+        Response: Stage latency histograms and the fallback, cache, error and token usage counters.
+    """
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.post("/admin/profile", response_class=PlainTextResponse, dependencies=[Depends(require_admin_token)])
+async def profile(
+    mode: str = Query("cpu", pattern="^(cpu|memory)$"),
+    seconds: float = Query(10.0, gt=0, le=MAX_PROFILE_SECONDS)
+):
+    """
+    Profiles this worker for a time window and returns the report.
+
+    Args:
+        mode (str): "cpu" for a sampling CPU profile, "memory" for a tracemalloc snapshot diff.
+        seconds (float): The length of the window.
+
+    Returns:
+        str: The profile report.
+    """
+    profiler = profile_cpu if mode == "cpu" else profile_memory
+    try:
+        return await run_in_threadpool(profiler, seconds)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
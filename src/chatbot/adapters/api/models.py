@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from chatbot.domain.models import ChatMessage
 
@@ -10,9 +10,60 @@ class ChatRequest(BaseModel):
     Attributes:
         conversation_id (Optional[str]): The ID of the ongoing conversation. Defaults to None.
         message (str): The user's message.
+        only_new (bool): If True, the response only contains the messages appended in this turn.
+        since (Optional[int]): If set, the response only contains the messages from this index onwards.
+            Ignored when `only_new` is True.
     """
     conversation_id: Optional[str] = None
     message: str
+    only_new: bool = False
+    since: Optional[int] = Field(default=None, ge=0)
+
+
+class BatchChatRequest(BaseModel):
+    """
+    Represents a batch of chat requests to process concurrently.
+
+    Attributes:
+        requests (List[ChatRequest]): The chat requests, processed independently of each other.
+        concurrency (Optional[int]): How many requests of the batch to process at once. Capped by the
+            server limit, which is also the default and is shared by every batch.
+        stream (bool): If True, results are streamed back as NDJSON lines as soon as each one completes,
+            instead of being returned together in request order.
+    """
+    requests: List[ChatRequest] = Field(min_length=1, max_length=1000)
+    concurrency: Optional[int] = Field(default=None, ge=1)
+    stream: bool = False
+
+
+class BatchChatResult(BaseModel):
+    """
+    Represents the outcome of one request of a batch.
+
+    Attributes:
+        index (int): The position of the request in the batch.
+        status_code (int): The HTTP status code the request would have received on /chat.
+        conversation_id (Optional[str]): The ID of the conversation, if the request succeeded.
+        message (Optional[List[ChatMessage]]): The requested chat messages, if the request succeeded.
+        total_messages (Optional[int]): The total number of messages, if the request succeeded.
+        error (Optional[str]): The error detail, if the request failed.
+    """
+    index: int
+    status_code: int
+    conversation_id: Optional[str] = None
+    message: Optional[List[ChatMessage]] = None
+    total_messages: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BatchChatResponse(BaseModel):
+    """
+    Represents the results of a batch of chat requests.
+
+    Attributes:
+        results (List[BatchChatResult]): One result per request, in request order.
+    """
+    results: List[BatchChatResult]
 
 
 class ChatResponse(BaseModel):
@@ -21,7 +72,79 @@ class ChatResponse(BaseModel):
 
     Attributes:
         conversation_id (str): The ID of the conversation.
-        message (List[ChatMessage]): A list of chat messages in the conversation.
+        message (List[ChatMessage]): The requested chat messages of the conversation, all of them by default.
+        total_messages (int): The total number of messages in the conversation.
+    """
+    conversation_id: str
+    message: List[ChatMessage]
+    total_messages: int
+
+
+class MessagesPage(BaseModel):
+    """
+    Represents a page of the messages of a conversation.
+
+    Attributes:
+        conversation_id (str): The ID of the conversation.
+        message (List[ChatMessage]): The chat messages of the page.
+        offset (int): The index of the first message of the page.
+        limit (int): The maximum number of messages in the page.
+        total_messages (int): The total number of messages in the conversation.
     """
     conversation_id: str
     message: List[ChatMessage]
+    offset: int
+    limit: int
+    total_messages: int
+
+
+class ConversationCount(BaseModel):
+    """
+    Represents the number of conversations matching a query.
+
+    Attributes:
+        count (int): The number of matching conversations.
+    """
+    count: int
+
+
+class ConversationIdsPage(BaseModel):
+    """
+    Represents a page of the IDs of the conversations matching a query.
+
+    Attributes:
+        conversation_ids (List[str]): The conversation IDs, oldest first.
+        offset (int): The number of matching conversations skipped.
+        limit (int): The maximum number of IDs in the page.
+    """
+    conversation_ids: List[str]
+    offset: int
+    limit: int
+
+
+class JobAccepted(BaseModel):
+    """
+    Represents the acknowledgement of a chat turn submitted for asynchronous processing.
+
+    Attributes:
+        job_id (str): The ID to poll with GET /jobs/{job_id}.
+        status (str): The status of the job, "queued".
+    """
+    job_id: str
+    status: str
+
+
+class JobStatus(BaseModel):
+    """
+    Represents the state of a chat turn submitted for asynchronous processing.
+
+    Attributes:
+        job_id (str): The ID of the job.
+        status (str): "queued", "running", "succeeded" or "failed".
+        result (Optional[ChatResponse]): The /chat response, once the job succeeded.
+        error (Optional[str]): The error detail, once the job failed.
+    """
+    job_id: str
+    status: str
+    result: Optional[ChatResponse] = None
+    error: Optional[str] = None
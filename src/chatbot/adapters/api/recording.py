@@ -0,0 +1,139 @@
+import time
+from typing import Any, Dict, List
+
+import orjson
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from chatbot.adapters.observability.recording import TrafficRecorder, recording_provider_calls
+
+RECORDED_PATH = "/chat"
+
+
+class TrafficRecordingMiddleware:
+    """
+    ASGI middleware recording every POST /chat request, its timing and the AI provider calls it made.
+
+    Each request is written as one NDJSON record once its response is sent:
+
+    - `offset`: when the request arrived, in seconds since the recording started;
+    - `client`: a digest of the API key, or of the IP address if there is none;
+    - `message`: the masked user message;
+    - `conversation_id` and `response_conversation_id`: digests of the conversation IDs of the request
+      and of the response, which chain the turns of a conversation;
+    - `status`, `duration_ms` and `replayed`, the latter set if an idempotent response was replayed;
+    - `provider_calls`: the operation, duration and masked result of every AI provider call.
+    """
+
+    def __init__(self, app: ASGIApp, recorder: TrafficRecorder):
+        """
+        Initializes the TrafficRecordingMiddleware.
+
+        Args:
+            app (ASGIApp): The wrapped application.
+            recorder (TrafficRecorder): The recorder the records are written to.
+        """
+        self._app = app
+        self._recorder = recorder
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Handles a request, recording it if it is a chat request.
+
+        Args:
+            scope (Scope): The ASGI connection scope.
+            receive (Receive): The ASGI receive channel.
+            send (Send): The ASGI send channel.
+        """
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] != RECORDED_PATH:
+            await self._app(scope, receive, send)
+            return
+
+        offset = self._recorder.offset()
+        start = time.perf_counter()
+        request_body = bytearray()
+        response_body = bytearray()
+        response: Dict[str, Any] = {"status": 500, "replayed": False}
+
+        async def receive_recorded() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                request_body.extend(message.get("body", b""))
+            return message
+
+        async def send_recorded(message: Message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["replayed"] = "idempotent-replayed" in Headers(raw=message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                response_body.extend(message.get("body", b""))
+            await send(message)
+
+        with recording_provider_calls() as calls:
+            try:
+                await self._app(scope, receive_recorded, send_recorded)
+            finally:
+                self._recorder.write(self._record(
+                    scope, offset, time.perf_counter() - start, bytes(request_body), bytes(response_body),
+                    response, calls
+                ))
+
+    def _record(
+        self,
+        scope: Scope,
+        offset: float,
+        duration: float,
+        request_body: bytes,
+        response_body: bytes,
+        response: Dict[str, Any],
+        calls: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Builds the anonymized record of a chat request.
+
+        Args:
+            scope (Scope): The ASGI connection scope.
+            offset (float): When the request arrived, in seconds since the recording started.
+            duration (float): How long the request took, in seconds.
+            request_body (bytes): The request body.
+            response_body (bytes): The response body.
+            response (Dict[str, Any]): The response status and whether it was replayed.
+            calls (List[Dict[str, Any]]): The AI provider calls of the request.
+
+        Returns:
+            Dict[str, Any]: The record.
+        """
+        request = _json_object(request_body)
+        api_key = Headers(scope=scope).get("x-api-key")
+        client = scope.get("client")
+        message = request.get("message")
+        return {
+            "offset": round(offset, 6),
+            "client": self._recorder.pseudonym(
+                f"key:{api_key}" if api_key else f"ip:{client[0] if client else 'unknown'}"
+            ),
+            "message": self._recorder.mask(message) if isinstance(message, str) else None,
+            "conversation_id": self._recorder.pseudonym(request.get("conversation_id")),
+            "status": response["status"],
+            "duration_ms": round(duration * 1000, 3),
+            "replayed": response["replayed"],
+            "response_conversation_id": self._recorder.pseudonym(_json_object(response_body).get("conversation_id")),
+            "provider_calls": calls,
+        }
+
+
+def _json_object(body: bytes) -> Dict[str, Any]:
+    """
+    Parses a JSON object body.
+
+    Args:
+        body (bytes): The body.
+
+    Returns:
+        Dict[str, Any]: The object, or an empty dict if the body is not a JSON object.
+    """
+    try:
+        value = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return {}
+    return value if isinstance(value, dict) else {}
@@ -0,0 +1,25 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Endpoints returning it hand over plain dicts and lists, which skips both the `response_model`
+    re-validation and `jsonable_encoder`, and serializes several times faster than the standard library.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """
+        Serializes the content to JSON bytes.
+
+        Args:
+            content (Any): The content to serialize.
+
+        Returns:
+            bytes: The JSON document.
+        """
+        return orjson.dumps(content)
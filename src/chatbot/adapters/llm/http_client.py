@@ -0,0 +1,143 @@
+import importlib.util
+import logging
+import os
+from typing import Any, Dict
+
+import httpx
+from chatbot.adapters.observability.metrics import record_http_connection
+
+logger = logging.getLogger(__name__)
+
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY_SECONDS = 30.0
+CONNECT_TIMEOUT_SECONDS = 5.0
+READ_TIMEOUT_SECONDS = 60.0
+WRITE_TIMEOUT_SECONDS = 10.0
+POOL_TIMEOUT_SECONDS = 5.0
+
+
+class _ConnectionTrace:
+    """
+    Trace callback, in the format of the httpcore `trace` request extension, that notes whether a
+    request opened a new connection.
+    """
+
+    def __init__(self):
+        """
+        Initializes the _ConnectionTrace before any event was seen.
+        """
+        self.traced = False
+        self.connected = False
+
+    def __call__(self, event_name: str, info: Dict[str, Any]):
+        """
+        Records a connection event.
+
+        Args:
+            event_name (str): The event, e.g. "connection.connect_tcp.started".
+            info (Dict[str, Any]): The event details, unused.
+        """
+        self.traced = True
+        if event_name == "connection.connect_tcp.started":
+            self.connected = True
+
+
+def _trace_request(request: httpx.Request):
+    """
+    Request hook attaching a connection trace to every request.
+
+    Args:
+        request (httpx.Request): The request about to be sent.
+    """
+    request.extensions["trace"] = _ConnectionTrace()
+
+
+def _record_connection(response: httpx.Response):
+    """
+    Response hook counting whether the request reused a pooled connection.
+
+    Requests served without going through the connection pool, as with mock transports, emit no trace
+    events and are not counted.
+
+    Args:
+        response (httpx.Response): The response whose headers were received.
+    """
+    trace = response.request.extensions.get("trace")
+    if isinstance(trace, _ConnectionTrace) and trace.traced:
+        record_http_connection(response.request.url.host, reused=not trace.connected)
+
+
+def _http2_available() -> bool:
+    """
+    Checks whether the optional `h2` package that httpx needs for HTTP/2 is installed.
+
+    Returns:
+        bool: True if HTTP/2 can be enabled.
+    """
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_http_client(
+    max_connections: int = MAX_CONNECTIONS,
+    max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = KEEPALIVE_EXPIRY_SECONDS,
+    http2: bool = False,
+    connect_timeout: float = CONNECT_TIMEOUT_SECONDS,
+    read_timeout: float = READ_TIMEOUT_SECONDS,
+    write_timeout: float = WRITE_TIMEOUT_SECONDS,
+    pool_timeout: float = POOL_TIMEOUT_SECONDS
+) -> httpx.Client:
+    """
+    Builds an HTTP client meant to be shared by every OpenAI client of the process.
+
+    Every request is traced to count, by host, the requests that opened a new connection and those that
+    reused a pooled one.
+
+    Args:
+        max_connections (int): How many connections can be open at once.
+        max_keepalive_connections (int): How many idle connections are kept open for reuse.
+        keepalive_expiry (float): How long an idle connection is kept open, in seconds.
+        http2 (bool): Whether to multiplex requests over HTTP/2 connections. Ignored, with a warning, if
+            the `h2` package is not installed.
+        connect_timeout (float): How long to wait for a connection to be established, in seconds.
+        read_timeout (float): How long to wait for each chunk of the response, in seconds.
+        write_timeout (float): How long to wait for each chunk of the request to be sent, in seconds.
+        pool_timeout (float): How long to wait for a connection from the pool, in seconds.
+
+    Returns:
+        httpx.Client: The client.
+    """
+    if http2 and not _http2_available():
+        logger.warning("HTTP/2 requested but the h2 package is not installed, falling back to HTTP/1.1")
+        http2 = False
+
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        ),
+        timeout=httpx.Timeout(connect=connect_timeout, read=read_timeout, write=write_timeout, pool=pool_timeout),
+        http2=http2,
+        event_hooks={"request": [_trace_request], "response": [_record_connection]}
+    )
+
+
+def http_client_from_env() -> httpx.Client:
+    """
+    Builds the shared HTTP client from the OPENAI_HTTP_* environment variables.
+
+    Returns:
+        httpx.Client: The client.
+    """
+    return build_http_client(
+        max_connections=int(os.getenv("OPENAI_HTTP_MAX_CONNECTIONS", MAX_CONNECTIONS)),
+        max_keepalive_connections=int(os.getenv("OPENAI_HTTP_MAX_KEEPALIVE_CONNECTIONS", MAX_KEEPALIVE_CONNECTIONS)),
+        keepalive_expiry=float(os.getenv("OPENAI_HTTP_KEEPALIVE_EXPIRY_SECONDS", KEEPALIVE_EXPIRY_SECONDS)),
+        http2=os.getenv("OPENAI_HTTP2", "false").lower() == "true",
+        connect_timeout=float(os.getenv("OPENAI_HTTP_CONNECT_TIMEOUT_SECONDS", CONNECT_TIMEOUT_SECONDS)),
+        read_timeout=float(os.getenv("OPENAI_HTTP_READ_TIMEOUT_SECONDS", READ_TIMEOUT_SECONDS)),
+        write_timeout=float(os.getenv("OPENAI_HTTP_WRITE_TIMEOUT_SECONDS", WRITE_TIMEOUT_SECONDS)),
+        pool_timeout=float(os.getenv("OPENAI_HTTP_POOL_TIMEOUT_SECONDS", POOL_TIMEOUT_SECONDS))
+    )
@@ -1,24 +1,75 @@
 import json
-from typing import List, Any
+import logging
+from typing import List, Any, Optional
+import httpx
 import openai
+from chatbot.adapters.observability.metrics import record_fallback, record_token_usage, timed
+from chatbot.adapters.observability.tracing import request_id_headers, traced
 from chatbot.domain.ports import GenerativeAIProvider
 from chatbot.domain.models import ChatMessage
+from chatbot.domain.usage import record_usage
+
+logger = logging.getLogger(__name__)
+
+# US dollars per million (prompt, completion) tokens. Unknown models are accounted with no cost.
+MODEL_PRICES_PER_MILLION_TOKENS = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
 
 
 class OpenAIProvider(GenerativeAIProvider):
     """Implementation of the Generative AI Provider using the OpenAI API."""
 
-    def __init__(self, model: str = "gpt-4o-mini", api_key: str = None) -> None:
+    def __init__(self, model: str = "gpt-4o-mini", api_key: str = None, http_client: Optional[httpx.Client] = None) -> None:
         """
         Initializes the OpenAI provider.
 
         Args:
             model (str): The name of the OpenAI model to use. Defaults to "gpt-4o-mini".
             api_key (str): The OpenAI API key. If not provided, it will be read from the OPENAI_API_KEY environment variable.
+            http_client (Optional[httpx.Client]): The HTTP client to send requests with, which can be shared by
+                several providers to share its connection pool. Defaults to a client of its own.
         """
         self.model = model
-        self.client = openai.OpenAI(api_key=api_key)
-        print(f"OpenAIProvider initialized with model: {self.model}")
+        self.client = openai.OpenAI(api_key=api_key, http_client=http_client)
+        logger.info("OpenAIProvider initialized with model: %s", self.model)
+
+    @traced("OpenAIProvider.ping")
+    def ping(self, timeout: float = 5.0):
+        """
+        Checks that the OpenAI API is reachable and the API key is accepted, by retrieving the model.
+
+        The request also opens a keep-alive connection that later completions reuse.
+
+        Args:
+            timeout (float): The request timeout, in seconds. The request is not retried.
+
+        Raises:
+            openai.OpenAIError: If the API cannot be reached or rejects the request.
+        """
+        self.client.with_options(timeout=timeout, max_retries=0).models.retrieve(
+            self.model, extra_headers=request_id_headers()
+        )
+
+    def _record_usage(self, response: Any):
+        """
+        Records the token usage and estimated cost of a completion, if the response reports it.
+
+        Args:
+            response (Any): The completion response.
+        """
+        usage = getattr(response, "usage", None)
+        record_token_usage(self.model, usage)
+        if usage is None:
+            return
+        prompt_tokens = usage.prompt_tokens or 0
+        completion_tokens = usage.completion_tokens or 0
+        prompt_price, completion_price = MODEL_PRICES_PER_MILLION_TOKENS.get(self.model, (0.0, 0.0))
+        cost = (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+        record_usage(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, cost=cost)
 
     def _safely_extract_llm_value(self, value: Any) -> str:
         """
@@ -38,6 +89,8 @@ class OpenAIProvider(GenerativeAIProvider):
             return str(value)
         return "Unknown"
 
+    @traced("OpenAIProvider.classify_topic_and_stance")
+    @timed("classification")
     def classify_topic_and_stance(self, message: str) -> dict:
         """
         Uses OpenAI to classify the topic and stance from a given message.
@@ -57,6 +110,7 @@ class OpenAIProvider(GenerativeAIProvider):
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
+                extra_headers=request_id_headers(),
                 messages=[
                     {'role': 'system', 'content': system_prompt},
                     {'role': 'user', 'content': message}
@@ -64,6 +118,7 @@ class OpenAIProvider(GenerativeAIProvider):
                 temperature=0.0,
                 response_format={"type": "json_object"}
             )
+            self._record_usage(response)
             content = json.loads(response.choices[0].message.content)
 
             topic = self._safely_extract_llm_value(content.get("topic"))
@@ -71,10 +126,15 @@ class OpenAIProvider(GenerativeAIProvider):
 
             return {"topic": topic, "stance": stance}
         except (openai.APIError, json.JSONDecodeError, KeyError) as e:
-            print(f"Error processing OpenAI response for classification: {e}")
+            logger.warning("Error processing OpenAI response for classification: %s", e)
+            record_fallback("classification")
             return {"topic": "General", "stance": "neutral"}
 
-    def get_debate_response(self, topic: str, position: str, history: List[ChatMessage]) -> str:
+    @traced("OpenAIProvider.get_debate_response")
+    @timed("generation")
+    def get_debate_response(
+        self, topic: str, position: str, history: List[ChatMessage], summary: Optional[str] = None
+    ) -> str:
         """
         Uses OpenAI to generate a debate response based on a given topic, position, and chat history.
 
@@ -82,6 +142,7 @@ class OpenAIProvider(GenerativeAIProvider):
             topic (str): The current debate topic.
             position (str): The unwavering position to maintain.
             history (List[ChatMessage]): A list of previous chat messages to provide context.
+            summary (Optional[str]): A summary of the earlier turns that are not part of `history`.
 
         Returns:
             str: The generated counter-argument or an error message.
@@ -99,6 +160,8 @@ class OpenAIProvider(GenerativeAIProvider):
         5. Start your response directly with your counter-argument. Do not start with phrases like "As a skeptical debater...".
         """
         messages_for_api = [{'role': 'system', 'content': system_prompt}]
+        if summary:
+            messages_for_api.append({'role': 'system', 'content': f"Summary of the debate so far: {summary}"})
         for msg in history:
             role = "assistant" if msg.role == "bot" else msg.role
             messages_for_api.append({'role': role, 'content': msg.message})
@@ -106,13 +169,86 @@ class OpenAIProvider(GenerativeAIProvider):
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
+                extra_headers=request_id_headers(),
                 messages=messages_for_api
             )
+            self._record_usage(response)
             return response.choices[0].message.content
         except openai.APIError as e:
-            print(f"Error generating OpenAI response: {e}")
+            logger.warning("Error generating OpenAI response: %s", e)
+            record_fallback("generation")
             return "I'm having trouble thinking of a counter-argument right now. Let's try another topic."
 
+    @traced("OpenAIProvider.get_opening_argument")
+    @timed("opening_argument")
+    def get_opening_argument(self, topic: str, position: str) -> str:
+        """
+        Uses OpenAI to generate a generic opening counter-argument for a topic and position.
+
+        Args:
+            topic (str): The debate topic.
+            position (str): The position the argument must defend.
+
+        Returns:
+            str: The generated opening argument.
+
+        Raises:
+            openai.APIError: If the request fails. Pooled arguments are optional, so no fallback text is returned.
+        """
+        system_prompt = f"""
+        You are a skeptical and stubborn debater. Your current debate topic is: {topic}.
+        Your unwavering, explicit position is: {position}.
+        Someone has just stated the opposite position. Reply with your opening counter-argument.
+        Keep it concise, impactful, and in English, and do not refer to anything specific they said.
+        Start your response directly with your counter-argument.
+        """
+        response = self.client.chat.completions.create(
+            model=self.model,
+            extra_headers=request_id_headers(),
+            messages=[{'role': 'system', 'content': system_prompt}],
+            temperature=1.0
+        )
+        self._record_usage(response)
+        return response.choices[0].message.content
+
+    @traced("OpenAIProvider.summarize")
+    @timed("summarization")
+    def summarize(self, previous_summary: str, messages: List[ChatMessage]) -> str:
+        """
+        Uses OpenAI to fold older debate turns into the rolling summary of a conversation.
+
+        Args:
+            previous_summary (str): The current summary, empty if there is none yet.
+            messages (List[ChatMessage]): The messages to add to the summary.
+
+        Returns:
+            str: The updated summary, or the previous summary if the request fails.
+        """
+        system_prompt = """
+        You maintain a running summary of a debate between a user and a bot.
+        Update the summary with the new messages, keeping every argument each side has made.
+        Keep it under 150 words, in English, and respond ONLY with the updated summary.
+        """
+        transcript = "\n".join(f"{msg.role}: {msg.message}" for msg in messages)
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                extra_headers=request_id_headers(),
+                messages=[
+                    {'role': 'system', 'content': system_prompt},
+                    {'role': 'user', 'content': f"Current summary: {previous_summary or '(empty)'}\n\nNew messages:\n{transcript}"}
+                ],
+                temperature=0.0
+            )
+            self._record_usage(response)
+            return response.choices[0].message.content
+        except openai.APIError as e:
+            logger.warning("Error summarizing conversation with OpenAI: %s", e)
+            record_fallback("summarization")
+            return previous_summary
+
+    @traced("OpenAIProvider.is_topic_change")
+    @timed("topic_change_check")
     def is_topic_change(self, message: str, original_topic: str) -> bool:
         """
         Uses OpenAI to determine if the user's message indicates a change in topic.
@@ -139,6 +275,7 @@ class OpenAIProvider(GenerativeAIProvider):
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
+                extra_headers=request_id_headers(),
                 messages=[
                     {"role": "system", "content": "You are a helpful assistant that responds in JSON."},
                     {"role": "user", "content": prompt}
@@ -146,9 +283,11 @@ class OpenAIProvider(GenerativeAIProvider):
                 temperature=0.0,
                 response_format={"type": "json_object"}
             )
+            self._record_usage(response)
             content = response.choices[0].message.content
             result = json.loads(content)
             return result.get("is_topic_change", True)  # Default to True if key is missing
         except (json.JSONDecodeError, KeyError, AttributeError):
             # If the API fails or returns an unexpected format, assume it's a topic change to be safe.
+            record_fallback("topic_change_check")
             return True
\ No newline at end of file
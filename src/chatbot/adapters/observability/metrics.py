@@ -0,0 +1,243 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STAGE_DURATION = Histogram(
+    "chatbot_stage_duration_seconds",
+    "Time spent in each stage of a chat request.",
+    ["stage"],
+    buckets=STAGE_BUCKETS
+)
+STAGE_ERRORS = Counter(
+    "chatbot_errors_total",
+    "Exceptions raised by each stage of a chat request.",
+    ["stage"]
+)
+FALLBACKS = Counter(
+    "chatbot_fallbacks_total",
+    "Times a canned fallback answer was used because the AI provider failed.",
+    ["operation"]
+)
+CACHE_LOOKUPS = Counter(
+    "chatbot_cache_lookups_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ["cache", "result"]
+)
+OPENAI_TOKENS = Counter(
+    "chatbot_openai_tokens_total",
+    "Tokens reported in the usage block of OpenAI completions.",
+    ["model", "kind"]
+)
+SHED_REQUESTS = Counter(
+    "chatbot_shed_requests_total",
+    "Requests rejected at the API edge before any work, by reason.",
+    ["reason"]
+)
+WRITE_BEHIND_PENDING = Gauge(
+    "chatbot_write_behind_pending",
+    "Conversations saved to the write-behind buffer and not yet handed to the flush thread."
+)
+HTTP_CONNECTIONS = Counter(
+    "chatbot_http_requests_by_connection_total",
+    "Outgoing HTTP requests by host and whether they opened a new connection or reused a pooled one.",
+    ["host", "connection"]
+)
+STARTUP_SECONDS = Gauge(
+    "chatbot_startup_seconds",
+    "Time from the application being loaded to its first successful readiness check."
+)
+FIRST_REQUEST_SECONDS = Gauge(
+    "chatbot_first_request_seconds",
+    "Duration of the first chat turn processed synchronously by this process."
+)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+_first_request_lock = threading.Lock()
+_first_request_recorded = False
+
+_stage_observers: List[Callable[[str, float], None]] = []
+
+
+def add_stage_observer(observer: Callable[[str, float], None]):
+    """
+    Registers a callable notified of the exact duration of every stage, alongside the histogram.
+
+    Meant for in-process benchmarks, which need more precise percentiles than the histogram buckets give.
+
+    Args:
+        observer (Callable[[str, float], None]): Called with the stage label and its duration in seconds,
+            on the thread that ran the stage.
+    """
+    _stage_observers.append(observer)
+
+
+def remove_stage_observer(observer: Callable[[str, float], None]):
+    """
+    Unregisters a stage observer.
+
+    Args:
+        observer (Callable[[str, float], None]): An observer registered with `add_stage_observer`.
+    """
+    _stage_observers.remove(observer)
+
+
+@contextmanager
+def track_stage(stage: str) -> Iterator[None]:
+    """
+    Measures the duration of a block of code as a stage, counting it as an error if it raises.
+
+    Args:
+        stage (str): The stage label, e.g. "repository_read" or "generation".
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(stage=stage).inc()
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        STAGE_DURATION.labels(stage=stage).observe(seconds)
+        for observer in _stage_observers:
+            observer(stage, seconds)
+
+
+def timed(stage: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator that records the duration and errors of every call to the decorated function as a stage.
+
+    The labelled metric children are resolved once, at decoration time, to keep the per-call overhead low.
+
+    Args:
+        stage (str): The stage label.
+
+    Returns:
+        Callable: The decorator.
+    """
+    histogram = STAGE_DURATION.labels(stage=stage)
+    errors = STAGE_ERRORS.labels(stage=stage)
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                seconds = time.perf_counter() - start
+                histogram.observe(seconds)
+                for observer in _stage_observers:
+                    observer(stage, seconds)
+        return wrapper
+    return decorator
+
+
+def record_fallback(operation: str):
+    """
+    Counts a fallback answer returned instead of a real AI provider result.
+
+    Args:
+        operation (str): The provider operation that fell back, e.g. "classification".
+    """
+    FALLBACKS.labels(operation=operation).inc()
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    """
+    Counts a cache lookup.
+
+    Args:
+        cache (str): The cache name, e.g. "opening_pool".
+        hit (bool): Whether the lookup found an entry.
+    """
+    CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def record_token_usage(model: str, usage: Optional[Any]):
+    """
+    Counts the prompt and completion tokens of an OpenAI completion.
+
+    Args:
+        model (str): The model that served the completion.
+        usage (Optional[Any]): The `usage` block of the response. Ignored if missing.
+    """
+    if usage is None:
+        return
+    OPENAI_TOKENS.labels(model=model, kind="prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+    OPENAI_TOKENS.labels(model=model, kind="completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+
+def record_shed_request(reason: str):
+    """
+    Counts a request rejected at the API edge.
+
+    Args:
+        reason (str): Why it was rejected, e.g. "rate_limit" or "global_in_flight".
+    """
+    SHED_REQUESTS.labels(reason=reason).inc()
+
+
+def record_write_behind_pending(pending: int):
+    """
+    Records the size of the write-behind buffer.
+
+    Args:
+        pending (int): The number of buffered conversations.
+    """
+    WRITE_BEHIND_PENDING.set(pending)
+
+
+def record_http_connection(host: str, reused: bool):
+    """
+    Counts an outgoing HTTP request by the connection it used.
+
+    Args:
+        host (str): The host the request was sent to.
+        reused (bool): Whether it reused a pooled connection rather than opening a new one.
+    """
+    HTTP_CONNECTIONS.labels(host=host, connection="reused" if reused else "new").inc()
+
+
+def record_startup(seconds: float):
+    """
+    Records how long the process took to become ready.
+
+    Args:
+        seconds (float): The time from the application being loaded to its first successful readiness check.
+    """
+    STARTUP_SECONDS.set(seconds)
+
+
+def record_first_request(seconds: float):
+    """
+    Records the duration of a chat turn if it is the first one processed synchronously by this process.
+
+    Args:
+        seconds (float): The duration of the turn.
+    """
+    global _first_request_recorded
+    with _first_request_lock:
+        if _first_request_recorded:
+            return
+        _first_request_recorded = True
+    FIRST_REQUEST_SECONDS.set(seconds)
+
+
+def render_metrics() -> bytes:
+    """
+    Renders every registered metric in the Prometheus text exposition format.
+
+    Returns:
+        bytes: The exposition payload.
+    """
+    return generate_latest()
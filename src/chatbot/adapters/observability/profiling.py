@@ -0,0 +1,182 @@
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import List
+
+MAX_PROFILE_SECONDS = 60.0
+DEFAULT_SAMPLE_INTERVAL_SECONDS = 0.005
+
+_session_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profiling session is requested while another one is still running."""
+
+
+def _frame_label(frame) -> str:
+    """
+    Builds a readable label for a stack frame.
+
+    Args:
+        frame: The frame to label.
+
+    Returns:
+        str: The label, in the form "function (file:line)".
+    """
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{frame.f_lineno})"
+
+
+class SamplingProfiler:
+    """
+    Statistical CPU profiler that periodically samples the stacks of every thread of the process.
+
+    Unlike a deterministic profiler it does not hook function calls, so its overhead depends only on the
+    sampling interval and it can be turned on against a live worker.
+    """
+
+    def __init__(self, interval_seconds: float = DEFAULT_SAMPLE_INTERVAL_SECONDS):
+        """
+        Initializes the SamplingProfiler.
+
+        Args:
+            interval_seconds (float): The time between two samples.
+        """
+        self._interval_seconds = interval_seconds
+        self._stacks: Counter = Counter()
+        self._samples = 0
+
+    def run(self, duration_seconds: float):
+        """
+        Samples every thread, except the calling one, for the given duration.
+
+        Args:
+            duration_seconds (float): How long to sample for.
+        """
+        own_thread_id = threading.get_ident()
+        deadline = time.monotonic() + duration_seconds
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread_id:
+                    continue
+                stack: List[str] = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                self._stacks[tuple(reversed(stack))] += 1
+            self._samples += 1
+            time.sleep(self._interval_seconds)
+
+    def report(self, limit: int = 30) -> str:
+        """
+        Renders the samples as a text report.
+
+        The report lists the functions with the most samples on top of the stack (self time) and on the
+        stack at all (cumulative time), followed by the collapsed stacks, which can be fed to a flame
+        graph tool.
+
+        Args:
+            limit (int): How many entries to list in each section.
+
+        Returns:
+            str: The report.
+        """
+        self_samples: Counter = Counter()
+        cumulative_samples: Counter = Counter()
+        for stack, count in self._stacks.items():
+            self_samples[stack[-1]] += count
+            for label in set(stack):
+                cumulative_samples[label] += count
+
+        total = sum(self._stacks.values()) or 1
+        lines = [f"CPU profile: {self._samples} sampling rounds, {total} thread samples", "", "Top self:"]
+        lines += [f"  {count / total:6.1%}  {label}" for label, count in self_samples.most_common(limit)]
+        lines += ["", "Top cumulative:"]
+        lines += [f"  {count / total:6.1%}  {label}" for label, count in cumulative_samples.most_common(limit)]
+        lines += ["", "Collapsed stacks:"]
+        lines += [f"{';'.join(stack)} {count}" for stack, count in self._stacks.most_common(limit)]
+        return "\n".join(lines)
+
+
+def _claim_session(duration_seconds: float) -> float:
+    """
+    Claims the profiling session and caps the requested window.
+
+    Args:
+        duration_seconds (float): The requested window.
+
+    Returns:
+        float: The window, capped at MAX_PROFILE_SECONDS.
+
+    Raises:
+        ProfilerBusyError: If another profiling session is running.
+    """
+    if not _session_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profiling session is already running")
+    return min(duration_seconds, MAX_PROFILE_SECONDS)
+
+
+def profile_cpu(duration_seconds: float, interval_seconds: float = DEFAULT_SAMPLE_INTERVAL_SECONDS) -> str:
+    """
+    Samples the CPU usage of the process for a time window.
+
+    Args:
+        duration_seconds (float): The window length, capped at MAX_PROFILE_SECONDS.
+        interval_seconds (float): The time between two samples.
+
+    Returns:
+        str: The profile report.
+
+    Raises:
+        ProfilerBusyError: If another profiling session is running.
+    """
+    duration_seconds = _claim_session(duration_seconds)
+    try:
+        profiler = SamplingProfiler(interval_seconds=interval_seconds)
+        profiler.run(duration_seconds)
+        return profiler.report()
+    finally:
+        _session_lock.release()
+
+
+def profile_memory(duration_seconds: float, limit: int = 30) -> str:
+    """
+    Compares two tracemalloc snapshots taken at the start and end of a time window.
+
+    Tracing is only enabled for the window unless it was already running.
+
+    Args:
+        duration_seconds (float): The window length, capped at MAX_PROFILE_SECONDS.
+        limit (int): How many allocation sites to list.
+
+    Returns:
+        str: The report, listing the allocation sites whose memory grew the most.
+
+    Raises:
+        ProfilerBusyError: If another profiling session is running.
+    """
+    duration_seconds = _claim_session(duration_seconds)
+    started_tracing = not tracemalloc.is_tracing()
+    try:
+        if started_tracing:
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        time.sleep(duration_seconds)
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+
+        stats = after.compare_to(before, "lineno")
+        lines = [
+            f"Memory profile over {duration_seconds:.1f}s: {current / 1024:.1f} KiB traced, {peak / 1024:.1f} KiB peak",
+            "",
+            "Top growth:"
+        ]
+        lines += [f"  {stat}" for stat in stats[:limit]]
+        return "\n".join(lines)
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        _session_lock.release()
+
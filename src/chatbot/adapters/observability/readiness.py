@@ -0,0 +1,146 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+READINESS_CACHE_SECONDS = 5.0
+
+
+class _Check(NamedTuple):
+    """A readiness check and how it affects readiness."""
+
+    name: str
+    check: Callable[[], Any]
+    critical: bool
+    cache_seconds: float
+
+
+class ReadinessProbe:
+    """
+    Runs named dependency checks and reports whether the process is ready to serve traffic.
+
+    A check passes if it returns and fails if it raises. Results are cached, so that frequent probes do
+    not turn into a load of their own on the dependencies. Each check runs under its own lock, so a slow
+    check does not hold up the others; while a check is being refreshed, concurrent probes report its
+    previous result instead of waiting, and only wait if it never ran. The process is ready while every
+    critical check passes; non-critical checks are only reported.
+    """
+
+    def __init__(self, on_first_ready: Optional[Callable[[], None]] = None):
+        """
+        Initializes the ReadinessProbe without checks.
+
+        Args:
+            on_first_ready (Optional[Callable[[], None]]): Called the first time the process is found ready.
+        """
+        self._checks: List[_Check] = []
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._check_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._on_first_ready = on_first_ready
+        self._was_ready = False
+
+    def add_check(
+        self,
+        name: str,
+        check: Callable[[], Any],
+        critical: bool = True,
+        cache_seconds: float = READINESS_CACHE_SECONDS
+    ):
+        """
+        Registers a check.
+
+        Args:
+            name (str): The name the check is reported under.
+            check (Callable[[], Any]): The check, raising if the dependency is not usable.
+            critical (bool): Whether the process is not ready while the check fails.
+            cache_seconds (float): How long a result is reused before the check runs again.
+        """
+        self._checks.append(_Check(name, check, critical, cache_seconds))
+        self._check_locks[name] = threading.Lock()
+
+    def _run(self, check: _Check) -> Dict[str, Any]:
+        """
+        Runs a check and times it.
+
+        Args:
+            check (_Check): The check to run.
+
+        Returns:
+            Dict[str, Any]: The result, with whether it passed, its duration and the error, if any.
+        """
+        start = time.perf_counter()
+        error = None
+        try:
+            check.check()
+        except Exception as e:
+            logger.warning("Readiness check %s failed: %s", check.name, e)
+            error = str(e) or type(e).__name__
+        return {
+            "ok": error is None,
+            "critical": check.critical,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+            "error": error
+        }
+
+    def _is_stale(self, check: _Check) -> bool:
+        """
+        Tells whether a check has no result yet, or one older than its cache duration.
+
+        Args:
+            check (_Check): The check.
+
+        Returns:
+            bool: True if the check must run again.
+        """
+        with self._lock:
+            checked_at = self._checked_at.get(check.name)
+        return checked_at is None or time.monotonic() - checked_at >= check.cache_seconds
+
+    def _refresh(self, check: _Check):
+        """
+        Runs a check if its result is stale, unless another probe is already running it and a previous
+        result can be reported meanwhile.
+
+        Args:
+            check (_Check): The check.
+        """
+        if not self._is_stale(check):
+            return
+        check_lock = self._check_locks[check.name]
+        with self._lock:
+            has_result = check.name in self._results
+        if not check_lock.acquire(blocking=not has_result):
+            return
+        try:
+            if not self._is_stale(check):
+                return
+            result = self._run(check)
+            with self._lock:
+                self._results[check.name] = result
+                self._checked_at[check.name] = time.monotonic()
+        finally:
+            check_lock.release()
+
+    def check(self) -> Dict[str, Any]:
+        """
+        Runs the checks whose cached result is stale and reports readiness.
+
+        Returns:
+            Dict[str, Any]: "ready", whether every critical check passes, and "checks", the result of each.
+        """
+        for check in self._checks:
+            self._refresh(check)
+
+        with self._lock:
+            ready = all(self._results[check.name]["ok"] for check in self._checks if check.critical)
+            first_ready = ready and not self._was_ready
+            self._was_ready = self._was_ready or ready
+            results = {check.name: dict(self._results[check.name]) for check in self._checks}
+
+        if first_ready and self._on_first_ready is not None:
+            self._on_first_ready()
+        return {"ready": ready, "checks": results}
@@ -0,0 +1,337 @@
+import hashlib
+import logging
+import queue
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import orjson
+from chatbot.domain.models import ChatMessage
+from chatbot.domain.ports import GenerativeAIProvider
+from chatbot.domain.services import DEBATE_TOPICS, OPPOSING_STANCES
+
+logger = logging.getLogger(__name__)
+
+_WORD_CHARACTER = re.compile(r"\w")
+
+RECORDING_QUEUE_SIZE = 10000
+
+_provider_calls: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("provider_calls", default=None)
+
+
+class TrafficRecorder:
+    """
+    Appends anonymized records of chat requests to an NDJSON file, to replay them later.
+
+    Texts are masked, keeping their length and word boundaries but not their characters. Identifiers are
+    replaced by salted digests, which still tell the turns of a conversation, or the requests of a client,
+    apart. The salt is random unless given, so digests cannot be matched across recordings.
+
+    Records are written to the file by a background thread, so that writing them does not block the
+    event loop. At most RECORDING_QUEUE_SIZE records wait to be written; records arriving while the
+    queue is full are dropped and counted in `dropped`.
+    """
+
+    def __init__(self, path: str, salt: Optional[str] = None):
+        """
+        Initializes the TrafficRecorder, opening the file for appending and starting its writer thread.
+
+        Args:
+            path (str): The path of the NDJSON file.
+            salt (Optional[str]): The salt of the identifier digests. Defaults to a random one.
+        """
+        self._file = open(path, "ab")
+        self._salt = (salt or secrets.token_hex(16)).encode()
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=RECORDING_QUEUE_SIZE)
+        self._closed = False
+        self.dropped = 0
+        self._writer = threading.Thread(target=self._write_queued, name="traffic-recorder", daemon=True)
+        self._writer.start()
+
+    def offset(self) -> float:
+        """
+        Returns the time elapsed since the recording started.
+
+        Returns:
+            float: The elapsed time, in seconds.
+        """
+        return time.monotonic() - self._started_at
+
+    def pseudonym(self, value: Optional[str]) -> Optional[str]:
+        """
+        Replaces an identifier by its salted digest.
+
+        Args:
+            value (Optional[str]): The identifier.
+
+        Returns:
+            Optional[str]: A 16-character digest, or None if there is no identifier.
+        """
+        if value is None:
+            return None
+        return hashlib.sha256(self._salt + value.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def mask(text: str) -> str:
+        """
+        Masks a text, replacing every letter and digit with "x".
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            str: The masked text, of the same length.
+        """
+        return _WORD_CHARACTER.sub("x", text)
+
+    def write(self, record: Dict[str, Any]):
+        """
+        Queues a record to be appended to the file, without waiting for it to be written.
+
+        Args:
+            record (Dict[str, Any]): The anonymized record.
+        """
+        line = orjson.dumps(record) + b"\n"
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self._queue.put_nowait(line)
+            except queue.Full:
+                self.dropped += 1
+
+    def flush(self):
+        """
+        Waits until the queued records are written to the file.
+        """
+        self._queue.join()
+
+    def close(self):
+        """
+        Writes the queued records, then stops the writer thread and closes the file. Later records are
+        dropped.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+
+    def _write_queued(self):
+        """
+        Appends the queued records to the file until the recorder is closed, flushing the file whenever
+        the queue runs empty.
+        """
+        while True:
+            line = self._queue.get()
+            try:
+                if line is None:
+                    return
+                self._file.write(line)
+                if self._queue.empty():
+                    self._file.flush()
+            except OSError as e:
+                logger.warning("Failed to write a traffic record: %s", e)
+            finally:
+                self._queue.task_done()
+
+
+@contextmanager
+def recording_provider_calls() -> Iterator[List[Dict[str, Any]]]:
+    """
+    Collects the AI provider calls made by the current request while the block runs.
+
+    Yields:
+        List[Dict[str, Any]]: The calls, appended to as they complete.
+    """
+    calls: List[Dict[str, Any]] = []
+    token = _provider_calls.set(calls)
+    try:
+        yield calls
+    finally:
+        _provider_calls.reset(token)
+
+
+class RecordingAIProvider(GenerativeAIProvider):
+    """
+    AI provider that notes the duration and anonymized result of every call made while a request is
+    recorded, and delegates the calls to another provider.
+
+    Calls made outside of `recording_provider_calls`, such as the summaries refreshed in the background,
+    are not recorded. Classifications keep their topic and stance when they are among the known debate
+    labels, which tell nothing about the user, so that a replay takes the same paths; other labels are
+    masked.
+    """
+
+    def __init__(self, provider: GenerativeAIProvider, recorder: TrafficRecorder):
+        """
+        Initializes the RecordingAIProvider.
+
+        Args:
+            provider (GenerativeAIProvider): The provider the calls are delegated to.
+            recorder (TrafficRecorder): The recorder whose masking is applied to the results.
+        """
+        self._provider = provider
+        self._recorder = recorder
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Delegates the attributes that are not part of the port, such as `ping`, to the wrapped provider.
+
+        Args:
+            name (str): The attribute name.
+
+        Returns:
+            Any: The attribute of the wrapped provider.
+        """
+        return getattr(self._provider, name)
+
+    def _call(
+        self, operation: str, func: Callable[..., Any], *args, mask: Optional[Callable[[Any], Any]] = None, **kwargs
+    ) -> Any:
+        """
+        Calls the wrapped provider, recording the call if the request is recorded.
+
+        Args:
+            operation (str): The name of the provider method.
+            func (Callable): The method of the wrapped provider.
+            mask (Optional[Callable[[Any], Any]]): Anonymizes the result. Defaults to `_masked`.
+
+        Returns:
+            Any: The result of the call.
+        """
+        calls = _provider_calls.get()
+        if calls is None:
+            return func(*args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            calls.append({
+                "operation": operation,
+                "duration_ms": (time.perf_counter() - start) * 1000,
+                "error": type(e).__name__
+            })
+            raise
+        calls.append({
+            "operation": operation,
+            "duration_ms": (time.perf_counter() - start) * 1000,
+            "result": (mask or self._masked)(result)
+        })
+        return result
+
+    def _masked(self, result: Any) -> Any:
+        """
+        Masks a call result: a text, or the string values of a dictionary such as a classification.
+
+        Args:
+            result (Any): The result of the call.
+
+        Returns:
+            Any: The masked result. Results of other types, such as booleans, are kept.
+        """
+        if isinstance(result, str):
+            return self._recorder.mask(result)
+        if isinstance(result, dict):
+            return {key: self._masked(value) for key, value in result.items()}
+        return result
+
+    def _masked_classification(self, result: Any) -> Any:
+        """
+        Masks a classification, keeping its stance and topic if they are known debate labels.
+
+        Args:
+            result (Any): The classification.
+
+        Returns:
+            Any: The masked classification.
+        """
+        masked = self._masked(result)
+        if isinstance(result, dict):
+            if result.get("stance") in OPPOSING_STANCES:
+                masked["stance"] = result["stance"]
+            if result.get("topic") in DEBATE_TOPICS.values():
+                masked["topic"] = result["topic"]
+        return masked
+
+    def get_debate_response(
+        self, topic: str, position: str, history: List[ChatMessage], summary: Optional[str] = None
+    ) -> str:
+        """
+        Generates a debate response with the wrapped provider, recording the call.
+
+        Args:
+            topic (str): The current debate topic.
+            position (str): The position to maintain.
+            history (List[ChatMessage]): The recent chat messages.
+            summary (Optional[str]): A summary of the earlier turns.
+
+        Returns:
+            str: The generated response.
+        """
+        return self._call(
+            "get_debate_response", self._provider.get_debate_response, topic, position, history, summary
+        )
+
+    def classify_topic_and_stance(self, message: str) -> dict:
+        """
+        Classifies a message with the wrapped provider, recording the call.
+
+        Args:
+            message (str): The user's message.
+
+        Returns:
+            dict: A dictionary containing "topic" and "stance" keys.
+        """
+        return self._call(
+            "classify_topic_and_stance", self._provider.classify_topic_and_stance, message,
+            mask=self._masked_classification
+        )
+
+    def get_opening_argument(self, topic: str, position: str) -> str:
+        """
+        Generates an opening argument with the wrapped provider, recording the call.
+
+        Args:
+            topic (str): The debate topic.
+            position (str): The position the argument must defend.
+
+        Returns:
+            str: The generated opening argument.
+        """
+        return self._call("get_opening_argument", self._provider.get_opening_argument, topic, position)
+
+    def summarize(self, previous_summary: str, messages: List[ChatMessage]) -> str:
+        """
+        Updates a summary with the wrapped provider, recording the call.
+
+        Args:
+            previous_summary (str): The current summary.
+            messages (List[ChatMessage]): The messages to add to the summary.
+
+        Returns:
+            str: The updated summary.
+        """
+        return self._call("summarize", self._provider.summarize, previous_summary, messages)
+
+    def is_topic_change(self, message: str, original_topic: str) -> bool:
+        """
+        Checks for a topic change with the wrapped provider, recording the call.
+
+        Args:
+            message (str): The user's message.
+            original_topic (str): The current topic of the conversation.
+
+        Returns:
+            bool: True if the message changes the topic.
+        """
+        return self._call("is_topic_change", self._provider.is_topic_change, message, original_topic)
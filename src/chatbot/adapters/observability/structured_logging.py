@@ -0,0 +1,80 @@
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+from .tracing import get_request_id
+
+_RESERVED_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    """Logging filter that stamps every record with the ID of the request being handled."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Adds the current request ID to the record.
+
+        Args:
+            record (logging.LogRecord): The record to stamp.
+
+        Returns:
+            bool: Always True, records are never dropped.
+        """
+        record.request_id = get_request_id()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Logging formatter that renders each record as a single-line JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Formats a record as JSON, including any attributes passed through `extra`.
+
+        Args:
+            record (logging.LogRecord): The record to format.
+
+        Returns:
+            str: The JSON document.
+        """
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRIBUTES and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+_configured = False
+
+
+def configure_logging():
+    """
+    Configures the root logger to emit structured records on stderr.
+
+    The format is read from LOG_FORMAT ("json", the default, or "text") and the level from LOG_LEVEL,
+    defaulting to INFO. Calling this function more than once has no further effect.
+    """
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    handler = logging.StreamHandler()
+    handler.addFilter(RequestIdFilter())
+    if os.getenv("LOG_FORMAT", "json").lower() == "text":
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"))
+    else:
+        handler.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
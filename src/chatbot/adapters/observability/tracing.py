@@ -0,0 +1,111 @@
+import functools
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+logger = logging.getLogger("chatbot.trace")
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_current_span_id: ContextVar[Optional[str]] = ContextVar("span_id", default=None)
+
+
+def new_request_id() -> str:
+    """
+    Generates a new request ID.
+
+    Returns:
+        str: A random 32-character hexadecimal ID.
+    """
+    return uuid.uuid4().hex
+
+
+def get_request_id() -> Optional[str]:
+    """
+    Returns the ID of the request being handled in the current context.
+
+    Returns:
+        Optional[str]: The request ID, or None outside of a request.
+    """
+    return request_id_var.get()
+
+
+def request_id_headers() -> Dict[str, str]:
+    """
+    Builds the headers that propagate the current request ID to downstream services.
+
+    Returns:
+        Dict[str, str]: The propagation headers, empty outside of a request.
+    """
+    request_id = request_id_var.get()
+    if request_id is None:
+        return {}
+    return {"X-Client-Request-Id": request_id}
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[None]:
+    """
+    Traces a block of code as a span of the current request.
+
+    When the block exits, a structured log record is emitted with the span name, its ID, the ID of the
+    enclosing span, the request ID, the duration and whether it raised. Nothing is recorded if the
+    `chatbot.trace` logger is disabled for INFO.
+
+    Args:
+        name (str): The span name, e.g. "ChatService.process_message".
+        **attributes: Extra attributes to attach to the span record.
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        yield
+        return
+
+    span_id = uuid.uuid4().hex[:16]
+    parent_span_id = _current_span_id.get()
+    token = _current_span_id.set(span_id)
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        _current_span_id.reset(token)
+        logger.info(
+            "span %s finished in %.2f ms",
+            name,
+            duration_ms,
+            extra={
+                "span": name,
+                "span_id": span_id,
+                "parent_span_id": parent_span_id,
+                "duration_ms": round(duration_ms, 3),
+                "status": status,
+                **attributes
+            }
+        )
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator that traces every call to the decorated function as a span.
+
+    Args:
+        name (str): The span name.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,171 @@
+import os
+import threading
+from typing import Dict, Optional
+
+import redis
+from chatbot.adapters.observability.tracing import traced
+from chatbot.domain.models import IdempotencyRecord
+from chatbot.domain.ports import IdempotencyStore
+
+IDEMPOTENCY_TTL_SECONDS = 24 * 3600
+IDEMPOTENCY_LOCK_SECONDS = 120
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """In-memory implementation of the idempotency store. Records never expire."""
+
+    def __init__(self):
+        """
+        Initializes the InMemoryIdempotencyStore with no records.
+        """
+        self._records: Dict[str, IdempotencyRecord] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, key: str, fingerprint: str) -> bool:
+        """
+        Claims a key if it has no record.
+
+        Args:
+            key (str): The idempotency key.
+            fingerprint (str): A digest of the request.
+
+        Returns:
+            bool: True if the key was free.
+        """
+        with self._lock:
+            if key in self._records:
+                return False
+            self._records[key] = IdempotencyRecord(fingerprint=fingerprint)
+            return True
+
+    def get(self, key: str) -> Optional[IdempotencyRecord]:
+        """
+        Returns the record of a key.
+
+        Args:
+            key (str): The idempotency key.
+
+        Returns:
+            Optional[IdempotencyRecord]: A copy of the record, or None if the key is free.
+        """
+        with self._lock:
+            record = self._records.get(key)
+            return record.model_copy() if record else None
+
+    def complete(self, key: str, record: IdempotencyRecord):
+        """
+        Records the response of the request that claimed a key.
+
+        Args:
+            key (str): The idempotency key.
+            record (IdempotencyRecord): The record, with its status code and body.
+        """
+        with self._lock:
+            self._records[key] = record.model_copy()
+
+    def release(self, key: str):
+        """
+        Frees a key.
+
+        Args:
+            key (str): The idempotency key.
+        """
+        with self._lock:
+            self._records.pop(key, None)
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    """
+    Implementation of the IdempotencyStore using Redis.
+
+    Each key is stored as a JSON record under `idempotency:<key>`. It is claimed with SET NX and a short
+    expiry, so that a key held by a crashed worker frees itself, and completed records are kept for the
+    longer response TTL.
+    """
+
+    KEY_PREFIX = "idempotency"
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS,
+        lock_seconds: int = IDEMPOTENCY_LOCK_SECONDS
+    ):
+        """
+        Initializes the RedisIdempotencyStore.
+
+        Args:
+            client (Optional[redis.Redis]): The Redis client to use. If not provided, a client is created
+                from the REDIS_URL environment variable, defaulting to 'redis://localhost:6379'.
+            ttl_seconds (int): How long a completed response is replayed.
+            lock_seconds (int): How long a key stays claimed by a request that has not completed.
+        """
+        if client is None:
+            client = redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"), decode_responses=True)
+        self.client = client
+        self._ttl_seconds = ttl_seconds
+        self._lock_seconds = lock_seconds
+
+    def _key(self, key: str) -> str:
+        """
+        Builds the Redis key of an idempotency record.
+
+        Args:
+            key (str): The idempotency key.
+
+        Returns:
+            str: The Redis key.
+        """
+        return f"{self.KEY_PREFIX}:{key}"
+
+    @traced("RedisIdempotencyStore.claim")
+    def claim(self, key: str, fingerprint: str) -> bool:
+        """
+        Claims a key with SET NX, expiring after the lock duration.
+
+        Args:
+            key (str): The idempotency key.
+            fingerprint (str): A digest of the request.
+
+        Returns:
+            bool: True if the key was free.
+        """
+        record = IdempotencyRecord(fingerprint=fingerprint)
+        return bool(self.client.set(self._key(key), record.model_dump_json(), nx=True, ex=self._lock_seconds))
+
+    @traced("RedisIdempotencyStore.get")
+    def get(self, key: str) -> Optional[IdempotencyRecord]:
+        """
+        Returns the record of a key.
+
+        Args:
+            key (str): The idempotency key.
+
+        Returns:
+            Optional[IdempotencyRecord]: The record, or None if the key is free or expired.
+        """
+        data = self.client.get(self._key(key))
+        if data is None:
+            return None
+        return IdempotencyRecord.model_validate_json(data)
+
+    @traced("RedisIdempotencyStore.complete")
+    def complete(self, key: str, record: IdempotencyRecord):
+        """
+        Records the response of the request that claimed a key, for the response TTL.
+
+        Args:
+            key (str): The idempotency key.
+            record (IdempotencyRecord): The record, with its status code and body.
+        """
+        self.client.set(self._key(key), record.model_dump_json(), ex=self._ttl_seconds)
+
+    @traced("RedisIdempotencyStore.release")
+    def release(self, key: str):
+        """
+        Frees a key.
+
+        Args:
+            key (str): The idempotency key.
+        """
+        self.client.delete(self._key(key))
@@ -1,6 +1,10 @@
-from typing import Dict, Optional
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from chatbot.domain.models import Conversation
+from chatbot.adapters.observability.metrics import timed
+from chatbot.adapters.observability.tracing import traced
+from chatbot.domain.models import ChatMessage, Conversation, TokenUsage
 from chatbot.domain.ports import ConversationRepository
 
 
@@ -11,10 +15,16 @@ class InMemoryConversationRepository(ConversationRepository):
         """
         Initializes the InMemoryConversationRepository.
 
-        This constructor sets up an empty dictionary to store conversations in memory.
+        This constructor sets up empty dictionaries to store conversations and their usage in memory.
         """
         self._conversations: Dict[str, Conversation] = {}
+        self._usage: Dict[str, TokenUsage] = {}
+        self._total_usage = TokenUsage()
+        self._usage_lock = threading.Lock()
+        self._summary_lock = threading.Lock()
 
+    @traced("InMemoryConversationRepository.find_by_id")
+    @timed("repository_read")
     def find_by_id(self, conversation_id: str) -> Optional[Conversation]:
         """
         Finds a conversation by its ID.
@@ -25,6 +35,8 @@ class InMemoryConversationRepository(ConversationRepository):
             Optional[Conversation]: The conversation object if found, otherwise None."""
         return self._conversations.get(conversation_id)
 
+    @traced("InMemoryConversationRepository.save")
+    @timed("repository_write")
     def save(self, conversation: Conversation):
         """
         Saves a conversation.
@@ -36,3 +48,223 @@ class InMemoryConversationRepository(ConversationRepository):
             conversation (Conversation): The conversation object to be saved.
         """
         self._conversations[conversation.id] = conversation
+
+    def iter_conversations(self, batch_size: int = 500) -> Iterator[Conversation]:
+        """
+        Iterates over every stored conversation.
+
+        Args:
+            batch_size (int): Unused, conversations are already in memory.
+
+        Yields:
+            Conversation: The stored conversations.
+        """
+        yield from list(self._conversations.values())
+
+    def save_many(self, conversations: Iterable[Conversation], batch_size: int = 500) -> int:
+        """
+        Saves several conversations.
+
+        Args:
+            conversations (Iterable[Conversation]): The conversations to save.
+            batch_size (int): Unused, conversations are stored in memory.
+
+        Returns:
+            int: The number of conversations saved.
+        """
+        saved = 0
+        for conversation in conversations:
+            self._conversations[conversation.id] = conversation
+            saved += 1
+        return saved
+
+    def count_messages(self, conversation_id: str) -> Optional[int]:
+        """
+        Counts the messages of a conversation.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+
+        Returns:
+            Optional[int]: The number of messages, or None if the conversation does not exist.
+        """
+        conversation = self._conversations.get(conversation_id)
+        return len(conversation.messages) if conversation else None
+
+    def find_messages(self, conversation_id: str, offset: int, limit: int) -> Optional[List[ChatMessage]]:
+        """
+        Reads a page of a conversation's messages.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+            offset (int): The index of the first message to read.
+            limit (int): The maximum number of messages to read.
+
+        Returns:
+            Optional[List[ChatMessage]]: The messages, or None if the conversation does not exist.
+        """
+        conversation = self._conversations.get(conversation_id)
+        return conversation.messages[offset:offset + max(limit, 0)] if conversation else None
+
+    def find_message_page(
+        self, conversation_id: str, offset: int, limit: int
+    ) -> Optional[Tuple[int, List[ChatMessage]]]:
+        """
+        Reads a page of a conversation's messages and the message count.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+            offset (int): The index of the first message to read.
+            limit (int): The maximum number of messages to read.
+
+        Returns:
+            Optional[Tuple[int, List[ChatMessage]]]: The message count and the messages, or None if the
+                conversation does not exist.
+        """
+        conversation = self._conversations.get(conversation_id)
+        if conversation is None:
+            return None
+        return len(conversation.messages), conversation.messages[offset:offset + max(limit, 0)]
+
+    def _matching(
+        self,
+        topic: Optional[str],
+        stance: Optional[str],
+        since: Optional[datetime],
+        until: Optional[datetime]
+    ) -> List[Conversation]:
+        """
+        Scans the stored conversations for the ones matching the filters, oldest first.
+
+        Args:
+            topic (Optional[str]): Only keep conversations on this topic.
+            stance (Optional[str]): Only keep conversations where the bot defends this stance.
+            since (Optional[datetime]): Only keep conversations created at or after this time.
+            until (Optional[datetime]): Only keep conversations created at or before this time.
+
+        Returns:
+            List[Conversation]: The matching conversations.
+
+        Raises:
+            ValueError: If both a topic and a stance are given.
+        """
+        if topic is not None and stance is not None:
+            raise ValueError("Filter by topic or by stance, not both")
+        matching = [
+            conversation for conversation in self._conversations.values()
+            if (topic is None or conversation.topic.strip().lower() == topic.strip().lower())
+            and (stance is None or conversation.strategy.strip().lower() == stance.strip().lower())
+            and (since is None or conversation.created_at >= since)
+            and (until is None or conversation.created_at <= until)
+        ]
+        return sorted(matching, key=lambda conversation: conversation.created_at)
+
+    def count_conversations(
+        self,
+        topic: Optional[str] = None,
+        stance: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> int:
+        """
+        Counts the conversations created in a time window, optionally on a topic or with a bot stance.
+
+        Args:
+            topic (Optional[str]): Only count conversations on this topic.
+            stance (Optional[str]): Only count conversations where the bot defends this stance.
+            since (Optional[datetime]): Only count conversations created at or after this time.
+            until (Optional[datetime]): Only count conversations created at or before this time.
+
+        Returns:
+            int: The number of matching conversations.
+        """
+        return len(self._matching(topic, stance, since, until))
+
+    def list_conversation_ids(
+        self,
+        topic: Optional[str] = None,
+        stance: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 100
+    ) -> List[str]:
+        """
+        Lists the IDs of the conversations created in a time window, oldest first.
+
+        Args:
+            topic (Optional[str]): Only list conversations on this topic.
+            stance (Optional[str]): Only list conversations where the bot defends this stance.
+            since (Optional[datetime]): Only list conversations created at or after this time.
+            until (Optional[datetime]): Only list conversations created at or before this time.
+            offset (int): The number of matching conversations to skip.
+            limit (int): The maximum number of IDs to return.
+
+        Returns:
+            List[str]: The conversation IDs.
+        """
+        matching = self._matching(topic, stance, since, until)
+        return [conversation.id for conversation in matching[offset:offset + max(limit, 0)]]
+
+    def add_usage(self, conversation_id: str, usage: TokenUsage):
+        """
+        Adds AI provider usage to a conversation and to the aggregate totals.
+
+        Args:
+            conversation_id (str): The ID of the conversation that incurred the usage.
+            usage (TokenUsage): The usage to add.
+        """
+        with self._usage_lock:
+            for accumulated in (self._usage.setdefault(conversation_id, TokenUsage()), self._total_usage):
+                accumulated.prompt_tokens += usage.prompt_tokens
+                accumulated.completion_tokens += usage.completion_tokens
+                accumulated.cost += usage.cost
+                accumulated.calls += usage.calls
+
+    def get_usage(self, conversation_id: str) -> Optional[TokenUsage]:
+        """
+        Returns the AI provider usage accumulated by a conversation.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+
+        Returns:
+            Optional[TokenUsage]: A copy of the accumulated usage, or None if none was recorded.
+        """
+        with self._usage_lock:
+            usage = self._usage.get(conversation_id)
+            return usage.model_copy() if usage else None
+
+    def get_total_usage(self) -> TokenUsage:
+        """
+        Returns the AI provider usage accumulated by all conversations.
+
+        Returns:
+            TokenUsage: A copy of the aggregate usage.
+        """
+        with self._usage_lock:
+            return self._total_usage.model_copy()
+
+    def update_summary(
+        self, conversation_id: str, summary: str, summarized_count: int, expected_summarized_count: int
+    ) -> bool:
+        """
+        Replaces the rolling summary of a stored conversation, leaving its messages untouched.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+            summary (str): The new summary.
+            summarized_count (int): The number of leading messages folded into the new summary.
+            expected_summarized_count (int): The number of summarized messages the summary was built upon.
+
+        Returns:
+            bool: True if the summary was updated, False if the conversation does not exist or its summary
+                changed in the meantime.
+        """
+        with self._summary_lock:
+            conversation = self._conversations.get(conversation_id)
+            if conversation is None or conversation.summarized_count != expected_summarized_count:
+                return False
+            conversation.summary = summary
+            conversation.summarized_count = summarized_count
+            return True
@@ -0,0 +1,170 @@
+import os
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import redis
+from chatbot.adapters.observability.tracing import traced
+from chatbot.domain.models import Job
+from chatbot.domain.ports import JobQueue
+
+JOB_TTL_SECONDS = 3600
+
+
+class InMemoryJobQueue(JobQueue):
+    """In-memory implementation of the job queue, for tests and single-process deployments."""
+
+    def __init__(self):
+        """
+        Initializes the InMemoryJobQueue with an empty queue.
+        """
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Deque[str] = deque()
+        self._condition = threading.Condition()
+
+    def enqueue(self, job: Job):
+        """
+        Stores a copy of the job and queues its ID.
+
+        Args:
+            job (Job): The job to queue.
+        """
+        with self._condition:
+            self._jobs[job.id] = job.model_copy(deep=True)
+            self._queue.append(job.id)
+            self._condition.notify()
+
+    def dequeue(self, timeout: float) -> Optional[Job]:
+        """
+        Takes the oldest queued job, waiting for one if the queue is empty.
+
+        Args:
+            timeout (float): How long to wait for a job, in seconds.
+
+        Returns:
+            Optional[Job]: A copy of the job, or None if none was queued before the timeout.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._queue, timeout=timeout):
+                return None
+            return self._jobs[self._queue.popleft()].model_copy(deep=True)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Finds a job by its ID.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            Optional[Job]: A copy of the job, or None if it does not exist.
+        """
+        with self._condition:
+            job = self._jobs.get(job_id)
+            return job.model_copy(deep=True) if job else None
+
+    def update(self, job: Job):
+        """
+        Stores a copy of the new state of a job.
+
+        Args:
+            job (Job): The job to store.
+        """
+        with self._condition:
+            self._jobs[job.id] = job.model_copy(deep=True)
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Implementation of the JobQueue using Redis.
+
+    Each job is stored as a JSON document under `job:<id>`, expiring JOB_TTL_SECONDS after its last
+    update, and the IDs of the queued jobs are kept in the `jobs:queue` list. Workers take IDs with BLPOP,
+    so a job is handed to exactly one worker. A job whose worker dies mid-turn is not handed to another
+    one, since its turn may already be saved: the API reports it as failed once it has been running for
+    too long, and it has to be submitted again.
+    """
+
+    KEY_PREFIX = "job"
+    QUEUE_KEY = "jobs:queue"
+
+    def __init__(self, client: Optional[redis.Redis] = None, ttl_seconds: int = JOB_TTL_SECONDS):
+        """
+        Initializes the RedisJobQueue.
+
+        Args:
+            client (Optional[redis.Redis]): The Redis client to use. If not provided, a client is created
+                from the REDIS_URL environment variable, defaulting to 'redis://localhost:6379'.
+            ttl_seconds (int): How long a job is kept after its last update.
+        """
+        if client is None:
+            client = redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"), decode_responses=True)
+        self.client = client
+        self._ttl_seconds = ttl_seconds
+
+    def _key(self, job_id: str) -> str:
+        """
+        Builds the Redis key of a job.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            str: The Redis key.
+        """
+        return f"{self.KEY_PREFIX}:{job_id}"
+
+    @traced("RedisJobQueue.enqueue")
+    def enqueue(self, job: Job):
+        """
+        Stores the job and queues its ID in a single transaction.
+
+        Args:
+            job (Job): The job to queue.
+        """
+        with self.client.pipeline() as pipeline:
+            pipeline.set(self._key(job.id), job.model_dump_json(), ex=self._ttl_seconds)
+            pipeline.rpush(self.QUEUE_KEY, job.id)
+            pipeline.execute()
+
+    def dequeue(self, timeout: float) -> Optional[Job]:
+        """
+        Takes the oldest queued job with BLPOP.
+
+        Args:
+            timeout (float): How long to wait for a job, in seconds.
+
+        Returns:
+            Optional[Job]: The job, or None if none was queued before the timeout or the job expired while
+                queued.
+        """
+        popped = self.client.blpop([self.QUEUE_KEY], timeout=timeout)
+        if popped is None:
+            return None
+        return self.get(popped[1])
+
+    @traced("RedisJobQueue.get")
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Finds a job by its ID.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            Optional[Job]: The job, or None if it does not exist or has expired.
+        """
+        data = self.client.get(self._key(job_id))
+        if data is None:
+            return None
+        return Job.model_validate_json(data)
+
+    @traced("RedisJobQueue.update")
+    def update(self, job: Job):
+        """
+        Stores the new state of a job and renews its expiry.
+
+        Args:
+            job (Job): The job to store.
+        """
+        self.client.set(self._key(job.id), job.model_dump_json(), ex=self._ttl_seconds)
@@ -0,0 +1,157 @@
+import os
+import threading
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import redis
+from chatbot.adapters.observability.metrics import record_cache_lookup
+from chatbot.adapters.observability.tracing import traced
+from chatbot.domain.ports import OpeningArgumentPool
+
+
+def _pool_key(topic: str, stance: str) -> Tuple[str, str]:
+    """
+    Normalizes a (topic, stance) pair so that "Moon Landing" and "moon landing" share a pool.
+
+    Args:
+        topic (str): The debate topic.
+        stance (str): The stance the bot defends.
+
+    Returns:
+        Tuple[str, str]: The normalized topic and stance.
+    """
+    return topic.strip().lower(), stance.strip().lower()
+
+
+class InMemoryOpeningArgumentPool(OpeningArgumentPool):
+    """In-memory implementation of the opening argument pool."""
+
+    def __init__(self):
+        """
+        Initializes the InMemoryOpeningArgumentPool with one empty queue per (topic, stance) pair.
+        """
+        self._pools: Dict[Tuple[str, str], Deque[str]] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    @traced("InMemoryOpeningArgumentPool.pop")
+    def pop(self, topic: str, stance: str) -> Optional[str]:
+        """
+        Takes the oldest opening argument out of the pool.
+
+        Args:
+            topic (str): The debate topic.
+            stance (str): The stance the bot defends.
+
+        Returns:
+            Optional[str]: An opening argument, or None if the pool is empty.
+        """
+        with self._lock:
+            pool = self._pools[_pool_key(topic, stance)]
+            argument = pool.popleft() if pool else None
+        record_cache_lookup("opening_pool", hit=argument is not None)
+        return argument
+
+    @traced("InMemoryOpeningArgumentPool.push")
+    def push(self, topic: str, stance: str, arguments: List[str]):
+        """
+        Adds opening arguments to the end of the pool.
+
+        Args:
+            topic (str): The debate topic.
+            stance (str): The stance the bot defends.
+            arguments (List[str]): The opening arguments to add.
+        """
+        with self._lock:
+            self._pools[_pool_key(topic, stance)].extend(arguments)
+
+    @traced("InMemoryOpeningArgumentPool.size")
+    def size(self, topic: str, stance: str) -> int:
+        """
+        Returns how many opening arguments are available.
+
+        Args:
+            topic (str): The debate topic.
+            stance (str): The stance the bot defends.
+
+        Returns:
+            int: The number of pooled arguments.
+        """
+        with self._lock:
+            return len(self._pools[_pool_key(topic, stance)])
+
+
+class RedisOpeningArgumentPool(OpeningArgumentPool):
+    """
+    Implementation of the OpeningArgumentPool using one Redis list per (topic, stance) pair.
+    """
+
+    KEY_PREFIX = "opening_pool"
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        """
+        Initializes the RedisOpeningArgumentPool.
+
+        Args:
+            client (Optional[redis.Redis]): The Redis client to use. If not provided, a client is created
+                from the REDIS_URL environment variable, defaulting to 'redis://localhost:6379'.
+        """
+        if client is None:
+            client = redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"), decode_responses=True)
+        self.client = client
+
+    def _key(self, topic: str, stance: str) -> str:
+        """
+        Builds the Redis key of the list holding a pool.
+
+        Args:
+            topic (str): The debate topic.
+            stance (str): The stance the bot defends.
+
+        Returns:
+            str: The Redis key.
+        """
+        normalized_topic, normalized_stance = _pool_key(topic, stance)
+        return f"{self.KEY_PREFIX}:{normalized_topic}:{normalized_stance}"
+
+    @traced("RedisOpeningArgumentPool.pop")
+    def pop(self, topic: str, stance: str) -> Optional[str]:
+        """
+        Takes the oldest opening argument out of the pool with LPOP.
+
+        Args:
+            topic (str): The debate topic.
+            stance (str): The stance the bot defends.
+
+        Returns:
+            Optional[str]: An opening argument, or None if the pool is empty.
+        """
+        argument = self.client.lpop(self._key(topic, stance))
+        record_cache_lookup("opening_pool", hit=argument is not None)
+        return argument
+
+    @traced("RedisOpeningArgumentPool.push")
+    def push(self, topic: str, stance: str, arguments: List[str]):
+        """
+        Adds opening arguments to the end of the pool with a single RPUSH.
+
+        Args:
+            topic (str): The debate topic.
+            stance (str): The stance the bot defends.
+            arguments (List[str]): The opening arguments to add.
+        """
+        if arguments:
+            self.client.rpush(self._key(topic, stance), *arguments)
+
+    @traced("RedisOpeningArgumentPool.size")
+    def size(self, topic: str, stance: str) -> int:
+        """
+        Returns how many opening arguments are available.
+
+        Args:
+            topic (str): The debate topic.
+            stance (str): The stance the bot defends.
+
+        Returns:
+            int: The number of pooled arguments.
+        """
+        return self.client.llen(self._key(topic, stance))
@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional
+
+import redis
+from chatbot.adapters.observability.tracing import traced
+from chatbot.domain.ports import RateLimiter
+
+RATE_LIMIT_REQUESTS = 60
+RATE_LIMIT_WINDOW_SECONDS = 60.0
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """In-memory sliding-window rate limiter, limiting each process on its own."""
+
+    def __init__(self, limit: int = RATE_LIMIT_REQUESTS, window_seconds: float = RATE_LIMIT_WINDOW_SECONDS):
+        """
+        Initializes the InMemoryRateLimiter.
+
+        Args:
+            limit (int): How many requests a client can send per window.
+            window_seconds (float): The length of the sliding window.
+        """
+        self._limit = limit
+        self._window_seconds = window_seconds
+        self._requests: Dict[str, Deque[float]] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def acquire(self, client_id: str, cost: int = 1) -> Optional[float]:
+        """
+        Counts a request of a client if it fits within `limit` requests in the last window.
+
+        Args:
+            client_id (str): The client sending the request.
+            cost (int): How many requests to count it as, capped to the limit.
+
+        Returns:
+            Optional[float]: None if allowed, otherwise the seconds until enough requests leave the window.
+        """
+        cost = min(cost, self._limit)
+        now = time.monotonic()
+        with self._lock:
+            requests = self._requests[client_id]
+            while requests and requests[0] <= now - self._window_seconds:
+                requests.popleft()
+            excess = len(requests) + cost - self._limit
+            if excess > 0:
+                return requests[excess - 1] + self._window_seconds - now
+            requests.extend([now] * cost)
+            return None
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Sliding-window rate limiter shared by every API process through Redis.
+
+    The timestamps of the requests of each client in the current window are kept in a sorted set under
+    `rate_limit:<client>`, with one member per counted request. A request is added, the set trimmed to
+    the window and counted in one MULTI transaction, and removed again if it is over the limit, so that
+    rejected requests do not extend the time a client is blocked.
+    """
+
+    KEY_PREFIX = "rate_limit"
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        limit: int = RATE_LIMIT_REQUESTS,
+        window_seconds: float = RATE_LIMIT_WINDOW_SECONDS
+    ):
+        """
+        Initializes the RedisRateLimiter.
+
+        Args:
+            client (Optional[redis.Redis]): The Redis client to use. If not provided, a client is created
+                from the REDIS_URL environment variable, defaulting to 'redis://localhost:6379'.
+            limit (int): How many requests a client can send per window.
+            window_seconds (float): The length of the sliding window.
+        """
+        if client is None:
+            client = redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"), decode_responses=True)
+        self.client = client
+        self._limit = limit
+        self._window_seconds = window_seconds
+
+    @traced("RedisRateLimiter.acquire")
+    def acquire(self, client_id: str, cost: int = 1) -> Optional[float]:
+        """
+        Counts a request of a client if it fits within `limit` requests in the last window.
+
+        Args:
+            client_id (str): The client sending the request.
+            cost (int): How many requests to count it as, capped to the limit.
+
+        Returns:
+            Optional[float]: None if allowed, otherwise the seconds until enough requests leave the window.
+        """
+        key = f"{self.KEY_PREFIX}:{client_id}"
+        now = time.time()
+        request_id = uuid.uuid4().hex
+        members = {f"{now}:{request_id}:{index}": now for index in range(min(cost, self._limit))}
+        with self.client.pipeline() as pipeline:
+            pipeline.zremrangebyscore(key, "-inf", now - self._window_seconds)
+            pipeline.zadd(key, members)
+            pipeline.zcard(key)
+            pipeline.expire(key, int(self._window_seconds) + 1)
+            _, _, count, _ = pipeline.execute()
+
+        excess = count - self._limit
+        if excess <= 0:
+            return None
+        with self.client.pipeline() as pipeline:
+            pipeline.zrem(key, *members)
+            pipeline.zrange(key, excess - 1, excess - 1, withscores=True)
+            _, freed_by = pipeline.execute()
+        if not freed_by:
+            return 0.0
+        return max(freed_by[0][1] + self._window_seconds - now, 0.0)
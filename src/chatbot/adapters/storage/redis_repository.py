@@ -1,30 +1,120 @@
+import logging
 import os
-from typing import Optional
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 import redis
-from chatbot.domain.models import Conversation
+from pydantic import ValidationError
+from chatbot.adapters.observability.metrics import timed
+from chatbot.adapters.observability.tracing import traced
+from chatbot.domain.models import ChatMessage, Conversation, TokenUsage
 from chatbot.domain.ports import ConversationRepository
 
+logger = logging.getLogger(__name__)
+
 
 class RedisConversationRepository(ConversationRepository):
     """
     Implementation of the ConversationRepository using Redis for persistence.
+
+    Each conversation is stored as a JSON document with its metadata under `conversation:<id>` and a
+    list with one JSON document per message under `conversation:<id>:messages`, so that pages of the
+    history can be read with LRANGE. Conversations written by earlier versions as a single JSON
+    document under the bare ID are still readable, and are migrated on their next save.
+
+    Every save also adds the conversation to sorted-set indexes scored by creation time: one for all
+    conversations, one per topic and one per bot stance, so that counts and listings over a time window
+    run in O(log n + k) instead of scanning the keyspace.
+
+    Usage is kept in one hash per conversation, plus one for the totals, and updated with
+    HINCRBY/HINCRBYFLOAT so that recording it never rewrites the conversation itself.
     """
 
-    def __init__(self):
+    KEY_PREFIX = "conversation"
+    INDEX_KEY_PREFIX = "index"
+    USAGE_KEY_PREFIX = "usage"
+    TOTAL_USAGE_KEY = "usage:total"
+
+    def __init__(self, client: Optional[redis.Redis] = None):
         """
         Initializes the RedisConversationRepository.
 
-        Connects to Redis using the URL provided in the REDIS_URL environment variable,
-        defaulting to 'redis://localhost:6379' if not set.
+        Args:
+            client (Optional[redis.Redis]): The Redis client to use. If not provided, connects to Redis
+                using the URL provided in the REDIS_URL environment variable, defaulting to
+                'redis://localhost:6379' if not set.
         """
-        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
-        self.client = redis.from_url(redis_url, decode_responses=True)
-        print(f"Connecting to Redis at {redis_url}")
+        if client is None:
+            redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
+            client = redis.from_url(redis_url, decode_responses=True)
+            logger.info("Connecting to Redis at %s", redis_url)
+        self.client = client
 
-    def find_by_id(self, conversation_id: str) -> Optional[Conversation]:
+    def _key(self, conversation_id: str) -> str:
+        """
+        Builds the key of the document holding a conversation's metadata.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+
+        Returns:
+            str: The Redis key.
+        """
+        return f"{self.KEY_PREFIX}:{conversation_id}"
+
+    def _messages_key(self, conversation_id: str) -> str:
+        """
+        Builds the key of the list holding a conversation's messages.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+
+        Returns:
+            str: The Redis key.
+        """
+        return f"{self.KEY_PREFIX}:{conversation_id}:messages"
+
+    @staticmethod
+    def _score(moment: datetime) -> float:
+        """
+        Converts a datetime to an index score, treating naive datetimes as UTC.
+
+        Args:
+            moment (datetime): The datetime to convert.
+
+        Returns:
+            float: The POSIX timestamp.
+        """
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.timestamp()
+
+    def _index_key(self, topic: Optional[str] = None, stance: Optional[str] = None) -> str:
+        """
+        Builds the key of the index to query or update.
+
+        Args:
+            topic (Optional[str]): The topic whose index to use.
+            stance (Optional[str]): The bot stance whose index to use.
+
+        Returns:
+            str: The Redis key. The index of all conversations if neither a topic nor a stance is given.
+
+        Raises:
+            ValueError: If both a topic and a stance are given.
+        """
+        if topic is not None and stance is not None:
+            raise ValueError("Filter by topic or by stance, not both")
+        if topic is not None:
+            return f"{self.INDEX_KEY_PREFIX}:topic:{topic.strip().lower()}"
+        if stance is not None:
+            return f"{self.INDEX_KEY_PREFIX}:stance:{stance.strip().lower()}"
+        return f"{self.INDEX_KEY_PREFIX}:created"
+
+    def _find_legacy(self, conversation_id: str) -> Optional[Conversation]:
         """
-        Finds a conversation by its ID in Redis.
+        Finds a conversation stored as a single JSON document under its bare ID.
 
         Args:
             conversation_id (str): The ID of the conversation to find.
@@ -37,11 +127,386 @@ class RedisConversationRepository(ConversationRepository):
             return Conversation.model_validate_json(data)
         return None
 
+    @staticmethod
+    def _assemble(metadata: str, messages: List[str]) -> Conversation:
+        """
+        Rebuilds a conversation from its stored metadata and messages.
+
+        The JSON documents are spliced together and validated in a single pass, which is much cheaper
+        than validating each message separately.
+
+        Args:
+            metadata (str): The JSON document of the conversation without its messages.
+            messages (List[str]): The JSON documents of the messages, in order.
+
+        Returns:
+            Conversation: The conversation, noting that all its messages are persisted.
+        """
+        conversation = Conversation.model_validate_json(f'{metadata[:-1]},"messages":[{",".join(messages)}]}}')
+        conversation._persisted_messages = len(messages)
+        return conversation
+
+    @traced("RedisConversationRepository.find_by_id")
+    @timed("repository_read")
+    def find_by_id(self, conversation_id: str) -> Optional[Conversation]:
+        """
+        Finds a conversation by its ID in Redis, reading its metadata and messages in one round trip.
+
+        Args:
+            conversation_id (str): The ID of the conversation to find.
+
+        Returns:
+            Optional[Conversation]: The found Conversation object, or None if not found.
+        """
+        pipeline = self.client.pipeline()
+        pipeline.get(self._key(conversation_id))
+        pipeline.lrange(self._messages_key(conversation_id), 0, -1)
+        metadata, messages = pipeline.execute()
+        if metadata:
+            return self._assemble(metadata, messages)
+        return self._find_legacy(conversation_id)
+
+    @traced("RedisConversationRepository.save")
+    @timed("repository_write")
     def save(self, conversation: Conversation):
         """
-        Saves a conversation to Redis, serializing it to JSON.
+        Saves a conversation to Redis, atomically replacing its metadata, appending its new messages and
+        updating the indexes.
 
         Args:
             conversation (Conversation): The Conversation object to save.
         """
-        self.client.set(conversation.id, conversation.model_dump_json())
+        pipeline = self.client.pipeline()
+        self._queue_save(pipeline, conversation)
+        pipeline.execute()
+        conversation._persisted_messages = len(conversation.messages)
+
+    def _queue_save(self, pipeline: redis.client.Pipeline, conversation: Conversation):
+        """
+        Queues the commands that store a conversation and update the indexes on a pipeline.
+
+        Messages are only ever appended, so for a conversation read from Redis only the messages added
+        since are serialized and pushed, after trimming the stored list back to the messages it was read
+        with so that retried saves do not duplicate them. A save adding no message, such as a summary
+        update, leaves the list untouched. This keeps the cost of a turn independent of the history
+        length. Other conversations have their whole list rewritten.
+
+        Args:
+            pipeline (redis.client.Pipeline): The pipeline to queue the commands on.
+            conversation (Conversation): The Conversation object to save.
+        """
+        messages_key = self._messages_key(conversation.id)
+        persisted = conversation._persisted_messages
+        pipeline.set(self._key(conversation.id), conversation.model_dump_json(exclude={"messages"}))
+        if 0 < persisted <= len(conversation.messages):
+            new_messages = conversation.messages[persisted:]
+            if new_messages:
+                pipeline.ltrim(messages_key, 0, persisted - 1)
+        else:
+            pipeline.delete(messages_key, conversation.id)
+            new_messages = conversation.messages
+        if new_messages:
+            pipeline.rpush(messages_key, *(msg.model_dump_json() for msg in new_messages))
+        index_entry = {conversation.id: self._score(conversation.created_at)}
+        pipeline.zadd(self._index_key(), index_entry)
+        pipeline.zadd(self._index_key(topic=conversation.topic), index_entry)
+        pipeline.zadd(self._index_key(stance=conversation.strategy), index_entry)
+
+    def iter_conversations(self, batch_size: int = 500) -> Iterator[Conversation]:
+        """
+        Streams every conversation with a cursor SCAN, reading each batch of keys in one pipelined round trip.
+
+        Memory use is bounded by the batch size. Conversations still stored in the legacy single-document
+        layout are found by a second SCAN over the string keys without a prefix, and read with MGET. Such
+        keys that do not hold a conversation are skipped, and their number is logged.
+
+        Args:
+            batch_size (int): The number of conversations to read per round trip.
+
+        Yields:
+            Conversation: The stored conversations, in no particular order.
+        """
+        keys = self.client.scan_iter(match=f"{self.KEY_PREFIX}:*", _type="string", count=batch_size)
+        while True:
+            batch = list(islice(keys, batch_size))
+            if not batch:
+                break
+            pipeline = self.client.pipeline(transaction=False)
+            for key in batch:
+                pipeline.get(key)
+                pipeline.lrange(f"{key}:messages", 0, -1)
+            results = pipeline.execute()
+            for metadata, messages in zip(results[::2], results[1::2]):
+                if metadata:
+                    yield self._assemble(metadata, messages)
+
+        legacy_keys = (key for key in self.client.scan_iter(_type="string", count=batch_size) if ":" not in key)
+        skipped = 0
+        while True:
+            batch = list(islice(legacy_keys, batch_size))
+            if not batch:
+                break
+            for data in self.client.mget(batch):
+                if not data:
+                    continue
+                try:
+                    yield Conversation.model_validate_json(data)
+                except ValidationError:
+                    skipped += 1
+        if skipped:
+            logger.warning("Skipped %d unprefixed keys that do not hold a legacy conversation", skipped)
+
+    def save_many(self, conversations: Iterable[Conversation], batch_size: int = 500) -> int:
+        """
+        Saves conversations in batches, sending each batch in one pipelined round trip.
+
+        The iterable is consumed lazily, so memory use is bounded by the batch size.
+
+        Args:
+            conversations (Iterable[Conversation]): The conversations to save.
+            batch_size (int): The number of conversations to write per round trip.
+
+        Returns:
+            int: The number of conversations saved.
+        """
+        iterator = iter(conversations)
+        saved = 0
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return saved
+            pipeline = self.client.pipeline(transaction=False)
+            for conversation in batch:
+                self._queue_save(pipeline, conversation)
+            pipeline.execute()
+            for conversation in batch:
+                conversation._persisted_messages = len(conversation.messages)
+            saved += len(batch)
+
+    @traced("RedisConversationRepository.count_messages")
+    @timed("repository_read")
+    def count_messages(self, conversation_id: str) -> Optional[int]:
+        """
+        Counts the messages of a conversation with LLEN, without loading them.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+
+        Returns:
+            Optional[int]: The number of messages, or None if the conversation does not exist.
+        """
+        pipeline = self.client.pipeline()
+        pipeline.exists(self._key(conversation_id))
+        pipeline.llen(self._messages_key(conversation_id))
+        exists, count = pipeline.execute()
+        if exists:
+            return count
+        legacy = self._find_legacy(conversation_id)
+        return len(legacy.messages) if legacy else None
+
+    @traced("RedisConversationRepository.find_messages")
+    @timed("repository_read")
+    def find_messages(self, conversation_id: str, offset: int, limit: int) -> Optional[List[ChatMessage]]:
+        """
+        Reads a page of a conversation's messages with LRANGE.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+            offset (int): The index of the first message to read.
+            limit (int): The maximum number of messages to read.
+
+        Returns:
+            Optional[List[ChatMessage]]: The messages, or None if the conversation does not exist.
+        """
+        pipeline = self.client.pipeline()
+        pipeline.exists(self._key(conversation_id))
+        if limit > 0:
+            pipeline.lrange(self._messages_key(conversation_id), offset, offset + limit - 1)
+        exists, *pages = pipeline.execute()
+        messages = pages[0] if pages else []
+        if exists:
+            return [ChatMessage.model_validate_json(msg) for msg in messages]
+        legacy = self._find_legacy(conversation_id)
+        return legacy.messages[offset:offset + max(limit, 0)] if legacy else None
+
+    @traced("RedisConversationRepository.find_message_page")
+    @timed("repository_read")
+    def find_message_page(
+        self, conversation_id: str, offset: int, limit: int
+    ) -> Optional[Tuple[int, List[ChatMessage]]]:
+        """
+        Reads a page of a conversation's messages with LRANGE and their count with LLEN, in one transaction
+        so that the count matches the page even while turns are appended.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+            offset (int): The index of the first message to read.
+            limit (int): The maximum number of messages to read.
+
+        Returns:
+            Optional[Tuple[int, List[ChatMessage]]]: The message count and the messages, or None if the
+                conversation does not exist.
+        """
+        pipeline = self.client.pipeline()
+        pipeline.exists(self._key(conversation_id))
+        pipeline.llen(self._messages_key(conversation_id))
+        if limit > 0:
+            pipeline.lrange(self._messages_key(conversation_id), offset, offset + limit - 1)
+        exists, count, *pages = pipeline.execute()
+        messages = pages[0] if pages else []
+        if exists:
+            return count, [ChatMessage.model_validate_json(msg) for msg in messages]
+        legacy = self._find_legacy(conversation_id)
+        return (len(legacy.messages), legacy.messages[offset:offset + max(limit, 0)]) if legacy else None
+
+    @traced("RedisConversationRepository.count_conversations")
+    @timed("repository_query")
+    def count_conversations(
+        self,
+        topic: Optional[str] = None,
+        stance: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> int:
+        """
+        Counts the conversations created in a time window with ZCOUNT on the matching index.
+
+        Args:
+            topic (Optional[str]): Only count conversations on this topic.
+            stance (Optional[str]): Only count conversations where the bot defends this stance.
+            since (Optional[datetime]): Only count conversations created at or after this time.
+            until (Optional[datetime]): Only count conversations created at or before this time.
+
+        Returns:
+            int: The number of matching conversations.
+        """
+        return self.client.zcount(
+            self._index_key(topic=topic, stance=stance),
+            self._score(since) if since else "-inf",
+            self._score(until) if until else "+inf"
+        )
+
+    @traced("RedisConversationRepository.list_conversation_ids")
+    @timed("repository_query")
+    def list_conversation_ids(
+        self,
+        topic: Optional[str] = None,
+        stance: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 100
+    ) -> List[str]:
+        """
+        Lists the IDs of the conversations created in a time window with ZRANGEBYSCORE on the matching index.
+
+        Args:
+            topic (Optional[str]): Only list conversations on this topic.
+            stance (Optional[str]): Only list conversations where the bot defends this stance.
+            since (Optional[datetime]): Only list conversations created at or after this time.
+            until (Optional[datetime]): Only list conversations created at or before this time.
+            offset (int): The number of matching conversations to skip.
+            limit (int): The maximum number of IDs to return.
+
+        Returns:
+            List[str]: The conversation IDs, oldest first.
+        """
+        if limit <= 0:
+            return []
+        return self.client.zrangebyscore(
+            self._index_key(topic=topic, stance=stance),
+            self._score(since) if since else "-inf",
+            self._score(until) if until else "+inf",
+            start=offset,
+            num=limit
+        )
+
+    def update_summary(
+        self, conversation_id: str, summary: str, summarized_count: int, expected_summarized_count: int
+    ) -> bool:
+        """
+        Atomically replaces the rolling summary of a conversation in its metadata document.
+
+        The document is watched while it is updated, and the update retried if a save replaced it in the
+        meantime. The message list is not touched, so turns saved concurrently are kept. Conversations
+        still stored in the legacy layout are migrated by a full save.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+            summary (str): The new summary.
+            summarized_count (int): The number of leading messages folded into the new summary.
+            expected_summarized_count (int): The number of summarized messages the summary was built upon.
+
+        Returns:
+            bool: True if the summary was updated, False if the conversation does not exist or its summary
+                changed in the meantime.
+        """
+        key = self._key(conversation_id)
+        with self.client.pipeline() as pipeline:
+            while True:
+                try:
+                    pipeline.watch(key)
+                    metadata = pipeline.get(key)
+                    if not metadata:
+                        pipeline.unwatch()
+                        break
+                    conversation = Conversation.model_validate_json(metadata)
+                    if conversation.summarized_count != expected_summarized_count:
+                        pipeline.unwatch()
+                        return False
+                    conversation.summary = summary
+                    conversation.summarized_count = summarized_count
+                    pipeline.multi()
+                    pipeline.set(key, conversation.model_dump_json(exclude={"messages"}))
+                    pipeline.execute()
+                    return True
+                except redis.WatchError:
+                    continue
+
+        conversation = self._find_legacy(conversation_id)
+        if conversation is None or conversation.summarized_count != expected_summarized_count:
+            return False
+        conversation.summary = summary
+        conversation.summarized_count = summarized_count
+        self.save(conversation)
+        return True
+
+    def add_usage(self, conversation_id: str, usage: TokenUsage):
+        """
+        Atomically adds AI provider usage to a conversation and to the aggregate totals in one round trip.
+
+        Args:
+            conversation_id (str): The ID of the conversation that incurred the usage.
+            usage (TokenUsage): The usage to add.
+        """
+        pipeline = self.client.pipeline(transaction=False)
+        for key in (f"{self.USAGE_KEY_PREFIX}:{conversation_id}", self.TOTAL_USAGE_KEY):
+            pipeline.hincrby(key, "prompt_tokens", usage.prompt_tokens)
+            pipeline.hincrby(key, "completion_tokens", usage.completion_tokens)
+            pipeline.hincrbyfloat(key, "cost", usage.cost)
+            pipeline.hincrby(key, "calls", usage.calls)
+        pipeline.execute()
+
+    def get_usage(self, conversation_id: str) -> Optional[TokenUsage]:
+        """
+        Returns the AI provider usage accumulated by a conversation.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+
+        Returns:
+            Optional[TokenUsage]: The accumulated usage, or None if none was recorded.
+        """
+        data = self.client.hgetall(f"{self.USAGE_KEY_PREFIX}:{conversation_id}")
+        if data:
+            return TokenUsage.model_validate(data)
+        return None
+
+    def get_total_usage(self) -> TokenUsage:
+        """
+        Returns the AI provider usage accumulated by all conversations.
+
+        Returns:
+            TokenUsage: The aggregate usage.
+        """
+        return TokenUsage.model_validate(self.client.hgetall(self.TOTAL_USAGE_KEY))
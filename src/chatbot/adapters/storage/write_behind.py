@@ -0,0 +1,404 @@
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from chatbot.adapters.observability.metrics import record_write_behind_pending
+from chatbot.adapters.observability.tracing import traced
+from chatbot.domain.models import ChatMessage, Conversation, TokenUsage
+from chatbot.domain.ports import ConversationRepository
+
+logger = logging.getLogger(__name__)
+
+WRITE_BEHIND_MAX_PENDING = 1000
+WRITE_BEHIND_BATCH_SIZE = 100
+WRITE_BEHIND_LINGER_SECONDS = 0.05
+WRITE_BEHIND_RETRY_SECONDS = 1.0
+
+
+class WriteBehindConversationRepository(ConversationRepository):
+    """
+    Conversation repository that acknowledges saves once buffered and writes them to another repository
+    from a background thread.
+
+    Saves of a conversation that is still buffered replace the buffered copy, so a conversation updated
+    several times between two flushes is written once. Conversations are read from the buffer while they
+    are buffered or being flushed, and from the wrapped repository otherwise. The conversation queries
+    and exports only see buffered conversations once they are flushed.
+
+    At most `max_pending` conversations are buffered: saving another one blocks until a flush frees
+    room, which bounds how many writes a crash can lose. Failed flushes are retried, and `close` drains
+    the buffer before the process exits.
+    """
+
+    def __init__(
+        self,
+        repository: ConversationRepository,
+        max_pending: int = WRITE_BEHIND_MAX_PENDING,
+        batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+        linger_seconds: float = WRITE_BEHIND_LINGER_SECONDS,
+        retry_seconds: float = WRITE_BEHIND_RETRY_SECONDS
+    ):
+        """
+        Initializes the WriteBehindConversationRepository and starts its flush thread.
+
+        Args:
+            repository (ConversationRepository): The repository the conversations are written to.
+            max_pending (int): How many conversations can be buffered before saves block.
+            batch_size (int): How many conversations are written per flush.
+            linger_seconds (float): How long the flush thread waits for more saves to coalesce before flushing.
+            retry_seconds (float): How long to wait before retrying a failed flush.
+        """
+        self._repository = repository
+        self._max_pending = max_pending
+        self._batch_size = batch_size
+        self._linger_seconds = linger_seconds
+        self._retry_seconds = retry_seconds
+        self._pending: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._flushing: Dict[str, Conversation] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def _buffered(self, conversation_id: str) -> Optional[Conversation]:
+        """
+        Returns the latest buffered copy of a conversation. Must be called with the lock held.
+
+        Args:
+            conversation_id (str): The unique identifier of the conversation.
+
+        Returns:
+            Optional[Conversation]: The buffered conversation, or None if it is not buffered.
+        """
+        conversation = self._pending.get(conversation_id)
+        if conversation is None:
+            conversation = self._flushing.get(conversation_id)
+        return conversation
+
+    @traced("WriteBehindConversationRepository.find_by_id")
+    def find_by_id(self, conversation_id: str) -> Optional[Conversation]:
+        """
+        Finds a conversation by its ID, in the buffer first.
+
+        Args:
+            conversation_id (str): The unique identifier of the conversation.
+
+        Returns:
+            Optional[Conversation]: A snapshot of the buffered conversation, or the stored one, or None.
+        """
+        with self._condition:
+            conversation = self._buffered(conversation_id)
+            if conversation is not None:
+                return conversation.snapshot()
+        return self._repository.find_by_id(conversation_id)
+
+    @traced("WriteBehindConversationRepository.save")
+    def save(self, conversation: Conversation):
+        """
+        Buffers a snapshot of a conversation, replacing any buffered copy of it.
+
+        Args:
+            conversation (Conversation): The conversation object to be saved.
+
+        Raises:
+            RuntimeError: If the repository was closed.
+        """
+        copy = conversation.snapshot()
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._closed or copy.id in self._pending or len(self._pending) < self._max_pending
+            )
+            if self._closed:
+                raise RuntimeError("The write-behind repository is closed")
+            self._pending[copy.id] = copy
+            record_write_behind_pending(len(self._pending))
+            self._condition.notify_all()
+
+    def iter_conversations(self, batch_size: int = 500) -> Iterator[Conversation]:
+        """
+        Iterates over every stored conversation. Buffered changes are not included until flushed.
+
+        Args:
+            batch_size (int): The number of conversations to read per round trip.
+
+        Yields:
+            Conversation: The stored conversations.
+        """
+        return self._repository.iter_conversations(batch_size=batch_size)
+
+    def save_many(self, conversations: Iterable[Conversation], batch_size: int = 500) -> int:
+        """
+        Saves several conversations directly to the wrapped repository, bypassing the buffer.
+
+        Args:
+            conversations (Iterable[Conversation]): The conversations to save.
+            batch_size (int): The number of conversations to write per round trip.
+
+        Returns:
+            int: The number of conversations saved.
+        """
+        return self._repository.save_many(conversations, batch_size=batch_size)
+
+    def count_messages(self, conversation_id: str) -> Optional[int]:
+        """
+        Counts the messages of a conversation, in the buffer first.
+
+        Args:
+            conversation_id (str): The unique identifier of the conversation.
+
+        Returns:
+            Optional[int]: The number of messages, or None if the conversation does not exist.
+        """
+        with self._condition:
+            conversation = self._buffered(conversation_id)
+            if conversation is not None:
+                return len(conversation.messages)
+        return self._repository.count_messages(conversation_id)
+
+    def find_messages(self, conversation_id: str, offset: int, limit: int) -> Optional[List[ChatMessage]]:
+        """
+        Returns a range of the messages of a conversation, in the buffer first.
+
+        Args:
+            conversation_id (str): The unique identifier of the conversation.
+            offset (int): The index of the first message to return.
+            limit (int): The maximum number of messages to return.
+
+        Returns:
+            Optional[List[ChatMessage]]: The messages, or None if the conversation does not exist.
+        """
+        with self._condition:
+            conversation = self._buffered(conversation_id)
+            if conversation is not None:
+                if limit <= 0:
+                    return []
+                return conversation.messages[offset:offset + limit]
+        return self._repository.find_messages(conversation_id, offset, limit)
+
+    def find_message_page(
+        self, conversation_id: str, offset: int, limit: int
+    ) -> Optional[Tuple[int, List[ChatMessage]]]:
+        """
+        Returns the message count and a range of the messages of a conversation, in the buffer first.
+
+        Args:
+            conversation_id (str): The unique identifier of the conversation.
+            offset (int): The index of the first message to return.
+            limit (int): The maximum number of messages to return.
+
+        Returns:
+            Optional[Tuple[int, List[ChatMessage]]]: The message count and the messages, or None if the
+                conversation does not exist.
+        """
+        with self._condition:
+            conversation = self._buffered(conversation_id)
+            if conversation is not None:
+                return len(conversation.messages), conversation.messages[offset:offset + max(limit, 0)]
+        return self._repository.find_message_page(conversation_id, offset, limit)
+
+    def count_conversations(
+        self,
+        topic: Optional[str] = None,
+        stance: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> int:
+        """
+        Counts the stored conversations. Buffered conversations are not included until flushed.
+
+        Args:
+            topic (Optional[str]): Only count conversations on this topic.
+            stance (Optional[str]): Only count conversations where the bot defends this stance.
+            since (Optional[datetime]): Only count conversations created at or after this time.
+            until (Optional[datetime]): Only count conversations created at or before this time.
+
+        Returns:
+            int: The number of matching conversations.
+        """
+        return self._repository.count_conversations(topic=topic, stance=stance, since=since, until=until)
+
+    def list_conversation_ids(
+        self,
+        topic: Optional[str] = None,
+        stance: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 100
+    ) -> List[str]:
+        """
+        Lists the IDs of the stored conversations. Buffered conversations are not included until flushed.
+
+        Args:
+            topic (Optional[str]): Only list conversations on this topic.
+            stance (Optional[str]): Only list conversations where the bot defends this stance.
+            since (Optional[datetime]): Only list conversations created at or after this time.
+            until (Optional[datetime]): Only list conversations created at or before this time.
+            offset (int): The number of matching conversations to skip.
+            limit (int): The maximum number of IDs to return.
+
+        Returns:
+            List[str]: The matching conversation IDs, oldest first.
+        """
+        return self._repository.list_conversation_ids(
+            topic=topic, stance=stance, since=since, until=until, offset=offset, limit=limit
+        )
+
+    def add_usage(self, conversation_id: str, usage: TokenUsage):
+        """
+        Adds usage to a conversation and to the total, directly in the wrapped repository.
+
+        Args:
+            conversation_id (str): The unique identifier of the conversation.
+            usage (TokenUsage): The usage to add.
+        """
+        self._repository.add_usage(conversation_id, usage)
+
+    def get_usage(self, conversation_id: str) -> Optional[TokenUsage]:
+        """
+        Returns the usage accumulated by a conversation.
+
+        Args:
+            conversation_id (str): The unique identifier of the conversation.
+
+        Returns:
+            Optional[TokenUsage]: The usage, or None if none was recorded.
+        """
+        return self._repository.get_usage(conversation_id)
+
+    def get_total_usage(self) -> TokenUsage:
+        """
+        Returns the usage accumulated by all conversations.
+
+        Returns:
+            TokenUsage: The aggregate usage.
+        """
+        return self._repository.get_total_usage()
+
+    def update_summary(
+        self, conversation_id: str, summary: str, summarized_count: int, expected_summarized_count: int
+    ) -> bool:
+        """
+        Replaces the rolling summary of a conversation, in the buffer if it is buffered.
+
+        A buffered conversation gets a new buffered copy with the summary replaced, which is flushed like
+        any other save. Other conversations are updated directly in the wrapped repository.
+
+        Args:
+            conversation_id (str): The unique identifier of the conversation.
+            summary (str): The new summary.
+            summarized_count (int): The number of leading messages folded into the new summary.
+            expected_summarized_count (int): The number of summarized messages the summary was built upon.
+
+        Returns:
+            bool: True if the summary was updated, False if the conversation does not exist or its summary
+                changed in the meantime.
+        """
+        with self._condition:
+            conversation = self._buffered(conversation_id)
+            if conversation is not None:
+                if conversation.summarized_count != expected_summarized_count:
+                    return False
+                self._pending[conversation_id] = conversation.model_copy(
+                    update={"summary": summary, "summarized_count": summarized_count}
+                )
+                record_write_behind_pending(len(self._pending))
+                self._condition.notify_all()
+                return True
+        return self._repository.update_summary(
+            conversation_id, summary, summarized_count, expected_summarized_count
+        )
+
+    def pending(self) -> int:
+        """
+        Returns how many conversations are waiting to be written.
+
+        Returns:
+            int: The number of buffered conversations, including those being flushed.
+        """
+        with self._condition:
+            return len(self._pending) + len(self._flushing)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every buffered conversation is written.
+
+        Args:
+            timeout (Optional[float]): How long to wait, in seconds. None waits for as long as it takes.
+
+        Returns:
+            bool: True if the buffer is empty, False if the timeout expired first.
+        """
+        with self._condition:
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: not self._pending and not self._flushing, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Rejects further saves, drains the buffer and stops the flush thread.
+
+        Args:
+            timeout (Optional[float]): How long to wait for the drain, in seconds. None waits for as long as
+                it takes.
+
+        Returns:
+            bool: True if every buffered conversation was written.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        drained = not self._thread.is_alive()
+        if not drained:
+            logger.error("Write-behind buffer not drained on close, %d conversations pending", self.pending())
+        return drained
+
+    def _take_batch(self) -> Optional[List[Conversation]]:
+        """
+        Waits for buffered conversations and moves the oldest batch of them to the flushing set.
+
+        Returns:
+            Optional[List[Conversation]]: The batch, or None once the repository is closed and drained.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending or self._closed)
+            if not self._pending:
+                return None
+            if not self._closed and len(self._pending) < self._batch_size:
+                self._condition.wait(self._linger_seconds)
+            batch = []
+            while self._pending and len(batch) < self._batch_size:
+                conversation_id, conversation = self._pending.popitem(last=False)
+                self._flushing[conversation_id] = conversation
+                batch.append(conversation)
+            record_write_behind_pending(len(self._pending))
+            self._condition.notify_all()
+            return batch
+
+    def _run(self):
+        """
+        Writes batches of buffered conversations until the repository is closed and drained.
+        """
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            try:
+                self._repository.save_many(batch, batch_size=len(batch))
+                failed = False
+            except Exception as e:
+                logger.exception("Error flushing %d buffered conversations: %s", len(batch), e)
+                failed = True
+
+            with self._condition:
+                for conversation in batch:
+                    del self._flushing[conversation.id]
+                    if failed and conversation.id not in self._pending:
+                        self._pending[conversation.id] = conversation
+                        self._pending.move_to_end(conversation.id, last=False)
+                record_write_behind_pending(len(self._pending))
+                self._condition.notify_all()
+                if failed:
+                    self._condition.wait(self._retry_seconds)
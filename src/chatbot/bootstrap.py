@@ -1,9 +1,165 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+from typing import Optional
 
+import httpx
+import redis
+from chatbot.adapters.llm.http_client import http_client_from_env
 from chatbot.adapters.llm.openai_provider import OpenAIProvider
-from chatbot.domain.ports import ChatUseCase
-from chatbot.domain.services import ChatService
+from chatbot.adapters.observability.metrics import record_startup
+from chatbot.adapters.observability.readiness import ReadinessProbe
+from chatbot.adapters.observability.recording import RecordingAIProvider, TrafficRecorder
+from chatbot.domain.ports import (
+    ChatUseCase, ConversationRepository, GenerativeAIProvider, IdempotencyStore, JobQueue, OpeningArgumentPool,
+    RateLimiter
+)
+from chatbot.domain.services import ChatService, OpeningPoolRefiller
+from chatbot.adapters.storage.idempotency import IDEMPOTENCY_TTL_SECONDS, RedisIdempotencyStore
+from chatbot.adapters.storage.jobs import JOB_TTL_SECONDS, RedisJobQueue
+from chatbot.adapters.storage.opening_pool import RedisOpeningArgumentPool
+from chatbot.adapters.storage.rate_limit import RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW_SECONDS, RedisRateLimiter
 from chatbot.adapters.storage.redis_repository import RedisConversationRepository
+from chatbot.adapters.storage.write_behind import WRITE_BEHIND_MAX_PENDING, WriteBehindConversationRepository
+
+logger = logging.getLogger(__name__)
+
+WRITE_BEHIND_DRAIN_SECONDS = 30.0
+REDIS_SOCKET_TIMEOUT_SECONDS = 5.0
+OPENAI_READINESS_CACHE_SECONDS = 30.0
+
+_loaded_at = time.monotonic()
+_warm_up_done = threading.Event()
+
+
+@lru_cache(maxsize=None)
+def get_redis_client() -> redis.Redis:
+    """
+    Initializes and returns the Redis client, connecting to REDIS_URL, defaulting to 'redis://localhost:6379'.
+    This function is cached to ensure a single Redis connection pool is used application-wide.
+
+    Commands fail after REDIS_SOCKET_TIMEOUT_SECONDS instead of hanging on an unresponsive server. The
+    timeout must exceed the blocking wait of the job worker.
+    """
+    timeout = float(os.getenv("REDIS_SOCKET_TIMEOUT_SECONDS", REDIS_SOCKET_TIMEOUT_SECONDS))
+    return redis.from_url(
+        os.getenv("REDIS_URL", "redis://localhost:6379"),
+        decode_responses=True,
+        socket_timeout=timeout,
+        socket_connect_timeout=timeout
+    )
+
+
+def write_behind_enabled() -> bool:
+    """
+    Tells whether WRITE_BEHIND_ENABLED is set to "true".
+
+    The write-behind buffer only lets the process that buffered a turn read it back, so it must not be
+    combined with other processes writing the same conversations: the job worker refuses to start and
+    the API refuses asynchronous turns while it is enabled.
+    """
+    return os.getenv("WRITE_BEHIND_ENABLED", "false").lower() == "true"
+
+
+@lru_cache(maxsize=None)
+def get_conversation_repository() -> ConversationRepository:
+    """
+    Initializes and returns the conversation repository.
+    This function is cached to ensure a single instance is used application-wide.
+
+    When WRITE_BEHIND_ENABLED is set to "true", saves are buffered in process and written to Redis in
+    the background, with at most WRITE_BEHIND_MAX_PENDING conversations buffered.
+    """
+    repository = RedisConversationRepository(client=get_redis_client())
+    if write_behind_enabled():
+        return WriteBehindConversationRepository(
+            repository,
+            max_pending=int(os.getenv("WRITE_BEHIND_MAX_PENDING", WRITE_BEHIND_MAX_PENDING))
+        )
+    return repository
+
+
+@lru_cache(maxsize=None)
+def get_http_client() -> httpx.Client:
+    """
+    Initializes and returns the HTTP client of the OpenAI API, configured from the OPENAI_HTTP_* variables.
+    This function is cached to ensure a single connection pool is used application-wide.
+    """
+    return http_client_from_env()
+
+
+@lru_cache(maxsize=None)
+def get_traffic_recorder() -> Optional[TrafficRecorder]:
+    """
+    Initializes and returns the recorder of the chat traffic, or None unless TRAFFIC_RECORDING_PATH is set.
+    Records are appended to that file, with identifiers digested with TRAFFIC_RECORDING_SALT, which
+    defaults to a random salt.
+    """
+    path = os.getenv("TRAFFIC_RECORDING_PATH")
+    if not path:
+        return None
+    return TrafficRecorder(path, salt=os.getenv("TRAFFIC_RECORDING_SALT"))
+
+
+@lru_cache(maxsize=None)
+def get_ai_provider() -> GenerativeAIProvider:
+    """
+    Initializes and returns the AI provider.
+    This function is cached to ensure a single OpenAI client is used application-wide.
+
+    While traffic is recorded, the provider calls made by the recorded requests are recorded as well.
+    """
+    provider = OpenAIProvider(model="gpt-4o-mini", http_client=get_http_client())
+    recorder = get_traffic_recorder()
+    if recorder is not None:
+        return RecordingAIProvider(provider, recorder)
+    return provider
+
+
+@lru_cache(maxsize=None)
+def get_opening_pool() -> Optional[OpeningArgumentPool]:
+    """
+    Initializes and returns the pool of pre-generated opening arguments, stored in the same Redis instance
+    as the conversations, or None if OPENING_POOL_ENABLED is set to "false".
+    """
+    if os.getenv("OPENING_POOL_ENABLED", "true").lower() != "true":
+        return None
+    return RedisOpeningArgumentPool(client=get_redis_client())
+
+
+@lru_cache(maxsize=None)
+def get_opening_pool_refiller() -> Optional[OpeningPoolRefiller]:
+    """
+    Initializes and returns the background refiller of the opening argument pool, or None if the pool
+    is disabled. The refiller is not started: only the API starts it, see `start_opening_pool_refiller`.
+    """
+    pool = get_opening_pool()
+    if pool is None:
+        return None
+    return OpeningPoolRefiller(pool=pool, ai_provider=get_ai_provider(), repository=get_conversation_repository())
+
+
+def start_opening_pool_refiller():
+    """
+    Starts keeping the opening argument pool stocked in the background, unless the pool is disabled.
+
+    It is called once by the API on startup, so that other processes building the chat service, such as
+    the job worker, only consume the pool.
+    """
+    refiller = get_opening_pool_refiller()
+    if refiller is not None:
+        refiller.start()
+
+
+@lru_cache(maxsize=None)
+def get_summary_executor() -> ThreadPoolExecutor:
+    """
+    Initializes and returns the executor refreshing conversation summaries in the background.
+    """
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="summary")
 
 
 @lru_cache(maxsize=None)
@@ -11,9 +167,162 @@ def get_chat_service() -> ChatUseCase:
     """
     Initializes and returns a ChatService instance.
     This function is cached to ensure a single instance of ChatService is used application-wide.
+
+    Unless OPENING_POOL_ENABLED is set to "false", new conversations start with an opening argument
+    from the pool when it has one.
+    """
+    _repository = get_conversation_repository()
+
+    _ai_provider = get_ai_provider()
+
+    return ChatService(
+        repository=_repository,
+        ai_provider=_ai_provider,
+        summary_executor=get_summary_executor(),
+        opening_pool=get_opening_pool()
+    )
+
+
+@lru_cache(maxsize=None)
+def get_job_queue() -> JobQueue:
+    """
+    Initializes and returns the queue of chat turns submitted for asynchronous processing.
+    It is stored in the same Redis instance as the conversations, and jobs expire JOB_TTL_SECONDS after
+    their last update.
     """
-    _repository = RedisConversationRepository()
+    return RedisJobQueue(
+        client=get_redis_client(),
+        ttl_seconds=int(os.getenv("JOB_TTL_SECONDS", JOB_TTL_SECONDS))
+    )
 
-    _ai_provider = OpenAIProvider(model="gpt-4o-mini")
 
-    return ChatService(repository=_repository, ai_provider=_ai_provider)
+@lru_cache(maxsize=None)
+def get_idempotency_store() -> IdempotencyStore:
+    """
+    Initializes and returns the store of the responses recorded under idempotency keys.
+    It is stored in the same Redis instance as the conversations, and responses are replayed for
+    IDEMPOTENCY_TTL_SECONDS.
+    """
+    return RedisIdempotencyStore(
+        client=get_redis_client(),
+        ttl_seconds=int(os.getenv("IDEMPOTENCY_TTL_SECONDS", IDEMPOTENCY_TTL_SECONDS))
+    )
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Initializes and returns the per-client rate limiter shared by every API process through Redis.
+    Clients can send RATE_LIMIT_REQUESTS requests per RATE_LIMIT_WINDOW_SECONDS, and rate limiting is
+    disabled, returning None, when RATE_LIMIT_REQUESTS is 0.
+    """
+    limit = int(os.getenv("RATE_LIMIT_REQUESTS", RATE_LIMIT_REQUESTS))
+    if limit <= 0:
+        return None
+    return RedisRateLimiter(
+        client=get_redis_client(),
+        limit=limit,
+        window_seconds=float(os.getenv("RATE_LIMIT_WINDOW_SECONDS", RATE_LIMIT_WINDOW_SECONDS))
+    )
+
+
+def shutdown():
+    """
+    Releases the application-wide resources before the process exits.
+
+    The opening pool refiller is stopped and the summaries being refreshed are waited for first, as both
+    call the OpenAI API and save to the repository. The write-behind buffer, if enabled, is then drained
+    for up to WRITE_BEHIND_DRAIN_SECONDS, and the pooled connections to the OpenAI API and the traffic
+    recording are closed.
+    """
+    if get_opening_pool_refiller.cache_info().currsize and get_opening_pool_refiller() is not None:
+        get_opening_pool_refiller().stop()
+    if get_summary_executor.cache_info().currsize:
+        get_summary_executor().shutdown(wait=True)
+    if get_conversation_repository.cache_info().currsize:
+        repository = get_conversation_repository()
+        if isinstance(repository, WriteBehindConversationRepository):
+            repository.close(timeout=WRITE_BEHIND_DRAIN_SECONDS)
+    if get_http_client.cache_info().currsize:
+        get_http_client().close()
+    if get_traffic_recorder.cache_info().currsize and get_traffic_recorder() is not None:
+        get_traffic_recorder().close()
+
+
+def warm_up():
+    """
+    Builds the application-wide objects and opens their connections ahead of the first request.
+
+    The chat service and its dependencies are built, a connection is opened to Redis and another one,
+    kept alive for later completions, to the OpenAI API. Failures are logged and left to the readiness
+    checks to report.
+    """
+    start = time.perf_counter()
+    try:
+        get_chat_service()
+        get_job_queue()
+        get_idempotency_store()
+        get_rate_limiter()
+        connections = (("Redis", lambda: get_redis_client().ping()), ("OpenAI", lambda: get_ai_provider().ping()))
+        for name, connect in connections:
+            try:
+                connect()
+            except Exception as e:
+                logger.warning("Could not connect to %s during warm-up: %s", name, e)
+    except Exception as e:
+        logger.exception("Warm-up failed: %s", e)
+    finally:
+        _warm_up_done.set()
+        logger.info("Warm-up finished in %.3f s", time.perf_counter() - start)
+
+
+def start_warm_up() -> threading.Thread:
+    """
+    Runs the warm-up on a daemon thread, so that the process starts accepting connections meanwhile.
+
+    Returns:
+        threading.Thread: The warm-up thread.
+    """
+    thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def _check_warm_up():
+    """
+    Readiness check passing once the warm-up finished.
+
+    Raises:
+        RuntimeError: While the warm-up is running.
+    """
+    if not _warm_up_done.is_set():
+        raise RuntimeError("Warm-up in progress")
+
+
+def _record_time_to_ready():
+    """
+    Records the time from this module being loaded to the process being found ready.
+    """
+    seconds = time.monotonic() - _loaded_at
+    record_startup(seconds)
+    logger.info("Ready %.3f s after start", seconds)
+
+
+@lru_cache(maxsize=None)
+def get_readiness_probe() -> ReadinessProbe:
+    """
+    Initializes and returns the readiness probe.
+
+    The process is ready once the warm-up finished and Redis answers. The OpenAI API is checked less
+    often and does not affect readiness, as the service answers with fallbacks while it is unreachable.
+    """
+    probe = ReadinessProbe(on_first_ready=_record_time_to_ready)
+    probe.add_check("warm_up", _check_warm_up)
+    probe.add_check("redis", lambda: get_redis_client().ping())
+    probe.add_check(
+        "openai",
+        lambda: get_ai_provider().ping(),
+        critical=False,
+        cache_seconds=OPENAI_READINESS_CACHE_SECONDS
+    )
+    return probe
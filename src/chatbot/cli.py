@@ -0,0 +1,166 @@
+import argparse
+import gzip
+import io
+import sys
+import time
+from typing import IO, Iterator, List, Optional
+
+from chatbot.bootstrap import get_conversation_repository
+from chatbot.domain.models import Conversation
+from chatbot.domain.ports import ConversationRepository
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def export_conversations(repository: ConversationRepository, output: IO[str], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Writes every stored conversation to a stream as NDJSON, one conversation per line.
+
+    Args:
+        repository (ConversationRepository): The repository to read from.
+        output (IO[str]): The text stream to write to.
+        batch_size (int): The number of conversations to read per round trip.
+
+    Returns:
+        int: The number of conversations exported.
+    """
+    exported = 0
+    for conversation in repository.iter_conversations(batch_size=batch_size):
+        output.write(conversation.model_dump_json())
+        output.write("\n")
+        exported += 1
+    return exported
+
+
+def _parse_lines(lines: IO[str]) -> Iterator[Conversation]:
+    """
+    Lazily parses NDJSON lines into conversations, skipping blank lines.
+
+    Args:
+        lines (IO[str]): The text stream to read from.
+
+    Yields:
+        Conversation: The parsed conversations.
+    """
+    for line in lines:
+        if line.strip():
+            yield Conversation.model_validate_json(line)
+
+
+def import_conversations(repository: ConversationRepository, source: IO[str], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Loads NDJSON conversations from a stream into the repository, streaming them in batches.
+
+    Args:
+        repository (ConversationRepository): The repository to write to.
+        source (IO[str]): The text stream to read from.
+        batch_size (int): The number of conversations to write per round trip.
+
+    Returns:
+        int: The number of conversations imported.
+    """
+    return repository.save_many(_parse_lines(source), batch_size=batch_size)
+
+
+def _is_gzip(path: str, flag: bool) -> bool:
+    """
+    Decides whether a file is gzip-compressed.
+
+    Args:
+        path (str): The file path, "-" for the standard streams.
+        flag (bool): Whether --gzip was given.
+
+    Returns:
+        bool: True if the file is gzip-compressed.
+    """
+    return flag or path.endswith(".gz")
+
+
+def _open_output(path: str, compress: bool) -> IO[str]:
+    """
+    Opens the export destination as a text stream. Closing the stream closes the file too.
+
+    Args:
+        path (str): The file path, "-" for the standard output.
+        compress (bool): Whether to gzip the output.
+
+    Returns:
+        IO[str]: The text stream.
+    """
+    if path == "-":
+        raw = gzip.GzipFile(fileobj=sys.stdout.buffer, mode="wb", compresslevel=6) if compress else sys.stdout.buffer
+    else:
+        raw = gzip.open(path, "wb", compresslevel=6) if compress else open(path, "wb")
+    return io.TextIOWrapper(raw, encoding="utf-8", newline="\n")
+
+
+def _open_input(path: str, compressed: bool) -> IO[str]:
+    """
+    Opens the import source as a text stream. Closing the stream closes the file too.
+
+    Args:
+        path (str): The file path, "-" for the standard input.
+        compressed (bool): Whether the input is gzip-compressed.
+
+    Returns:
+        IO[str]: The text stream.
+    """
+    if path == "-":
+        raw = gzip.GzipFile(fileobj=sys.stdin.buffer, mode="rb") if compressed else sys.stdin.buffer
+    else:
+        raw = gzip.open(path, "rb") if compressed else open(path, "rb")
+    return io.TextIOWrapper(raw, encoding="utf-8")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the command line parser.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(prog="kopi-chatbot", description="Kopi chatbot maintenance commands.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="Stream every conversation out as NDJSON.")
+    export_parser.add_argument("-o", "--output", default="-", help="Output file, '-' for stdout (default).")
+    export_parser.add_argument("--gzip", action="store_true", help="Gzip the output (implied by a .gz file name).")
+    export_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    import_parser = commands.add_parser("import", help="Load NDJSON conversations.")
+    import_parser.add_argument("-i", "--input", default="-", help="Input file, '-' for stdin (default).")
+    import_parser.add_argument("--gzip", action="store_true", help="The input is gzipped (implied by a .gz file name).")
+    import_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the command line interface.
+
+    Args:
+        argv (Optional[List[str]]): The arguments, defaulting to the process arguments.
+
+    Returns:
+        int: The process exit code.
+    """
+    args = _build_parser().parse_args(argv)
+    repository = get_conversation_repository()
+    start = time.perf_counter()
+
+    if args.command == "export":
+        with _open_output(args.output, _is_gzip(args.output, args.gzip)) as output:
+            count = export_conversations(repository, output, batch_size=args.batch_size)
+        verb = "Exported"
+    else:
+        with _open_input(args.input, _is_gzip(args.input, args.gzip)) as source:
+            count = import_conversations(repository, source, batch_size=args.batch_size)
+        verb = "Imported"
+
+    elapsed = time.perf_counter() - start
+    print(f"{verb} {count} conversations in {elapsed:.2f}s ({count / elapsed if elapsed else 0:.0f}/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,22 @@
 import uuid
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 
 class ChatMessage(BaseModel):
     """
     Represents a single message within a chat conversation.
 
+    Messages are immutable, so copies of a conversation can share them instead of copying each one.
+
     Attributes:
         role (str): The role of the sender (e.g., "user", "bot").
         message (str): The content of the message.
     """
+    model_config = ConfigDict(frozen=True)
+
     role: str
     message: str
 
@@ -27,9 +31,89 @@ class Conversation(BaseModel):
         strategy (str): The conversational strategy employed.
         messages (List[ChatMessage]): A list of chat messages in chronological order.
         created_at (datetime): The timestamp when the conversation was created.
+        summary (str): A rolling summary of the older turns that are no longer sent verbatim to the AI provider.
+        summarized_count (int): The number of leading messages already folded into `summary`.
     """
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     topic: str
     strategy: str
     messages: List[ChatMessage] = []
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    summary: str = ""
+    summarized_count: int = 0
+
+    # Number of leading messages known to be persisted, set by repositories that store messages
+    # incrementally. It is never serialized.
+    _persisted_messages: int = PrivateAttr(default=0)
+
+    def snapshot(self) -> "Conversation":
+        """
+        Copies the conversation so that appending to the copy does not change the original.
+
+        Only the message list is copied, the immutable messages are shared, so the cost does not depend
+        on their size.
+
+        Returns:
+            Conversation: The copy.
+        """
+        return self.model_copy(update={"messages": list(self.messages)})
+
+
+class TokenUsage(BaseModel):
+    """
+    Represents the AI provider usage accumulated by one or more completions.
+
+    Attributes:
+        prompt_tokens (int): The number of prompt tokens billed.
+        completion_tokens (int): The number of completion tokens billed.
+        cost (float): The estimated cost, in US dollars.
+        calls (int): The number of completions.
+    """
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    calls: int = 0
+
+
+class Job(BaseModel):
+    """
+    Represents a chat turn submitted for asynchronous processing.
+
+    Attributes:
+        id (str): A unique identifier for the job.
+        message (str): The user message to process.
+        conversation_id (Optional[str]): The conversation to continue, or None to start a new one.
+        only_new (bool): Whether only the messages of the turn were requested.
+        since (Optional[int]): The index of the first requested message.
+        status (str): "queued", "running", "succeeded" or "failed".
+        result (Optional[Conversation]): The conversation after the turn, once the job succeeded.
+        error (Optional[str]): The error detail, once the job failed.
+        created_at (datetime): The timestamp when the job was submitted.
+        updated_at (Optional[datetime]): The timestamp when a worker last changed the status of the job.
+        finished_at (Optional[datetime]): The timestamp when the job succeeded or failed.
+    """
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    message: str
+    conversation_id: Optional[str] = None
+    only_new: bool = False
+    since: Optional[int] = None
+    status: str = "queued"
+    result: Optional[Conversation] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class IdempotencyRecord(BaseModel):
+    """
+    Represents the outcome of the first request sent with an idempotency key.
+
+    Attributes:
+        fingerprint (str): A digest of the request, to detect the key being reused for another request.
+        status_code (Optional[int]): The status code of the response, or None while the request is in flight.
+        body (Optional[str]): The serialized response body, or None while the request is in flight.
+    """
+    fingerprint: str
+    status_code: Optional[int] = None
+    body: Optional[str] = None
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Optional
-from .models import Conversation, ChatMessage
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+from .models import Conversation, ChatMessage, IdempotencyRecord, Job, TokenUsage
 
 
 class ConversationRepository(ABC):
@@ -29,6 +30,357 @@ class ConversationRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def iter_conversations(self, batch_size: int = 500) -> Iterator[Conversation]:
+        """
+        Streams every stored conversation, holding at most one batch in memory.
+
+        Args:
+            batch_size (int): The number of conversations to read at once.
+
+        Yields:
+            Conversation: The stored conversations, in no particular order.
+        """
+        pass
+
+    @abstractmethod
+    def save_many(self, conversations: Iterable[Conversation], batch_size: int = 500) -> int:
+        """
+        Saves conversations in batches, consuming the iterable lazily.
+
+        Args:
+            conversations (Iterable[Conversation]): The conversations to save.
+            batch_size (int): The number of conversations to write at once.
+
+        Returns:
+            int: The number of conversations saved.
+        """
+        pass
+
+    @abstractmethod
+    def count_messages(self, conversation_id: str) -> Optional[int]:
+        """
+        Counts the messages of a conversation without loading them.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+
+        Returns:
+            Optional[int]: The number of messages, or None if the conversation does not exist.
+        """
+        pass
+
+    @abstractmethod
+    def find_messages(self, conversation_id: str, offset: int, limit: int) -> Optional[List[ChatMessage]]:
+        """
+        Reads a page of a conversation's messages without loading the rest of the conversation.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+            offset (int): The index of the first message to read.
+            limit (int): The maximum number of messages to read.
+
+        Returns:
+            Optional[List[ChatMessage]]: The messages, or None if the conversation does not exist.
+        """
+        pass
+
+    @abstractmethod
+    def find_message_page(
+        self, conversation_id: str, offset: int, limit: int
+    ) -> Optional[Tuple[int, List[ChatMessage]]]:
+        """
+        Reads a page of a conversation's messages and the message count from the same version of it.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+            offset (int): The index of the first message to read.
+            limit (int): The maximum number of messages to read.
+
+        Returns:
+            Optional[Tuple[int, List[ChatMessage]]]: The message count and the messages, or None if the
+                conversation does not exist.
+        """
+        pass
+
+    @abstractmethod
+    def count_conversations(
+        self,
+        topic: Optional[str] = None,
+        stance: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> int:
+        """
+        Counts the conversations created in a time window, optionally on a topic or with a bot stance.
+
+        Topics and stances are matched case-insensitively. Datetimes are naive UTC, like
+        `Conversation.created_at`, and both bounds are inclusive.
+
+        Args:
+            topic (Optional[str]): Only count conversations on this topic.
+            stance (Optional[str]): Only count conversations where the bot defends this stance.
+            since (Optional[datetime]): Only count conversations created at or after this time.
+            until (Optional[datetime]): Only count conversations created at or before this time.
+
+        Returns:
+            int: The number of matching conversations.
+
+        Raises:
+            ValueError: If both a topic and a stance are given.
+        """
+        pass
+
+    @abstractmethod
+    def list_conversation_ids(
+        self,
+        topic: Optional[str] = None,
+        stance: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 100
+    ) -> List[str]:
+        """
+        Lists the IDs of the conversations created in a time window, oldest first.
+
+        Filters behave as in `count_conversations`.
+
+        Args:
+            topic (Optional[str]): Only list conversations on this topic.
+            stance (Optional[str]): Only list conversations where the bot defends this stance.
+            since (Optional[datetime]): Only list conversations created at or after this time.
+            until (Optional[datetime]): Only list conversations created at or before this time.
+            offset (int): The number of matching conversations to skip.
+            limit (int): The maximum number of IDs to return.
+
+        Returns:
+            List[str]: The conversation IDs.
+
+        Raises:
+            ValueError: If both a topic and a stance are given.
+        """
+        pass
+
+    @abstractmethod
+    def add_usage(self, conversation_id: str, usage: TokenUsage):
+        """
+        Atomically adds AI provider usage to a conversation and to the aggregate totals.
+
+        Args:
+            conversation_id (str): The ID of the conversation that incurred the usage.
+            usage (TokenUsage): The usage to add.
+        """
+        pass
+
+    @abstractmethod
+    def get_usage(self, conversation_id: str) -> Optional[TokenUsage]:
+        """
+        Returns the AI provider usage accumulated by a conversation.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+
+        Returns:
+            Optional[TokenUsage]: The accumulated usage, or None if none was recorded.
+        """
+        pass
+
+    @abstractmethod
+    def get_total_usage(self) -> TokenUsage:
+        """
+        Returns the AI provider usage accumulated by all conversations.
+
+        Returns:
+            TokenUsage: The aggregate usage.
+        """
+        pass
+
+    @abstractmethod
+    def update_summary(
+        self, conversation_id: str, summary: str, summarized_count: int, expected_summarized_count: int
+    ) -> bool:
+        """
+        Atomically replaces the rolling summary of a conversation, leaving its messages and other fields as stored.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+            summary (str): The new summary.
+            summarized_count (int): The number of leading messages folded into the new summary.
+            expected_summarized_count (int): The number of summarized messages the summary was built upon.
+
+        Returns:
+            bool: True if the summary was updated, False if the conversation does not exist or its summary
+                changed in the meantime.
+        """
+        pass
+
+
+class OpeningArgumentPool(ABC):
+    """Port for a pool of pre-generated opening arguments, keyed by topic and bot stance."""
+
+    @abstractmethod
+    def pop(self, topic: str, stance: str) -> Optional[str]:
+        """
+        Takes one opening argument out of the pool.
+
+        Args:
+            topic (str): The debate topic.
+            stance (str): The stance the bot defends.
+
+        Returns:
+            Optional[str]: An opening argument, or None if the pool is empty.
+        """
+        pass
+
+    @abstractmethod
+    def push(self, topic: str, stance: str, arguments: List[str]):
+        """
+        Adds opening arguments to the pool.
+
+        Args:
+            topic (str): The debate topic.
+            stance (str): The stance the bot defends.
+            arguments (List[str]): The opening arguments to add.
+        """
+        pass
+
+    @abstractmethod
+    def size(self, topic: str, stance: str) -> int:
+        """
+        Returns how many opening arguments are available.
+
+        Args:
+            topic (str): The debate topic.
+            stance (str): The stance the bot defends.
+
+        Returns:
+            int: The number of pooled arguments.
+        """
+        pass
+
+
+class JobQueue(ABC):
+    """Port for the queue of chat turns submitted for asynchronous processing."""
+
+    @abstractmethod
+    def enqueue(self, job: Job):
+        """
+        Stores a job and queues it for a worker.
+
+        Args:
+            job (Job): The job to queue.
+        """
+        pass
+
+    @abstractmethod
+    def dequeue(self, timeout: float) -> Optional[Job]:
+        """
+        Takes the oldest queued job, waiting for one if the queue is empty.
+
+        Args:
+            timeout (float): How long to wait for a job, in seconds.
+
+        Returns:
+            Optional[Job]: The job, or None if none was queued before the timeout.
+        """
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Finds a job by its ID.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            Optional[Job]: The job, or None if it does not exist or has expired.
+        """
+        pass
+
+    @abstractmethod
+    def update(self, job: Job):
+        """
+        Stores the new state of a job.
+
+        Args:
+            job (Job): The job to store.
+        """
+        pass
+
+
+class IdempotencyStore(ABC):
+    """Port for the responses recorded under the idempotency keys sent by clients."""
+
+    @abstractmethod
+    def claim(self, key: str, fingerprint: str) -> bool:
+        """
+        Atomically claims a key for a request about to be processed.
+
+        Args:
+            key (str): The idempotency key.
+            fingerprint (str): A digest of the request.
+
+        Returns:
+            bool: True if the key was free, False if another request holds it or already completed.
+        """
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[IdempotencyRecord]:
+        """
+        Returns the record of a key.
+
+        Args:
+            key (str): The idempotency key.
+
+        Returns:
+            Optional[IdempotencyRecord]: The record, or None if the key is free.
+        """
+        pass
+
+    @abstractmethod
+    def complete(self, key: str, record: IdempotencyRecord):
+        """
+        Records the response of the request that claimed a key.
+
+        Args:
+            key (str): The idempotency key.
+            record (IdempotencyRecord): The record, with its status code and body.
+        """
+        pass
+
+    @abstractmethod
+    def release(self, key: str):
+        """
+        Frees a key whose request failed, so that a retry is processed again.
+
+        Args:
+            key (str): The idempotency key.
+        """
+        pass
+
+
+class RateLimiter(ABC):
+    """Port for limiting how many requests each client can send in a time window."""
+
+    @abstractmethod
+    def acquire(self, client_id: str, cost: int = 1) -> Optional[float]:
+        """
+        Counts a request of a client if it is within its limit.
+
+        Args:
+            client_id (str): The client sending the request.
+            cost (int): How many requests to count it as, such as the size of a batch. A cost over the
+                limit is counted as the limit, so that the request can still be allowed on an idle window.
+
+        Returns:
+            Optional[float]: None if the request is allowed, otherwise how many seconds to wait before the
+                client is allowed again. Rejected requests are not counted.
+        """
+        pass
+
 
 class ChatUseCase(ABC):
     """Input port for handling a chat."""
@@ -38,12 +390,65 @@ class ChatUseCase(ABC):
         """Processes a user message and updates/creates a conversation."""
         pass
 
+    @abstractmethod
+    def count_messages(self, conversation_id: str) -> Optional[int]:
+        """Returns the number of messages of a conversation, or None if it does not exist."""
+        pass
+
+    @abstractmethod
+    def get_messages(self, conversation_id: str, offset: int, limit: int) -> Optional[List[ChatMessage]]:
+        """Returns a page of a conversation's messages, or None if it does not exist."""
+        pass
+
+    @abstractmethod
+    def get_message_page(
+        self, conversation_id: str, offset: int, limit: int
+    ) -> Optional[Tuple[int, List[ChatMessage]]]:
+        """Returns the message count and a page of the messages of a conversation, read together, or None."""
+        pass
+
+    @abstractmethod
+    def count_conversations(
+        self,
+        topic: Optional[str] = None,
+        stance: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> int:
+        """Counts the conversations created in a time window, optionally on a topic or with a bot stance."""
+        pass
+
+    @abstractmethod
+    def list_conversation_ids(
+        self,
+        topic: Optional[str] = None,
+        stance: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 100
+    ) -> List[str]:
+        """Lists the IDs of the conversations created in a time window, oldest first."""
+        pass
+
+    @abstractmethod
+    def get_usage(self, conversation_id: str) -> Optional[TokenUsage]:
+        """Returns the AI provider usage of a conversation, or None if none was recorded."""
+        pass
+
+    @abstractmethod
+    def get_total_usage(self) -> TokenUsage:
+        """Returns the AI provider usage of all conversations."""
+        pass
+
 
 class GenerativeAIProvider(ABC):
     """Puerto para un proveedor de IA generativa."""
 
     @abstractmethod
-    def get_debate_response(self, topic: str, position: str, history: list[ChatMessage]) -> str:
+    def get_debate_response(
+        self, topic: str, position: str, history: list[ChatMessage], summary: Optional[str] = None
+    ) -> str:
         """
         Generates a debate response based on a topic, a position, and the conversation history.
 
@@ -51,6 +456,7 @@ class GenerativeAIProvider(ABC):
             topic (str): The topic of the debate.
             position (str): The position taken in the debate.
             history (list[ChatMessage]): A list of previous chat messages in the conversation.
+            summary (Optional[str]): A summary of the older turns that are not included in `history`.
 
         Returns:
             str: The generated debate response.
@@ -71,6 +477,34 @@ class GenerativeAIProvider(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_opening_argument(self, topic: str, position: str) -> str:
+        """
+        Generates a self-contained opening counter-argument for a topic, without any chat history.
+
+        Args:
+            topic (str): The topic of the debate.
+            position (str): The position taken in the debate.
+
+        Returns:
+            str: The generated opening argument.
+        """
+        pass
+
+    @abstractmethod
+    def summarize(self, previous_summary: str, messages: list[ChatMessage]) -> str:
+        """
+        Folds a batch of older messages into the rolling summary of a conversation.
+
+        Args:
+            previous_summary (str): The current summary, empty if there is none yet.
+            messages (list[ChatMessage]): The messages to add to the summary, in chronological order.
+
+        Returns:
+            str: The updated summary.
+        """
+        pass
+
     @abstractmethod
     def is_topic_change(self, message: str, original_topic: str) -> bool:
         """
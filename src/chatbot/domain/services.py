@@ -1,11 +1,23 @@
-from typing import Optional
+import logging
+import threading
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
 
-from .models import Conversation, ChatMessage
-from .ports import ChatUseCase, ConversationRepository, GenerativeAIProvider
+from .models import Conversation, ChatMessage, Job, TokenUsage
+from .ports import ChatUseCase, ConversationRepository, GenerativeAIProvider, JobQueue, OpeningArgumentPool
+from .usage import track_usage
+
+logger = logging.getLogger(__name__)
 
 MAX_USER_MESSAGES = 5
 MAX_CONVERSATION_MESSAGES = MAX_USER_MESSAGES * 2
 
+RECENT_HISTORY_MESSAGES = 5
+SUMMARY_BATCH_MESSAGES = 4
+
+OPENING_POOL_USAGE_ID = "opening_pool"
+
 OPPOSING_STANCES = {
     "pro-moon-landing": "anti-moon-landing",
     "anti-moon-landing": "pro-moon-landing",
@@ -17,19 +29,50 @@ OPPOSING_STANCES = {
     "anti-flat-earth": "pro-flat-earth",
 }
 
+DEBATE_TOPICS = {
+    "pro-moon-landing": "Moon Landing",
+    "anti-moon-landing": "Moon Landing",
+    "pro-vaccine": "Vaccines",
+    "anti-vaccine": "Vaccines",
+    "pro-climate-change": "Climate Change",
+    "anti-climate-change": "Climate Change",
+    "pro-flat-earth": "Flat Earth",
+    "anti-flat-earth": "Flat Earth",
+}
+
+OPENING_POOL_LOW_WATER = 3
+OPENING_POOL_HIGH_WATER = 10
+OPENING_POOL_REFILL_INTERVAL_SECONDS = 30.0
+
+JOB_DEQUEUE_TIMEOUT_SECONDS = 1.0
+
 
 class ChatService(ChatUseCase):
 
-    def __init__(self, repository: ConversationRepository, ai_provider: GenerativeAIProvider):
+    def __init__(
+        self,
+        repository: ConversationRepository,
+        ai_provider: GenerativeAIProvider,
+        summary_executor: Optional[Executor] = None,
+        opening_pool: Optional[OpeningArgumentPool] = None
+    ):
         """
         Initializes the ChatService with a conversation repository and an AI provider.
 
         Args:
             repository (ConversationRepository): The repository for managing conversations.
             ai_provider (GenerativeAIProvider): The AI provider for classifying topics and generating responses.
+            summary_executor (Optional[Executor]): Executor used to refresh rolling summaries off the request path.
+                If not provided, summaries are refreshed inline after the conversation is saved.
+            opening_pool (Optional[OpeningArgumentPool]): Pool of pre-generated opening arguments used to answer
+                the first message of a conversation on a known stance without a live completion.
         """
         self._repository = repository
         self._ai_provider = ai_provider
+        self._summary_executor = summary_executor
+        self._opening_pool = opening_pool
+        self._pending_summaries: Set[str] = set()
+        self._pending_summaries_lock = threading.Lock()
 
     def process_message(self, message: str, conversation_id: Optional[str] = None) -> Conversation:
         """
@@ -45,6 +88,135 @@ class ChatService(ChatUseCase):
         Raises:
             ValueError: If a conversation ID is provided but no matching conversation is found.
         """
+        with track_usage() as usage:
+            conversation = self._process_message(message, conversation_id)
+        if usage.calls:
+            self._repository.add_usage(conversation.id, usage)
+        return conversation
+
+    def count_messages(self, conversation_id: str) -> Optional[int]:
+        """
+        Returns the number of messages of a conversation.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+
+        Returns:
+            Optional[int]: The number of messages, or None if the conversation does not exist.
+        """
+        return self._repository.count_messages(conversation_id)
+
+    def get_messages(self, conversation_id: str, offset: int, limit: int) -> Optional[List[ChatMessage]]:
+        """
+        Returns a page of a conversation's messages.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+            offset (int): The index of the first message to return.
+            limit (int): The maximum number of messages to return.
+
+        Returns:
+            Optional[List[ChatMessage]]: The messages, or None if the conversation does not exist.
+        """
+        return self._repository.find_messages(conversation_id, offset, limit)
+
+    def get_message_page(
+        self, conversation_id: str, offset: int, limit: int
+    ) -> Optional[Tuple[int, List[ChatMessage]]]:
+        """
+        Returns the message count and a page of the messages of a conversation, read together.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+            offset (int): The index of the first message to return.
+            limit (int): The maximum number of messages to return.
+
+        Returns:
+            Optional[Tuple[int, List[ChatMessage]]]: The message count and the messages, or None if the
+                conversation does not exist.
+        """
+        return self._repository.find_message_page(conversation_id, offset, limit)
+
+    def count_conversations(
+        self,
+        topic: Optional[str] = None,
+        stance: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> int:
+        """
+        Counts the conversations created in a time window, optionally on a topic or with a bot stance.
+
+        Args:
+            topic (Optional[str]): Only count conversations on this topic.
+            stance (Optional[str]): Only count conversations where the bot defends this stance.
+            since (Optional[datetime]): Only count conversations created at or after this time (naive UTC).
+            until (Optional[datetime]): Only count conversations created at or before this time (naive UTC).
+
+        Returns:
+            int: The number of matching conversations.
+        """
+        return self._repository.count_conversations(topic=topic, stance=stance, since=since, until=until)
+
+    def list_conversation_ids(
+        self,
+        topic: Optional[str] = None,
+        stance: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 100
+    ) -> List[str]:
+        """
+        Lists the IDs of the conversations created in a time window, oldest first.
+
+        Args:
+            topic (Optional[str]): Only list conversations on this topic.
+            stance (Optional[str]): Only list conversations where the bot defends this stance.
+            since (Optional[datetime]): Only list conversations created at or after this time (naive UTC).
+            until (Optional[datetime]): Only list conversations created at or before this time (naive UTC).
+            offset (int): The number of matching conversations to skip.
+            limit (int): The maximum number of IDs to return.
+
+        Returns:
+            List[str]: The conversation IDs.
+        """
+        return self._repository.list_conversation_ids(
+            topic=topic, stance=stance, since=since, until=until, offset=offset, limit=limit
+        )
+
+    def get_usage(self, conversation_id: str) -> Optional[TokenUsage]:
+        """
+        Returns the AI provider usage accumulated by a conversation.
+
+        Args:
+            conversation_id (str): The ID of the conversation.
+
+        Returns:
+            Optional[TokenUsage]: The accumulated usage, or None if none was recorded.
+        """
+        return self._repository.get_usage(conversation_id)
+
+    def get_total_usage(self) -> TokenUsage:
+        """
+        Returns the AI provider usage accumulated by all conversations.
+
+        Returns:
+            TokenUsage: The aggregate usage.
+        """
+        return self._repository.get_total_usage()
+
+    def _process_message(self, message: str, conversation_id: Optional[str]) -> Conversation:
+        """
+        Runs one turn of the conversation. See `process_message`.
+
+        Args:
+            message (str): The user's message.
+            conversation_id (Optional[str]): The ID of an existing conversation, if applicable.
+
+        Returns:
+            Conversation: The updated or newly created conversation object.
+        """
         if conversation_id:
             conversation = self._repository.find_by_id(conversation_id)
             if not conversation:
@@ -75,14 +247,294 @@ class ChatService(ChatUseCase):
                 strategy=bot_stance
             )
 
+            if self._opening_pool and user_stance in OPPOSING_STANCES:
+                opening_argument = self._opening_pool.pop(topic=DEBATE_TOPICS[bot_stance], stance=bot_stance)
+                if opening_argument:
+                    conversation.messages.append(ChatMessage(role="user", message=message))
+                    conversation.messages.append(ChatMessage(role="bot", message=opening_argument))
+                    self._repository.save(conversation)
+                    return conversation
+
         conversation.messages.append(ChatMessage(role="user", message=message))
 
+        # Every message not folded into the summary yet is sent, since summaries are only refreshed
+        # once a batch of messages fell out of the recent window.
+        history_start = min(
+            conversation.summarized_count, max(len(conversation.messages) - RECENT_HISTORY_MESSAGES, 0)
+        )
         bot_response = self._ai_provider.get_debate_response(
             topic=conversation.topic,
             position=conversation.strategy,
-            history=conversation.messages[-5:]
+            history=conversation.messages[history_start:],
+            summary=conversation.summary or None
         )
         conversation.messages.append(ChatMessage(role="bot", message=bot_response))
 
         self._repository.save(conversation)
+        self._schedule_summary(conversation)
         return conversation
+
+    def _needs_summary(self, conversation: Conversation) -> bool:
+        """
+        Checks whether enough turns have fallen out of the recent history window to be summarized.
+
+        Conversations that already reached the message limit are skipped, since no further
+        debate response will ever use their summary. At the default MAX_CONVERSATION_MESSAGES, no
+        summary is ever due: the last debate response is generated from 9 messages, fewer than
+        RECENT_HISTORY_MESSAGES + SUMMARY_BATCH_MESSAGES, so every prompt carries the whole
+        conversation. Summaries only take effect once the limit is raised.
+
+        Args:
+            conversation (Conversation): The conversation to check.
+
+        Returns:
+            bool: True if the rolling summary should be refreshed, False otherwise.
+        """
+        if len(conversation.messages) >= MAX_CONVERSATION_MESSAGES:
+            return False
+        cutoff = len(conversation.messages) - RECENT_HISTORY_MESSAGES
+        return cutoff - conversation.summarized_count >= SUMMARY_BATCH_MESSAGES
+
+    def _schedule_summary(self, conversation: Conversation):
+        """
+        Schedules a refresh of the conversation's rolling summary if one is due.
+
+        At most one refresh per conversation is in flight at any time.
+
+        Args:
+            conversation (Conversation): The conversation that was just saved.
+        """
+        if not self._needs_summary(conversation):
+            return
+        with self._pending_summaries_lock:
+            if conversation.id in self._pending_summaries:
+                return
+            self._pending_summaries.add(conversation.id)
+
+        if self._summary_executor is None:
+            self._refresh_summary(conversation.id)
+        else:
+            self._summary_executor.submit(self._refresh_summary, conversation.id)
+
+    def _refresh_summary(self, conversation_id: str):
+        """
+        Folds the turns older than the recent history window into the stored rolling summary.
+
+        Only the summary fields are written, and only if no other refresh stored a summary in the
+        meantime, so that turns appended while the summary was being generated are not lost.
+
+        Args:
+            conversation_id (str): The ID of the conversation to summarize.
+        """
+        try:
+            conversation = self._repository.find_by_id(conversation_id)
+            if not conversation or not self._needs_summary(conversation):
+                return
+
+            start = conversation.summarized_count
+            cutoff = len(conversation.messages) - RECENT_HISTORY_MESSAGES
+            with track_usage() as usage:
+                summary = self._ai_provider.summarize(
+                    previous_summary=conversation.summary,
+                    messages=conversation.messages[start:cutoff]
+                )
+            if usage.calls:
+                self._repository.add_usage(conversation_id, usage)
+
+            self._repository.update_summary(
+                conversation_id, summary, summarized_count=cutoff, expected_summarized_count=start
+            )
+        except Exception as e:
+            logger.exception("Error refreshing summary for conversation %s: %s", conversation_id, e)
+        finally:
+            with self._pending_summaries_lock:
+                self._pending_summaries.discard(conversation_id)
+
+
+class OpeningPoolRefiller:
+    """
+    Background worker that keeps the opening argument pool of every known stance stocked.
+
+    The usage of the generated arguments is not known to belong to any conversation yet, so it is added
+    to the totals under the OPENING_POOL_USAGE_ID bucket.
+    """
+
+    def __init__(
+        self,
+        pool: OpeningArgumentPool,
+        ai_provider: GenerativeAIProvider,
+        repository: ConversationRepository,
+        low_water: int = OPENING_POOL_LOW_WATER,
+        high_water: int = OPENING_POOL_HIGH_WATER,
+        interval_seconds: float = OPENING_POOL_REFILL_INTERVAL_SECONDS
+    ):
+        """
+        Initializes the OpeningPoolRefiller.
+
+        Args:
+            pool (OpeningArgumentPool): The pool to keep stocked.
+            ai_provider (GenerativeAIProvider): The AI provider used to generate opening arguments.
+            repository (ConversationRepository): The repository the usage of the generation is added to.
+            low_water (int): A pool is refilled once it holds fewer arguments than this.
+            high_water (int): A pool is refilled up to this many arguments.
+            interval_seconds (float): How long to wait between two refill passes.
+        """
+        self._pool = pool
+        self._ai_provider = ai_provider
+        self._repository = repository
+        self._low_water = low_water
+        self._high_water = high_water
+        self._interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refill_once(self) -> int:
+        """
+        Tops up every pool that fell below the low-water mark.
+
+        Returns:
+            int: The number of opening arguments generated.
+        """
+        generated = 0
+        for bot_stance in sorted(set(OPPOSING_STANCES.values())):
+            topic = DEBATE_TOPICS[bot_stance]
+            size = self._pool.size(topic=topic, stance=bot_stance)
+            if size >= self._low_water:
+                continue
+
+            arguments = []
+            with track_usage() as usage:
+                for _ in range(self._high_water - size):
+                    try:
+                        arguments.append(self._ai_provider.get_opening_argument(topic=topic, position=bot_stance))
+                    except Exception as e:
+                        logger.warning("Error generating opening argument for %s: %s", bot_stance, e)
+                        break
+            self._pool.push(topic=topic, stance=bot_stance, arguments=arguments)
+            generated += len(arguments)
+            if usage.calls:
+                self._repository.add_usage(OPENING_POOL_USAGE_ID, usage)
+        return generated
+
+    def start(self):
+        """
+        Starts refilling the pools periodically on a daemon thread.
+        """
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="opening-pool-refiller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background thread and waits for the current pass to finish.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """
+        Runs refill passes until the refiller is stopped.
+        """
+        while not self._stop_event.is_set():
+            try:
+                self.refill_once()
+            except Exception as e:
+                logger.exception("Error refilling opening argument pool: %s", e)
+            self._stop_event.wait(self._interval_seconds)
+
+
+class JobWorker:
+    """Background worker that processes the chat turns submitted for asynchronous processing."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        chat_service: ChatUseCase,
+        concurrency: int = 4,
+        dequeue_timeout_seconds: float = JOB_DEQUEUE_TIMEOUT_SECONDS
+    ):
+        """
+        Initializes the JobWorker.
+
+        Args:
+            queue (JobQueue): The queue to take jobs from.
+            chat_service (ChatUseCase): The chat service that processes the turns.
+            concurrency (int): How many jobs are processed at once, one thread each.
+            dequeue_timeout_seconds (float): How long a thread waits for a job before checking whether the
+                worker was stopped.
+        """
+        self._queue = queue
+        self._chat_service = chat_service
+        self._concurrency = concurrency
+        self._dequeue_timeout_seconds = dequeue_timeout_seconds
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def run_once(self) -> bool:
+        """
+        Processes the next queued job, if one is queued before the dequeue timeout.
+
+        Returns:
+            bool: True if a job was processed.
+        """
+        job = self._queue.dequeue(timeout=self._dequeue_timeout_seconds)
+        if job is None:
+            return False
+        self._process(job)
+        return True
+
+    def _process(self, job: Job):
+        """
+        Processes a job and stores its outcome.
+
+        Args:
+            job (Job): The job to process.
+        """
+        job.status = "running"
+        job.updated_at = datetime.utcnow()
+        self._queue.update(job)
+        try:
+            job.result = self._chat_service.process_message(message=job.message, conversation_id=job.conversation_id)
+            job.status = "succeeded"
+        except Exception as e:
+            logger.warning("Job %s failed: %s", job.id, e)
+            job.error = str(e)
+            job.status = "failed"
+        job.finished_at = job.updated_at = datetime.utcnow()
+        self._queue.update(job)
+
+    def start(self):
+        """
+        Starts processing jobs on `concurrency` daemon threads.
+        """
+        if self._threads:
+            return
+        self._stop_event.clear()
+        for index in range(self._concurrency):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """
+        Stops the threads and waits for the jobs being processed to finish.
+        """
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _run(self):
+        """
+        Processes jobs until the worker is stopped.
+        """
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.exception("Error taking a job from the queue: %s", e)
+                self._stop_event.wait(self._dequeue_timeout_seconds)
@@ -0,0 +1,43 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from .models import TokenUsage
+
+_current_usage: ContextVar[Optional[TokenUsage]] = ContextVar("current_usage", default=None)
+
+
+@contextmanager
+def track_usage() -> Iterator[TokenUsage]:
+    """
+    Collects the usage of every completion made by the AI provider within the block.
+
+    Blocks can be nested; usage is only added to the innermost one.
+
+    Yields:
+        TokenUsage: The usage accumulated so far, updated in place.
+    """
+    usage = TokenUsage()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+
+def record_usage(prompt_tokens: int, completion_tokens: int, cost: float):
+    """
+    Adds the usage of one completion to the enclosing `track_usage` block, if any.
+
+    Args:
+        prompt_tokens (int): The number of prompt tokens billed.
+        completion_tokens (int): The number of completion tokens billed.
+        cost (float): The estimated cost, in US dollars.
+    """
+    usage = _current_usage.get()
+    if usage is None:
+        return
+    usage.prompt_tokens += prompt_tokens
+    usage.completion_tokens += completion_tokens
+    usage.cost += cost
+    usage.calls += 1
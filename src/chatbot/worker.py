@@ -0,0 +1,70 @@
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+from typing import List, Optional
+
+from chatbot.adapters.observability.structured_logging import configure_logging
+from chatbot.bootstrap import get_chat_service, get_job_queue, shutdown, write_behind_enabled
+from chatbot.domain.services import JobWorker
+
+logger = logging.getLogger(__name__)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the argument parser of the worker.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="kopi-chatbot-worker",
+        description="Process the chat turns submitted with POST /chat?async=true."
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("WORKER_CONCURRENCY", "4")),
+        help="How many turns to process at once (default: WORKER_CONCURRENCY or 4)."
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the job worker until it receives SIGINT or SIGTERM, then waits for the turns in progress.
+
+    The worker does not start while write-behind persistence is enabled, since it would read
+    conversations without the turns still buffered by the API and overwrite them.
+
+    Args:
+        argv (Optional[List[str]]): The arguments, defaulting to the process arguments.
+
+    Returns:
+        int: The process exit code.
+    """
+    configure_logging()
+    args = _build_parser().parse_args(argv)
+    if write_behind_enabled():
+        logger.error("The job worker cannot run while WRITE_BEHIND_ENABLED is set")
+        return 2
+
+    worker = JobWorker(queue=get_job_queue(), chat_service=get_chat_service(), concurrency=args.concurrency)
+    stopped = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stopped.set())
+
+    worker.start()
+    logger.info("Job worker started with %d threads", args.concurrency)
+    stopped.wait()
+    logger.info("Job worker stopping")
+    worker.stop()
+    shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
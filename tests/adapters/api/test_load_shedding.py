@@ -0,0 +1,26 @@
+from chatbot.adapters.api.load_shedding import InFlightLimiter
+
+
+def test_global_cap_rejects_once_reached():
+    """
+    Tests that the global cap rejects requests from any client once reached.
+    """
+    limiter = InFlightLimiter(max_total=2, max_per_client=0)
+
+    assert limiter.try_acquire("a") is None
+    assert limiter.try_acquire("b") is None
+    assert limiter.try_acquire("c") == "global_in_flight"
+
+    limiter.release("a")
+    assert limiter.try_acquire("c") is None
+
+
+def test_client_cap_only_rejects_that_client():
+    """
+    Tests that the per-client cap rejects the busy client and admits the others.
+    """
+    limiter = InFlightLimiter(max_total=0, max_per_client=1)
+
+    assert limiter.try_acquire("a") is None
+    assert limiter.try_acquire("a") == "client_in_flight"
+    assert limiter.try_acquire("b") is None
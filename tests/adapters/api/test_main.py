@@ -1,9 +1,24 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
 
-from chatbot.adapters.api.main import app, get_chat_service
-from chatbot.domain.models import Conversation, ChatMessage
+from chatbot.adapters.api import main
+from chatbot.adapters.api.load_shedding import InFlightLimiter
+from chatbot.adapters.api.main import (
+    _idempotent_chat, app, get_chat_service, get_idempotency_store, get_job_queue, get_readiness_probe
+)
+from chatbot.adapters.observability.readiness import ReadinessProbe
+from chatbot.adapters.storage.idempotency import InMemoryIdempotencyStore
+from chatbot.adapters.storage.jobs import InMemoryJobQueue
+from chatbot.adapters.storage.rate_limit import InMemoryRateLimiter
+from chatbot.domain.models import Conversation, ChatMessage, IdempotencyRecord, Job, TokenUsage
 from chatbot.domain.ports import ChatUseCase
 
 client = TestClient(app)
@@ -20,6 +35,15 @@ def auto_clear_dependency_overrides():
     app.dependency_overrides.clear()  # Clear overrides after the test
 
 
+@pytest.fixture
+def admin_headers(monkeypatch):
+    """
+    Fixture that configures an admin token and returns the headers sending it.
+    """
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    return {"X-Admin-Token": "secret"}
+
+
 def test_chat_new_conversation_success():
     """
     Tests the successful creation of a new conversation via the /chat endpoint.
@@ -104,3 +128,816 @@ def test_health_check():
     assert "status" in response_data
     assert "timestamp" in response_data
     assert response_data["status"] == "healthy"
+
+
+def test_metrics_exposes_stage_histograms():
+    """
+    Tests that the metrics endpoint serves the Prometheus exposition format, including the request stage of /chat.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.return_value = Conversation(id="metrics-convo", topic="t", strategy="s")
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    client.post("/chat", json={"message": "Hello"})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'chatbot_stage_duration_seconds_count{stage="request"}' in response.text
+
+
+def test_request_id_is_generated_and_returned():
+    """
+    Tests that a request ID is generated when the client does not send one, and returned in the headers.
+    """
+    response = client.get("/health")
+
+    assert len(response.headers["X-Request-ID"]) == 32
+
+
+def test_request_id_sent_by_client_is_echoed():
+    """
+    Tests that the request ID sent by the client is reused and returned in the headers.
+    """
+    response = client.get("/health", headers={"X-Request-ID": "client-request-1"})
+
+    assert response.headers["X-Request-ID"] == "client-request-1"
+
+
+def test_admin_profile_is_disabled_without_admin_token(monkeypatch):
+    """
+    Tests that the profiling hook is hidden when no admin token is configured.
+    """
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+
+    response = client.post("/admin/profile", headers={"X-Admin-Token": "anything"})
+
+    assert response.status_code == 404
+
+
+def test_admin_profile_rejects_wrong_token(monkeypatch):
+    """
+    Tests that the profiling hook rejects requests with a wrong admin token.
+    """
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+
+    response = client.post("/admin/profile", headers={"X-Admin-Token": "wrong"})
+
+    assert response.status_code == 401
+
+
+def test_admin_profile_returns_report(monkeypatch):
+    """
+    Tests that the profiling hook returns a report for the requested window.
+    """
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+
+    response = client.post(
+        "/admin/profile", params={"mode": "memory", "seconds": 0.05}, headers={"X-Admin-Token": "secret"}
+    )
+
+    assert response.status_code == 200
+    assert response.text.startswith("Memory profile over")
+
+
+def test_conversation_usage_success(admin_headers):
+    """
+    Tests that the usage of a conversation is returned.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.get_usage.return_value = TokenUsage(prompt_tokens=10, completion_tokens=5, cost=0.01, calls=1)
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.get("/conversations/convo-1/usage", headers=admin_headers)
+
+    assert response.status_code == 200
+    assert response.json() == {"prompt_tokens": 10, "completion_tokens": 5, "cost": 0.01, "calls": 1}
+    mock_service.get_usage.assert_called_once_with("convo-1")
+
+
+def test_conversation_usage_not_found(admin_headers):
+    """
+    Tests that a 404 is returned when no usage was recorded for the conversation.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.get_usage.return_value = None
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.get("/conversations/unknown/usage", headers=admin_headers)
+
+    assert response.status_code == 404
+
+
+def test_total_usage(admin_headers):
+    """
+    Tests that the aggregate usage is returned.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.get_total_usage.return_value = TokenUsage(prompt_tokens=1000, calls=40)
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.get("/usage", headers=admin_headers)
+
+    assert response.status_code == 200
+    assert response.json()["prompt_tokens"] == 1000
+
+
+def test_usage_requires_admin_token(admin_headers):
+    """
+    Tests that the spend is not published without the admin token.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    assert client.get("/usage").status_code == 401
+    assert client.get("/conversations/convo-1/usage").status_code == 401
+    mock_service.get_total_usage.assert_not_called()
+    mock_service.get_usage.assert_not_called()
+
+
+def _long_conversation() -> Conversation:
+    """
+    Builds a conversation whose last turn is a user message followed by a bot reply.
+    """
+    return Conversation(
+        id="long-convo",
+        topic="earth_shape",
+        strategy="earth_flat",
+        messages=[
+            ChatMessage(role="user" if i % 2 == 0 else "bot", message=f"msg {i}") for i in range(8)
+        ]
+    )
+
+
+def test_chat_returns_full_history_and_total_by_default():
+    """
+    Tests that, without delta options, the whole history is returned along with the total count.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.return_value = _long_conversation()
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.post("/chat", json={"conversation_id": "long-convo", "message": "msg 6"})
+
+    assert response.status_code == 200
+    assert len(response.json()["message"]) == 8
+    assert response.json()["total_messages"] == 8
+
+
+def test_chat_only_new_returns_messages_of_the_turn():
+    """
+    Tests that only_new returns just the user message and bot reply appended in this turn.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.return_value = _long_conversation()
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.post("/chat", json={"conversation_id": "long-convo", "message": "msg 6", "only_new": True})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "conversation_id": "long-convo",
+        "message": [{"role": "user", "message": "msg 6"}, {"role": "bot", "message": "msg 7"}],
+        "total_messages": 8
+    }
+
+
+def test_chat_since_returns_messages_from_index():
+    """
+    Tests that since returns the messages from the given index, and nothing past the end.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.return_value = _long_conversation()
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.post("/chat", json={"conversation_id": "long-convo", "message": "msg 6", "since": 5})
+    past_end = client.post("/chat", json={"conversation_id": "long-convo", "message": "msg 6", "since": 50})
+
+    assert [msg["message"] for msg in response.json()["message"]] == ["msg 5", "msg 6", "msg 7"]
+    assert past_end.json()["message"] == []
+    assert past_end.json()["total_messages"] == 8
+
+
+def test_chat_rejects_negative_since():
+    """
+    Tests that a negative since index is rejected.
+    """
+    response = client.post("/chat", json={"message": "Hello", "since": -1})
+
+    assert response.status_code == 422
+
+
+def test_conversation_messages_returns_page_with_etag(admin_headers):
+    """
+    Tests that a page of messages is returned with an ETag derived from the message count read with it.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.get_message_page.return_value = (8, _long_conversation().messages[2:4])
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.get(
+        "/conversations/long-convo/messages", params={"offset": 2, "limit": 2}, headers=admin_headers
+    )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == 'W/"8"'
+    assert response.json() == {
+        "conversation_id": "long-convo",
+        "message": [{"role": "user", "message": "msg 2"}, {"role": "bot", "message": "msg 3"}],
+        "offset": 2,
+        "limit": 2,
+        "total_messages": 8
+    }
+    mock_service.get_message_page.assert_called_once_with("long-convo", 2, 2)
+    mock_service.count_messages.assert_not_called()
+
+
+def test_conversation_messages_not_modified(admin_headers):
+    """
+    Tests that a matching If-None-Match gets a 304 without reading any messages.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.count_messages.return_value = 8
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.get(
+        "/conversations/long-convo/messages", headers={**admin_headers, "If-None-Match": 'W/"8"'}
+    )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == 'W/"8"'
+    mock_service.get_message_page.assert_not_called()
+
+
+def test_conversation_messages_modified_since_etag(admin_headers):
+    """
+    Tests that a stale If-None-Match gets the page, with the ETag of the count read along with it.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.count_messages.return_value = 8
+    mock_service.get_message_page.return_value = (10, _long_conversation().messages[8:10])
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.get(
+        "/conversations/long-convo/messages", params={"offset": 8}, headers={**admin_headers, "If-None-Match": 'W/"6"'}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == 'W/"10"'
+    assert response.json()["total_messages"] == 10
+
+
+def test_conversation_messages_not_found(admin_headers):
+    """
+    Tests that a 404 is returned for an unknown conversation.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.get_message_page.return_value = None
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.get("/conversations/unknown/messages", headers=admin_headers)
+
+    assert response.status_code == 404
+
+
+def test_conversation_messages_require_admin_token(admin_headers):
+    """
+    Tests that the messages of a conversation cannot be read without the admin token.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.get("/conversations/long-convo/messages")
+
+    assert response.status_code == 401
+    mock_service.get_message_page.assert_not_called()
+
+
+def test_count_conversations_converts_window_to_naive_utc(admin_headers):
+    """
+    Tests that conversations are counted with the window converted to naive UTC.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.count_conversations.return_value = 3
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.get(
+        "/conversations/count", params={"topic": "vaccines", "since": "2024-09-05T14:00:00+02:00"},
+        headers=admin_headers
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"count": 3}
+    mock_service.count_conversations.assert_called_once_with(
+        topic="vaccines", stance=None, since=datetime(2024, 9, 5, 12, 0, 0), until=None
+    )
+
+
+def test_list_conversations_returns_ids(admin_headers):
+    """
+    Tests that the IDs of matching conversations are listed.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.list_conversation_ids.return_value = ["c1", "c2"]
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.get("/conversations", params={"stance": "anti-vaccine", "limit": 2}, headers=admin_headers)
+
+    assert response.status_code == 200
+    assert response.json() == {"conversation_ids": ["c1", "c2"], "offset": 0, "limit": 2}
+
+
+def test_listing_conversations_requires_admin_token(admin_headers):
+    """
+    Tests that conversation IDs cannot be listed or counted without the admin token.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    assert client.get("/conversations").status_code == 401
+    assert client.get("/conversations/count", headers={"X-Admin-Token": "wrong"}).status_code == 401
+    mock_service.list_conversation_ids.assert_not_called()
+    mock_service.count_conversations.assert_not_called()
+
+
+def test_count_conversations_rejects_topic_and_stance_together(admin_headers):
+    """
+    Tests that filtering by both topic and stance is rejected with a 400.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.count_conversations.side_effect = ValueError("Filter by topic or by stance, not both")
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.get(
+        "/conversations/count", params={"topic": "vaccines", "stance": "anti-vaccine"}, headers=admin_headers
+    )
+
+    assert response.status_code == 400
+
+
+def test_chat_batch_returns_results_in_order_with_item_errors():
+    """
+    Tests that a batch returns one result per request, in order, with failures reported per item.
+    """
+    def process_message(message, conversation_id):
+        if conversation_id == "missing":
+            raise ValueError("Conversation not found")
+        return Conversation(
+            id=conversation_id or f"new-{message}",
+            topic="earth_shape",
+            strategy="earth_flat",
+            messages=[ChatMessage(role="user", message=message), ChatMessage(role="bot", message="No.")]
+        )
+
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.side_effect = process_message
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.post("/chat/batch", json={"requests": [
+        {"message": "first"},
+        {"conversation_id": "missing", "message": "second"},
+        {"message": "third", "only_new": True}
+    ]})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert results[0]["conversation_id"] == "new-first"
+    assert results[0]["status_code"] == 200
+    assert results[1] == {"index": 1, "status_code": 404, "error": "Conversation not found"}
+    assert results[2]["total_messages"] == 2
+
+
+def test_chat_batch_respects_concurrency_cap():
+    """
+    Tests that no more requests than the requested concurrency are processed at once.
+    """
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def process_message(message, conversation_id):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.02)
+        with lock:
+            state["running"] -= 1
+        return Conversation(id=message, topic="earth_shape", strategy="earth_flat", messages=[])
+
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.side_effect = process_message
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.post("/chat/batch", json={
+        "requests": [{"message": str(i)} for i in range(10)],
+        "concurrency": 2
+    })
+
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == 10
+    assert 1 <= state["peak"] <= 2
+
+
+def test_concurrent_batches_share_the_process_concurrency_cap(monkeypatch):
+    """
+    Tests that concurrent batches together never process more than BATCH_MAX_CONCURRENCY requests at once.
+    """
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def process_message(message, conversation_id):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.02)
+        with lock:
+            state["running"] -= 1
+        return Conversation(id=message, topic="earth_shape", strategy="earth_flat", messages=[])
+
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.side_effect = process_message
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    monkeypatch.setattr(main, "BATCH_MAX_CONCURRENCY", 3)
+
+    async def send_batches():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as api:
+            return await asyncio.gather(*(
+                api.post("/chat/batch", json={"requests": [{"message": str(i)} for i in range(6)]})
+                for _ in range(3)
+            ))
+
+    responses = asyncio.run(send_batches())
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert 1 <= state["peak"] <= 3
+
+
+def test_chat_batch_streams_ndjson_results():
+    """
+    Tests that a streamed batch returns one NDJSON line per request.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.return_value = _long_conversation()
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.post("/chat/batch", json={
+        "requests": [{"conversation_id": "long-convo", "message": "msg 6", "since": 6}] * 3,
+        "stream": True
+    })
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == [0, 1, 2]
+    assert all(len(line["message"]) == 2 for line in lines)
+
+
+def test_chat_batch_rejects_empty_batch():
+    """
+    Tests that a batch without requests is rejected.
+    """
+    response = client.post("/chat/batch", json={"requests": []})
+
+    assert response.status_code == 422
+
+
+def test_chat_async_queues_job_and_returns_202():
+    """
+    Tests that an async chat request is queued without being processed.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    queue = InMemoryJobQueue()
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    app.dependency_overrides[get_job_queue] = lambda: queue
+
+    response = client.post("/chat?async=true", json={"message": "The Earth is round", "only_new": True})
+
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert response.json()["status"] == "queued"
+    assert response.headers["location"] == f"/jobs/{job_id}"
+    assert queue.get(job_id).only_new is True
+    mock_service.process_message.assert_not_called()
+
+
+def test_first_request_metric_only_records_synchronous_turns(monkeypatch):
+    """
+    Tests that the first-request duration is not taken from queued or failed requests.
+    """
+    record_first_request = MagicMock()
+    monkeypatch.setattr(main, "record_first_request", record_first_request)
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.side_effect = [
+        ValueError("Conversation not found"),
+        Conversation(id="c1", topic="earth_shape", strategy="earth_flat", oppose_user=True, messages=[])
+    ]
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    app.dependency_overrides[get_job_queue] = lambda: InMemoryJobQueue()
+
+    assert client.post("/chat?async=true", json={"message": "Hello"}).status_code == 202
+    assert client.post("/chat", json={"message": "Hello", "conversation_id": "missing"}).status_code == 404
+    record_first_request.assert_not_called()
+
+    assert client.post("/chat", json={"message": "Hello"}).status_code == 200
+    record_first_request.assert_called_once()
+
+
+def test_chat_async_is_refused_with_write_behind(monkeypatch):
+    """
+    Tests that turns are not queued for the worker while write-behind persistence is enabled.
+    """
+    monkeypatch.setenv("WRITE_BEHIND_ENABLED", "true")
+    queue = InMemoryJobQueue()
+    app.dependency_overrides[get_chat_service] = lambda: MagicMock(spec=ChatUseCase)
+    app.dependency_overrides[get_job_queue] = lambda: queue
+
+    response = client.post("/chat", params={"async": "true"}, json={"message": "Hello"})
+
+    assert response.status_code == 400
+    assert queue.dequeue(timeout=0) is None
+
+
+def test_job_status_returns_chat_response_once_succeeded():
+    """
+    Tests that a finished job returns the requested part of the conversation like /chat would.
+    """
+    queue = InMemoryJobQueue()
+    job = Job(message="msg 6", conversation_id="long-convo", only_new=True)
+    job.status = "succeeded"
+    job.result = _long_conversation()
+    queue.update(job)
+    app.dependency_overrides[get_job_queue] = lambda: queue
+
+    response = client.get(f"/jobs/{job.id}")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "job_id": job.id,
+        "status": "succeeded",
+        "result": {
+            "conversation_id": "long-convo",
+            "message": [{"role": "user", "message": "msg 6"}, {"role": "bot", "message": "msg 7"}],
+            "total_messages": 8
+        },
+        "error": None
+    }
+
+
+def test_job_status_long_polls_until_job_finishes():
+    """
+    Tests that waiting on a job returns as soon as a worker finishes it.
+    """
+    queue = InMemoryJobQueue()
+    job = Job(message="Hello")
+    queue.enqueue(job)
+    app.dependency_overrides[get_job_queue] = lambda: queue
+
+    def finish():
+        time.sleep(0.3)
+        job.status = "failed"
+        job.error = "Conversation not found"
+        queue.update(job)
+
+    worker = threading.Thread(target=finish)
+    worker.start()
+    start = time.monotonic()
+    response = client.get(f"/jobs/{job.id}", params={"wait": 5})
+    worker.join()
+
+    assert response.json()["status"] == "failed"
+    assert response.json()["error"] == "Conversation not found"
+    assert time.monotonic() - start < 2
+
+
+def test_job_status_fails_job_abandoned_while_running():
+    """
+    Tests that a job left running past the timeout is reported, and stored, as failed.
+    """
+    queue = InMemoryJobQueue()
+    stale = Job(message="Hello", status="running", updated_at=datetime.utcnow() - timedelta(hours=1))
+    fresh = Job(message="Hello", status="running", updated_at=datetime.utcnow())
+    queue.update(stale)
+    queue.update(fresh)
+    app.dependency_overrides[get_job_queue] = lambda: queue
+
+    response = client.get(f"/jobs/{stale.id}")
+
+    assert response.json()["status"] == "failed"
+    assert "submit the message again" in response.json()["error"]
+    assert queue.get(stale.id).status == "failed"
+    assert client.get(f"/jobs/{fresh.id}").json()["status"] == "running"
+
+
+def test_job_status_not_found():
+    """
+    Tests that an unknown job answers 404.
+    """
+    app.dependency_overrides[get_job_queue] = lambda: InMemoryJobQueue()
+
+    response = client.get("/jobs/missing")
+
+    assert response.status_code == 404
+
+
+def test_chat_with_idempotency_key_replays_first_response():
+    """
+    Tests that a retried request with the same Idempotency-Key is not processed again.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.return_value = _long_conversation()
+    store = InMemoryIdempotencyStore()
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    app.dependency_overrides[get_idempotency_store] = lambda: store
+
+    payload = {"conversation_id": "long-convo", "message": "msg 6"}
+    first = client.post("/chat", json=payload, headers={"Idempotency-Key": "retry-1"})
+    retry = client.post("/chat", json=payload, headers={"Idempotency-Key": "retry-1"})
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    mock_service.process_message.assert_called_once()
+
+
+def test_chat_rejects_idempotency_key_reused_for_another_request():
+    """
+    Tests that reusing an Idempotency-Key with a different body is rejected.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.return_value = _long_conversation()
+    store = InMemoryIdempotencyStore()
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    app.dependency_overrides[get_idempotency_store] = lambda: store
+
+    client.post("/chat", json={"message": "first"}, headers={"Idempotency-Key": "key-1"})
+    response = client.post("/chat", json={"message": "second"}, headers={"Idempotency-Key": "key-1"})
+
+    assert response.status_code == 422
+    mock_service.process_message.assert_called_once()
+
+
+def test_chat_with_idempotency_key_retries_after_server_error():
+    """
+    Tests that a request that failed with a server error is processed again on retry.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.side_effect = [ValueError("boom"), _long_conversation()]
+    store = InMemoryIdempotencyStore()
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    app.dependency_overrides[get_idempotency_store] = lambda: store
+
+    payload = {"conversation_id": "long-convo", "message": "msg 6"}
+    failed = client.post("/chat", json=payload, headers={"Idempotency-Key": "key-1"})
+    retried = client.post("/chat", json=payload, headers={"Idempotency-Key": "key-1"})
+
+    assert failed.status_code == 500
+    assert retried.status_code == 200
+    assert mock_service.process_message.call_count == 2
+
+
+def test_idempotency_keys_are_scoped_to_the_client():
+    """
+    Tests that two clients sending the same Idempotency-Key each get their own turn processed.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.return_value = _long_conversation()
+    store = InMemoryIdempotencyStore()
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    app.dependency_overrides[get_idempotency_store] = lambda: store
+
+    payload = {"conversation_id": "long-convo", "message": "msg 6"}
+    first = client.post("/chat", json=payload, headers={"Idempotency-Key": "shared", "X-API-Key": "client-a"})
+    second = client.post("/chat", json=payload, headers={"Idempotency-Key": "shared", "X-API-Key": "client-b"})
+
+    assert "idempotent-replayed" not in first.headers
+    assert "idempotent-replayed" not in second.headers
+    assert mock_service.process_message.call_count == 2
+
+
+def test_idempotent_chat_waits_for_in_flight_duplicate():
+    """
+    Tests that a duplicate of an in-flight request waits for and returns its recorded response.
+    """
+    store = InMemoryIdempotencyStore()
+    store.claim("key-1", "abc")
+    process = MagicMock()
+
+    def complete():
+        time.sleep(0.2)
+        store.complete("key-1", IdempotencyRecord(fingerprint="abc", status_code=200, body='{"done": true}'))
+
+    finisher = threading.Thread(target=complete)
+    finisher.start()
+    response = asyncio.run(_idempotent_chat("key-1", "abc", store, process))
+    finisher.join()
+
+    assert response.status_code == 200
+    assert json.loads(response.body) == {"done": True}
+    process.assert_not_called()
+
+
+def test_chat_over_rate_limit_is_rejected_before_processing(monkeypatch):
+    """
+    Tests that a client over its rate limit gets a 429 with Retry-After without reaching the service.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.return_value = _long_conversation()
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    monkeypatch.setattr(main, "rate_limiter", InMemoryRateLimiter(limit=1, window_seconds=60))
+
+    first = client.post("/chat", json={"message": "Hello"}, headers={"X-API-Key": "client-a"})
+    limited = client.post("/chat", json={"message": "Hello"}, headers={"X-API-Key": "client-a"})
+    other = client.post("/chat", json={"message": "Hello"}, headers={"X-API-Key": "client-b"})
+
+    assert first.status_code == 200
+    assert limited.status_code == 429
+    assert 1 <= int(limited.headers["retry-after"]) <= 60
+    assert "x-request-id" in limited.headers
+    assert other.status_code == 200
+    assert mock_service.process_message.call_count == 2
+
+
+def test_chat_batch_counts_its_size_against_the_rate_limit(monkeypatch):
+    """
+    Tests that a batch uses one request of the rate limit per chat request it holds.
+    """
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.return_value = _long_conversation()
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    monkeypatch.setattr(main, "rate_limiter", InMemoryRateLimiter(limit=3, window_seconds=60))
+    headers = {"X-API-Key": "client-a"}
+
+    first = client.post("/chat/batch", json={"requests": [{"message": "Hello"}] * 2}, headers=headers)
+    limited = client.post("/chat/batch", json={"requests": [{"message": "Hello"}] * 2}, headers=headers)
+    single = client.post("/chat", json={"message": "Hello"}, headers=headers)
+
+    assert first.status_code == 200
+    assert limited.status_code == 429
+    assert single.status_code == 200
+    assert mock_service.process_message.call_count == 3
+
+
+def test_streamed_batch_holds_its_in_flight_slot_until_sent(monkeypatch):
+    """
+    Tests that a streamed batch keeps its in-flight slot while its results are produced, and frees it after.
+    """
+    limiter = InFlightLimiter(max_total=0, max_per_client=1)
+    monkeypatch.setattr(main, "in_flight_limiter", limiter)
+    held = []
+
+    def process_message(message, conversation_id):
+        held.append(limiter.try_acquire("ip:testclient"))
+        return _long_conversation()
+
+    mock_service = MagicMock(spec=ChatUseCase)
+    mock_service.process_message.side_effect = process_message
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.post("/chat/batch", json={"requests": [{"message": "Hello"}], "stream": True})
+
+    assert response.status_code == 200
+    assert held == ["client_in_flight"]
+    assert limiter.try_acquire("ip:testclient") is None
+
+
+def test_chat_is_shed_with_503_when_overloaded(monkeypatch):
+    """
+    Tests that requests over the global in-flight cap are rejected with a 503 and Retry-After.
+    """
+    limiter = InFlightLimiter(max_total=1, max_per_client=0)
+    limiter.try_acquire("someone-else")
+    monkeypatch.setattr(main, "in_flight_limiter", limiter)
+    mock_service = MagicMock(spec=ChatUseCase)
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+
+    response = client.post("/chat", json={"message": "Hello"})
+    health = client.get("/health")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert health.status_code == 200
+    mock_service.process_message.assert_not_called()
+
+
+def test_ready_reports_checks_and_status():
+    """
+    Tests that /ready answers 200 when the critical checks pass and 503 when one fails.
+    """
+    state = {"up": True}
+
+    def redis_check():
+        if not state["up"]:
+            raise ConnectionError("Connection refused")
+
+    probe = ReadinessProbe()
+    probe.add_check("redis", redis_check, cache_seconds=0)
+    app.dependency_overrides[get_readiness_probe] = lambda: probe
+
+    ready = client.get("/ready")
+    state["up"] = False
+    not_ready = client.get("/ready")
+
+    assert ready.status_code == 200
+    assert ready.json()["checks"]["redis"]["ok"] is True
+    assert not_ready.status_code == 503
+    assert not_ready.json()["checks"]["redis"]["error"] == "Connection refused"
@@ -0,0 +1,76 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from chatbot.adapters.api.main import app, get_chat_service
+from chatbot.adapters.api.recording import TrafficRecordingMiddleware
+from chatbot.adapters.observability.recording import RecordingAIProvider, TrafficRecorder
+from chatbot.adapters.storage.in_memory import InMemoryConversationRepository
+from chatbot.domain.ports import GenerativeAIProvider
+from chatbot.domain.services import ChatService
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """
+    Fixture that serves the API behind the recording middleware, with a chat service over a mocked provider.
+
+    Yields:
+        tuple: The client, the recorder and the path of the recording.
+    """
+    path = tmp_path / "traffic.ndjson"
+    recorder = TrafficRecorder(str(path), salt="salt")
+    provider = MagicMock(spec=GenerativeAIProvider)
+    provider.classify_topic_and_stance.return_value = {"topic": "Vaccines", "stance": "pro-vaccine"}
+    provider.get_debate_response.return_value = "Vaccines are dangerous."
+    provider.is_topic_change.return_value = False
+    chat_service = ChatService(InMemoryConversationRepository(), RecordingAIProvider(provider, recorder))
+    app.dependency_overrides[get_chat_service] = lambda: chat_service
+
+    yield TestClient(TrafficRecordingMiddleware(app, recorder)), recorder, path
+
+    app.dependency_overrides.clear()
+    recorder.close()
+
+
+def test_chat_turns_are_recorded_anonymized_with_provider_calls(recording):
+    """
+    Tests that chat turns are recorded with masked texts, chained conversation digests and provider calls.
+    """
+    client, recorder, path = recording
+    first = client.post("/chat", json={"message": "Vaccines work"}, headers={"X-API-Key": "secret"})
+    conversation_id = first.json()["conversation_id"]
+    client.post("/chat", json={"message": "They do", "conversation_id": conversation_id}, headers={"X-API-Key": "secret"})
+    client.get("/health")
+    recorder.flush()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+
+    assert len(records) == 2
+    assert [record["message"] for record in records] == ["xxxxxxxx xxxx", "xxxx xx"]
+    assert records[0]["conversation_id"] is None
+    assert records[1]["conversation_id"] == records[0]["response_conversation_id"]
+    assert all(text not in path.read_text() for text in (conversation_id, "secret", "Vaccines work", "dangerous"))
+    assert records[0]["client"] == records[1]["client"]
+    assert [call["operation"] for call in records[0]["provider_calls"]] == [
+        "classify_topic_and_stance", "get_debate_response"
+    ]
+    assert [call["operation"] for call in records[1]["provider_calls"]] == ["is_topic_change", "get_debate_response"]
+    assert records[0]["provider_calls"][0]["result"] == {"topic": "Vaccines", "stance": "pro-vaccine"}
+    assert records[1]["provider_calls"][1]["result"] == "xxxxxxxx xxx xxxxxxxxx."
+    assert all(record["status"] == 200 and not record["replayed"] for record in records)
+
+
+def test_failed_turns_are_recorded_with_their_status(recording):
+    """
+    Tests that a turn of an unknown conversation is recorded with its error status.
+    """
+    client, recorder, path = recording
+    client.post("/chat", json={"message": "Hi", "conversation_id": "unknown"})
+    recorder.flush()
+
+    record = json.loads(path.read_text())
+    assert record["status"] == 404
+    assert record["response_conversation_id"] is None
@@ -0,0 +1,93 @@
+import http.server
+import threading
+
+import pytest
+from prometheus_client import REGISTRY
+
+from chatbot.adapters.llm import http_client
+from chatbot.adapters.llm.http_client import build_http_client
+
+
+class _OkHandler(http.server.BaseHTTPRequestHandler):
+    """Keep-alive HTTP handler answering every GET with a short body."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    """
+    Fixture that serves HTTP/1.1 with keep-alive on a local port.
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def _connections(kind: str) -> float:
+    """
+    Reads how many requests to the local server used a new or a reused connection.
+    """
+    value = REGISTRY.get_sample_value(
+        "chatbot_http_requests_by_connection_total", {"host": "127.0.0.1", "connection": kind}
+    )
+    return value or 0.0
+
+
+def test_requests_reuse_pooled_connection(server_url):
+    """
+    Tests that consecutive requests reuse the kept-alive connection and are counted as such.
+    """
+    new_before, reused_before = _connections("new"), _connections("reused")
+
+    with build_http_client(max_keepalive_connections=1) as client:
+        for _ in range(3):
+            assert client.get(server_url).status_code == 200
+
+    assert _connections("new") - new_before == 1
+    assert _connections("reused") - reused_before == 2
+
+
+def test_zero_keepalive_opens_connection_per_request(server_url):
+    """
+    Tests that without idle connections kept alive every request opens a new connection.
+    """
+    new_before = _connections("new")
+
+    with build_http_client(max_keepalive_connections=0) as client:
+        client.get(server_url)
+        client.get(server_url)
+
+    assert _connections("new") - new_before == 2
+
+
+def test_http2_falls_back_when_h2_is_missing(server_url, monkeypatch):
+    """
+    Tests that requesting HTTP/2 without the h2 package builds a working HTTP/1.1 client.
+    """
+    monkeypatch.setattr(http_client, "_http2_available", lambda: False)
+
+    with build_http_client(http2=True) as client:
+        response = client.get(server_url)
+
+    assert response.http_version == "HTTP/1.1"
+
+
+def test_timeouts_are_set_per_phase():
+    """
+    Tests that each phase of a request gets its own timeout.
+    """
+    with build_http_client(connect_timeout=1, read_timeout=2, write_timeout=3, pool_timeout=4) as client:
+        assert (client.timeout.connect, client.timeout.read, client.timeout.write, client.timeout.pool) == (1, 2, 3, 4)
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+
+from chatbot.adapters.observability.metrics import (
+    add_stage_observer, record_cache_lookup, record_token_usage, remove_stage_observer, timed, track_stage
+)
+
+
+def _sample(name: str, **labels) -> float:
+    """
+    Reads the current value of a metric sample, treating a missing sample as zero.
+
+    Args:
+        name (str): The sample name.
+        **labels: The sample labels.
+    """
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_timed_records_duration_of_each_call():
+    """
+    Tests that the timed decorator observes one duration per call and preserves the return value.
+    """
+    before = _sample("chatbot_stage_duration_seconds_count", stage="test_stage_ok")
+
+    @timed("test_stage_ok")
+    def add(a, b):
+        return a + b
+
+    assert add(1, 2) == 3
+    assert add(3, 4) == 7
+    assert _sample("chatbot_stage_duration_seconds_count", stage="test_stage_ok") == before + 2
+
+
+def test_timed_counts_errors_and_reraises():
+    """
+    Tests that exceptions raised inside a timed stage are counted and propagated.
+    """
+    @timed("test_stage_error")
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        fail()
+
+    assert _sample("chatbot_errors_total", stage="test_stage_error") == 1
+    assert _sample("chatbot_stage_duration_seconds_count", stage="test_stage_error") == 1
+
+
+def test_stage_observers_get_exact_durations():
+    """
+    Tests that registered stage observers are notified of every stage duration until removed.
+    """
+    observed = []
+
+    def observer(stage, seconds):
+        observed.append((stage, seconds))
+
+    @timed("test_stage_observed")
+    def noop():
+        pass
+
+    add_stage_observer(observer)
+    try:
+        noop()
+        with track_stage("test_block_observed"):
+            pass
+    finally:
+        remove_stage_observer(observer)
+    noop()
+
+    assert [stage for stage, _ in observed] == ["test_stage_observed", "test_block_observed"]
+    assert all(seconds >= 0 for _, seconds in observed)
+
+
+def test_record_token_usage_counts_prompt_and_completion_tokens():
+    """
+    Tests that the usage block of a completion is added to the token counters, and that a missing one is ignored.
+    """
+    record_token_usage("test-model", SimpleNamespace(prompt_tokens=120, completion_tokens=30))
+    record_token_usage("test-model", None)
+
+    assert _sample("chatbot_openai_tokens_total", model="test-model", kind="prompt") == 120
+    assert _sample("chatbot_openai_tokens_total", model="test-model", kind="completion") == 30
+
+
+def test_record_cache_lookup_splits_hits_and_misses():
+    """
+    Tests that cache lookups are counted by result.
+    """
+    record_cache_lookup("test_cache", hit=True)
+    record_cache_lookup("test_cache", hit=False)
+    record_cache_lookup("test_cache", hit=False)
+
+    assert _sample("chatbot_cache_lookups_total", cache="test_cache", result="hit") == 1
+    assert _sample("chatbot_cache_lookups_total", cache="test_cache", result="miss") == 2
@@ -0,0 +1,57 @@
+import threading
+
+import pytest
+
+from chatbot.adapters.observability import profiling
+from chatbot.adapters.observability.profiling import ProfilerBusyError, profile_cpu, profile_memory
+
+
+def _busy_loop(stop: threading.Event):
+    """
+    Burns CPU until told to stop, so that the sampler has something to find.
+
+    Args:
+        stop (threading.Event): Event that ends the loop.
+    """
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profile_cpu_reports_busy_function():
+    """
+    Tests that the sampling profiler attributes samples to a function burning CPU on another thread.
+    """
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_loop, args=(stop,))
+    worker.start()
+    try:
+        report = profile_cpu(0.2, interval_seconds=0.001)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert report.startswith("CPU profile:")
+    assert "_busy_loop" in report
+
+
+def test_profile_memory_reports_growth():
+    """
+    Tests that the memory profile produces a snapshot diff report and leaves tracemalloc as it found it.
+    """
+    report = profile_memory(0.05)
+
+    assert report.startswith("Memory profile over")
+    assert "Top growth:" in report
+    assert not profiling.tracemalloc.is_tracing()
+
+
+def test_profiling_sessions_are_exclusive():
+    """
+    Tests that a second profiling session is rejected while one is running.
+    """
+    profiling._session_lock.acquire()
+    try:
+        with pytest.raises(ProfilerBusyError):
+            profile_cpu(0.01)
+    finally:
+        profiling._session_lock.release()
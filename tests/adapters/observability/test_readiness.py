@@ -0,0 +1,108 @@
+import threading
+from unittest.mock import MagicMock
+
+from chatbot.adapters.observability.readiness import ReadinessProbe
+
+
+def test_ready_when_critical_checks_pass_and_results_are_cached():
+    """
+    Tests that passing checks make the process ready and are not run again while cached.
+    """
+    redis_check = MagicMock()
+    probe = ReadinessProbe()
+    probe.add_check("redis", redis_check, cache_seconds=60)
+
+    first = probe.check()
+    second = probe.check()
+
+    assert first["ready"] is True
+    assert second["checks"]["redis"]["ok"] is True
+    redis_check.assert_called_once()
+
+
+def test_failing_critical_check_makes_process_not_ready():
+    """
+    Tests that a failing critical check is reported with its error and makes the process not ready.
+    """
+    probe = ReadinessProbe()
+    probe.add_check("redis", MagicMock(side_effect=ConnectionError("Connection refused")))
+
+    result = probe.check()
+
+    assert result["ready"] is False
+    assert result["checks"]["redis"]["error"] == "Connection refused"
+
+
+def test_failing_non_critical_check_is_only_reported():
+    """
+    Tests that a failing non-critical check does not affect readiness.
+    """
+    probe = ReadinessProbe()
+    probe.add_check("redis", MagicMock())
+    probe.add_check("openai", MagicMock(side_effect=TimeoutError()), critical=False)
+
+    result = probe.check()
+
+    assert result["ready"] is True
+    assert result["checks"]["openai"] == {
+        "ok": False, "critical": False, "duration_ms": result["checks"]["openai"]["duration_ms"], "error": "TimeoutError"
+    }
+
+
+def test_first_ready_callback_runs_once():
+    """
+    Tests that the first-ready callback runs the first time the process is ready, and only then.
+    """
+    on_first_ready = MagicMock()
+    state = {"up": False}
+
+    def check():
+        if not state["up"]:
+            raise RuntimeError("Warm-up in progress")
+
+    probe = ReadinessProbe(on_first_ready=on_first_ready)
+    probe.add_check("warm_up", check, cache_seconds=0)
+
+    probe.check()
+    on_first_ready.assert_not_called()
+    state["up"] = True
+    probe.check()
+    probe.check()
+    on_first_ready.assert_called_once()
+
+
+def test_slow_check_does_not_block_concurrent_probes():
+    """
+    Tests that while a check is being refreshed, other probes run the other checks and report its
+    previous result instead of waiting for it.
+    """
+    calls = {"openai": 0}
+    refreshing = threading.Event()
+    release = threading.Event()
+
+    def openai_check():
+        calls["openai"] += 1
+        if calls["openai"] > 1:
+            refreshing.set()
+            release.wait(5)
+            raise TimeoutError()
+
+    redis_check = MagicMock()
+    probe = ReadinessProbe()
+    probe.add_check("redis", redis_check, cache_seconds=0)
+    probe.add_check("openai", openai_check, critical=False, cache_seconds=0)
+    probe.check()
+
+    slow_probe = threading.Thread(target=probe.check)
+    slow_probe.start()
+    try:
+        assert refreshing.wait(5)
+        result = probe.check()
+    finally:
+        release.set()
+        slow_probe.join()
+
+    assert result["ready"] is True
+    assert result["checks"]["openai"]["ok"] is True
+    assert redis_check.call_count == 3
+    assert probe.check()["checks"]["openai"]["ok"] is False
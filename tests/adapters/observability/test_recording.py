@@ -0,0 +1,113 @@
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from chatbot.adapters.observability import recording
+from chatbot.adapters.observability.recording import RecordingAIProvider, TrafficRecorder, recording_provider_calls
+from chatbot.domain.ports import GenerativeAIProvider
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    """
+    Fixture that provides a recorder writing to a temporary file.
+    """
+    recorder = TrafficRecorder(str(tmp_path / "traffic.ndjson"), salt="salt")
+    yield recorder
+    recorder.close()
+
+
+def test_texts_are_masked_and_identifiers_digested(recorder, tmp_path):
+    """
+    Tests that masking keeps the shape of a text and that digests are stable for a salt only.
+    """
+    other = TrafficRecorder(str(tmp_path / "other.ndjson"))
+
+    assert recorder.mask("Vaccines work, 100%!") == "xxxxxxxx xxxx, xxx%!"
+    assert recorder.pseudonym("convo-1") == recorder.pseudonym("convo-1")
+    assert recorder.pseudonym("convo-1") != other.pseudonym("convo-1")
+    assert recorder.pseudonym(None) is None
+    other.close()
+
+
+def test_records_are_appended_as_ndjson(recorder, tmp_path):
+    """
+    Tests that records are written one per line and dropped once the recorder is closed.
+    """
+    recorder.write({"offset": 0.1})
+    recorder.write({"offset": 0.2})
+    recorder.flush()
+
+    lines = (tmp_path / "traffic.ndjson").read_text().splitlines()
+    assert [json.loads(line)["offset"] for line in lines] == [0.1, 0.2]
+
+    recorder.write({"offset": 0.3})
+    recorder.close()
+    recorder.write({"offset": 0.4})
+
+    lines = (tmp_path / "traffic.ndjson").read_text().splitlines()
+    assert [json.loads(line)["offset"] for line in lines] == [0.1, 0.2, 0.3]
+
+
+def test_records_are_dropped_while_the_queue_is_full(tmp_path, monkeypatch):
+    """
+    Tests that writing a record never waits for the file, dropping the records that do not fit in the queue.
+    """
+    monkeypatch.setattr(recording, "RECORDING_QUEUE_SIZE", 1)
+    recorder = TrafficRecorder(str(tmp_path / "traffic.ndjson"), salt="salt")
+    writing = threading.Event()
+    resume = threading.Event()
+    file = MagicMock()
+    file.write.side_effect = lambda line: writing.set() or resume.wait(5)
+    recorder._file = file
+
+    recorder.write({"offset": 0.1})
+    assert writing.wait(5)
+    recorder.write({"offset": 0.2})
+    recorder.write({"offset": 0.3})
+    resume.set()
+    recorder.close()
+
+    assert recorder.dropped == 1
+    assert [json.loads(call.args[0])["offset"] for call in file.write.call_args_list] == [0.1, 0.2]
+    file.close.assert_called_once()
+
+
+def test_provider_calls_are_recorded_only_while_recording(recorder):
+    """
+    Tests that provider calls are recorded with their masked result within a recorded request only.
+    """
+    provider = MagicMock(spec=GenerativeAIProvider)
+    provider.classify_topic_and_stance.return_value = {"topic": "Vaccines", "stance": "pro-vaccine"}
+    provider.get_debate_response.return_value = "Not at all."
+    provider.is_topic_change.side_effect = TimeoutError()
+    recording = RecordingAIProvider(provider, recorder)
+
+    recording.get_debate_response("Vaccines", "anti-vaccine", [])
+    with recording_provider_calls() as calls:
+        recording.classify_topic_and_stance("Vaccines work")
+        recording.get_debate_response("Vaccines", "anti-vaccine", [])
+        with pytest.raises(TimeoutError):
+            recording.is_topic_change("Cats", "Vaccines")
+
+    assert [call["operation"] for call in calls] == ["classify_topic_and_stance", "get_debate_response", "is_topic_change"]
+    assert calls[0]["result"] == {"topic": "Vaccines", "stance": "pro-vaccine"}
+    assert calls[1]["result"] == "xxx xx xxx."
+    assert calls[2]["error"] == "TimeoutError"
+    assert provider.get_debate_response.call_count == 2
+
+
+def test_unknown_classification_labels_are_masked(recorder):
+    """
+    Tests that classification labels outside of the known debate stances and topics are masked.
+    """
+    provider = MagicMock(spec=GenerativeAIProvider)
+    provider.classify_topic_and_stance.return_value = {"topic": "My neighbour Bob", "stance": "pro-Bob"}
+    recording = RecordingAIProvider(provider, recorder)
+
+    with recording_provider_calls() as calls:
+        recording.classify_topic_and_stance("Bob is great")
+
+    assert calls[0]["result"] == {"topic": "xx xxxxxxxxx xxx", "stance": "xxx-xxx"}
@@ -0,0 +1,105 @@
+import json
+import logging
+
+import pytest
+
+from chatbot.adapters.observability.structured_logging import JsonFormatter, RequestIdFilter
+from chatbot.adapters.observability.tracing import request_id_headers, request_id_var, span, traced
+
+
+@pytest.fixture
+def bound_request_id():
+    """
+    Fixture that binds a request ID to the current context for the duration of a test.
+    """
+    token = request_id_var.set("req-123")
+    yield "req-123"
+    request_id_var.reset(token)
+
+
+def _span_records(caplog):
+    """
+    Returns the span records captured by caplog.
+
+    Args:
+        caplog: Pytest's caplog fixture.
+    """
+    return [record for record in caplog.records if hasattr(record, "span")]
+
+
+def test_nested_spans_record_parent_and_duration(caplog):
+    """
+    Tests that a span opened inside another one references it as its parent.
+    """
+    caplog.set_level(logging.INFO, logger="chatbot.trace")
+
+    with span("outer", conversation_id="abc"):
+        with span("inner"):
+            pass
+
+    inner, outer = _span_records(caplog)
+    assert inner.span == "inner"
+    assert inner.parent_span_id == outer.span_id
+    assert outer.parent_span_id is None
+    assert outer.conversation_id == "abc"
+    assert outer.duration_ms >= inner.duration_ms
+
+
+def test_traced_marks_failed_spans(caplog):
+    """
+    Tests that a traced call that raises is recorded with an error status and the exception propagates.
+    """
+    caplog.set_level(logging.INFO, logger="chatbot.trace")
+
+    @traced("failing_call")
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        fail()
+
+    (record,) = _span_records(caplog)
+    assert record.span == "failing_call"
+    assert record.status == "error"
+
+
+def test_spans_are_skipped_when_trace_logger_is_disabled(caplog):
+    """
+    Tests that no span record is produced when the trace logger is disabled for INFO.
+    """
+    caplog.set_level(logging.WARNING, logger="chatbot.trace")
+
+    with span("quiet"):
+        pass
+
+    assert _span_records(caplog) == []
+
+
+def test_json_formatter_includes_request_id_and_extras(bound_request_id):
+    """
+    Tests that the JSON formatter renders the request ID and the attributes passed through `extra`.
+    """
+    record = logging.LogRecord("chatbot.test", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+    record.span = "outer"
+    RequestIdFilter().filter(record)
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "hello world"
+    assert payload["request_id"] == bound_request_id
+    assert payload["span"] == "outer"
+    assert payload["level"] == "INFO"
+
+
+def test_request_id_headers_propagate_bound_request_id(bound_request_id):
+    """
+    Tests that the bound request ID is propagated in the outgoing headers.
+    """
+    assert request_id_headers() == {"X-Client-Request-Id": bound_request_id}
+
+
+def test_request_id_headers_are_empty_outside_requests():
+    """
+    Tests that no propagation headers are produced outside of a request.
+    """
+    assert request_id_headers() == {}
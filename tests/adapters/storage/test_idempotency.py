@@ -0,0 +1,69 @@
+import pytest
+from fakeredis import FakeStrictRedis
+
+from src.chatbot.adapters.storage.idempotency import InMemoryIdempotencyStore, RedisIdempotencyStore
+from src.chatbot.domain.models import IdempotencyRecord
+
+
+@pytest.fixture(params=["in_memory", "redis"])
+def store(request):
+    """
+    Fixture that provides each IdempotencyStore implementation, the Redis one backed by fakeredis.
+
+    Args:
+        request: Pytest's request object, carrying the implementation to build.
+    """
+    if request.param == "in_memory":
+        yield InMemoryIdempotencyStore()
+        return
+
+    fake_redis_client = FakeStrictRedis(decode_responses=True)
+    yield RedisIdempotencyStore(client=fake_redis_client)
+    fake_redis_client.flushall()
+
+
+def test_key_is_claimed_once(store):
+    """
+    Tests that only the first claim of a key succeeds and leaves an in-flight record.
+    """
+    assert store.claim("key-1", "abc") is True
+    assert store.claim("key-1", "abc") is False
+    record = store.get("key-1")
+    assert (record.fingerprint, record.status_code, record.body) == ("abc", None, None)
+
+
+def test_complete_records_response(store):
+    """
+    Tests that the response of a claimed key is recorded.
+    """
+    store.claim("key-1", "abc")
+    store.complete("key-1", IdempotencyRecord(fingerprint="abc", status_code=200, body='{"ok":true}'))
+
+    record = store.get("key-1")
+    assert (record.status_code, record.body) == (200, '{"ok":true}')
+    assert store.claim("key-1", "abc") is False
+
+
+def test_release_frees_key(store):
+    """
+    Tests that a released key can be claimed again.
+    """
+    store.claim("key-1", "abc")
+    store.release("key-1")
+
+    assert store.get("key-1") is None
+    assert store.claim("key-1", "abc") is True
+
+
+def test_redis_claim_expires_before_response():
+    """
+    Tests that a claim expires after the lock duration and a response after the longer TTL.
+    """
+    fake_redis_client = FakeStrictRedis(decode_responses=True)
+    store = RedisIdempotencyStore(client=fake_redis_client, ttl_seconds=3600, lock_seconds=60)
+
+    store.claim("key-1", "abc")
+    assert 0 < fake_redis_client.ttl("idempotency:key-1") <= 60
+
+    store.complete("key-1", IdempotencyRecord(fingerprint="abc", status_code=200, body="{}"))
+    assert 60 < fake_redis_client.ttl("idempotency:key-1") <= 3600
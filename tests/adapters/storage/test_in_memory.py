@@ -1,5 +1,9 @@
+from datetime import datetime, timedelta
+
+import pytest
+
 from src.chatbot.adapters.storage.in_memory import InMemoryConversationRepository
-from src.chatbot.domain.models import Conversation
+from src.chatbot.domain.models import ChatMessage, Conversation, TokenUsage
 
 
 def test_save_and_find_by_id_success():
@@ -49,3 +53,63 @@ def test_save_updates_existing_conversation():
     assert retrieved_conversation is not None
     assert retrieved_conversation.topic == "v2"
     assert retrieved_conversation != convo_v1
+
+
+def test_add_usage_accumulates_per_conversation_and_in_total():
+    """
+    Tests that usage is accumulated per conversation and in the aggregate totals.
+    """
+    repo = InMemoryConversationRepository()
+
+    repo.add_usage("convo-1", TokenUsage(prompt_tokens=100, completion_tokens=20, cost=0.5, calls=2))
+    repo.add_usage("convo-1", TokenUsage(prompt_tokens=50, completion_tokens=10, cost=0.25, calls=1))
+    repo.add_usage("convo-2", TokenUsage(prompt_tokens=10, completion_tokens=5, cost=0.1, calls=1))
+
+    usage = repo.get_usage("convo-1")
+    assert usage.prompt_tokens == 150
+    assert usage.completion_tokens == 30
+    assert usage.cost == pytest.approx(0.75)
+    assert usage.calls == 3
+    assert repo.get_usage("unknown") is None
+    assert repo.get_total_usage().prompt_tokens == 160
+    assert repo.get_total_usage().calls == 4
+
+
+def test_find_messages_slices_history():
+    """
+    Tests that pages of messages and the message count are read from the stored conversation.
+    """
+    repo = InMemoryConversationRepository()
+    repo.save(Conversation(
+        id="paged-convo",
+        topic="paging",
+        strategy="strat",
+        messages=[ChatMessage(role="user", message=f"msg {i}") for i in range(5)]
+    ))
+
+    assert [msg.message for msg in repo.find_messages("paged-convo", offset=3, limit=10)] == ["msg 3", "msg 4"]
+    assert repo.count_messages("paged-convo") == 5
+    assert repo.find_messages("unknown", offset=0, limit=10) is None
+    assert repo.count_messages("unknown") is None
+    assert [msg.message for msg in repo.find_message_page("paged-convo", offset=4, limit=10)[1]] == ["msg 4"]
+    assert repo.find_message_page("paged-convo", offset=0, limit=1)[0] == 5
+    assert repo.find_message_page("unknown", offset=0, limit=10) is None
+
+
+def test_count_and_list_conversations_by_topic_and_window():
+    """
+    Tests that conversations can be counted and listed by topic, bot stance and creation time.
+    """
+    repo = InMemoryConversationRepository()
+    now = datetime(2024, 9, 5, 12, 0, 0)
+    repo.save(Conversation(id="recent", topic="Vaccines", strategy="anti-vaccine", created_at=now - timedelta(minutes=5)))
+    repo.save(Conversation(id="older", topic="vaccines", strategy="pro-vaccine", created_at=now - timedelta(minutes=50)))
+    repo.save(Conversation(id="old", topic="Vaccines", strategy="anti-vaccine", created_at=now - timedelta(hours=2)))
+
+    assert repo.count_conversations(topic="VACCINES", since=now - timedelta(hours=1)) == 2
+    assert repo.count_conversations(stance="anti-vaccine") == 2
+    assert repo.list_conversation_ids(topic="vaccines") == ["old", "older", "recent"]
+    assert repo.list_conversation_ids(until=now - timedelta(hours=1)) == ["old"]
+
+    with pytest.raises(ValueError):
+        repo.list_conversation_ids(topic="vaccines", stance="anti-vaccine")
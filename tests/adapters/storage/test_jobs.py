@@ -0,0 +1,70 @@
+import pytest
+from fakeredis import FakeStrictRedis
+
+from src.chatbot.adapters.storage.jobs import InMemoryJobQueue, RedisJobQueue
+from src.chatbot.domain.models import Job
+
+
+@pytest.fixture(params=["in_memory", "redis"])
+def queue(request):
+    """
+    Fixture that provides each JobQueue implementation, the Redis one backed by fakeredis.
+
+    Args:
+        request: Pytest's request object, carrying the implementation to build.
+    """
+    if request.param == "in_memory":
+        yield InMemoryJobQueue()
+        return
+
+    fake_redis_client = FakeStrictRedis(decode_responses=True)
+    yield RedisJobQueue(client=fake_redis_client)
+    fake_redis_client.flushall()
+
+
+def test_enqueue_and_dequeue_in_order(queue):
+    """
+    Tests that queued jobs are handed out oldest first and can be found by ID.
+    """
+    first = Job(message="first")
+    second = Job(message="second", conversation_id="convo-1")
+    queue.enqueue(first)
+    queue.enqueue(second)
+
+    assert queue.get(second.id).conversation_id == "convo-1"
+    assert queue.dequeue(timeout=0.1).id == first.id
+    assert queue.dequeue(timeout=0.1).id == second.id
+    assert queue.dequeue(timeout=0.1) is None
+
+
+def test_update_stores_new_state(queue):
+    """
+    Tests that the state of a job can be updated after it was taken from the queue.
+    """
+    queue.enqueue(Job(message="Hello"))
+    job = queue.dequeue(timeout=0.1)
+    job.status = "failed"
+    job.error = "boom"
+    queue.update(job)
+
+    stored = queue.get(job.id)
+    assert stored.status == "failed"
+    assert stored.error == "boom"
+
+
+def test_get_unknown_job(queue):
+    """
+    Tests that an unknown job is not found.
+    """
+    assert queue.get("missing") is None
+
+
+def test_redis_jobs_expire():
+    """
+    Tests that Redis job documents are stored with an expiry.
+    """
+    fake_redis_client = FakeStrictRedis(decode_responses=True)
+    job = Job(message="Hello")
+    RedisJobQueue(client=fake_redis_client, ttl_seconds=60).enqueue(job)
+
+    assert 0 < fake_redis_client.ttl(f"job:{job.id}") <= 60
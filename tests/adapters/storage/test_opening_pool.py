@@ -0,0 +1,50 @@
+import pytest
+from fakeredis import FakeStrictRedis
+
+from src.chatbot.adapters.storage.opening_pool import InMemoryOpeningArgumentPool, RedisOpeningArgumentPool
+
+
+@pytest.fixture(params=["in_memory", "redis"])
+def pool(request):
+    """
+    Fixture that provides each OpeningArgumentPool implementation, the Redis one backed by fakeredis.
+
+    Args:
+        request: Pytest's request object, carrying the implementation to build.
+    """
+    if request.param == "in_memory":
+        yield InMemoryOpeningArgumentPool()
+        return
+
+    fake_redis_client = FakeStrictRedis(decode_responses=True)
+    yield RedisOpeningArgumentPool(client=fake_redis_client)
+    fake_redis_client.flushall()
+
+
+def test_push_and_pop_in_order(pool):
+    """
+    Tests that pooled arguments are handed out oldest first and the size follows.
+    """
+    pool.push("Vaccines", "anti-vaccine", ["first", "second"])
+
+    assert pool.size("Vaccines", "anti-vaccine") == 2
+    assert pool.pop("Vaccines", "anti-vaccine") == "first"
+    assert pool.size("Vaccines", "anti-vaccine") == 1
+
+
+def test_pop_empty_pool_returns_none(pool):
+    """
+    Tests that popping from an empty pool returns None.
+    """
+    assert pool.pop("Vaccines", "anti-vaccine") is None
+    assert pool.size("Vaccines", "anti-vaccine") == 0
+
+
+def test_topic_is_normalized(pool):
+    """
+    Tests that the topic casing and surrounding spaces returned by the classifier do not split pools.
+    """
+    pool.push("Moon Landing", "anti-moon-landing", ["argument"])
+
+    assert pool.pop(" moon landing ", "anti-moon-landing") == "argument"
+    assert pool.pop("Moon Landing", "pro-moon-landing") is None
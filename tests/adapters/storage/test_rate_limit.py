@@ -0,0 +1,88 @@
+import time
+
+import pytest
+from fakeredis import FakeStrictRedis
+
+from src.chatbot.adapters.storage.rate_limit import InMemoryRateLimiter, RedisRateLimiter
+
+
+@pytest.fixture(params=["in_memory", "redis"])
+def limiter(request):
+    """
+    Fixture that provides each RateLimiter implementation, allowing 2 requests per minute.
+
+    Args:
+        request: Pytest's request object, carrying the implementation to build.
+    """
+    if request.param == "in_memory":
+        yield InMemoryRateLimiter(limit=2, window_seconds=60)
+        return
+
+    fake_redis_client = FakeStrictRedis(decode_responses=True)
+    yield RedisRateLimiter(client=fake_redis_client, limit=2, window_seconds=60)
+    fake_redis_client.flushall()
+
+
+def test_requests_over_limit_are_rejected_with_retry_after(limiter):
+    """
+    Tests that a client is rejected once over its limit, with the time until the window frees up.
+    """
+    assert limiter.acquire("client-a") is None
+    assert limiter.acquire("client-a") is None
+
+    retry_after = limiter.acquire("client-a")
+    assert retry_after is not None
+    assert 0 < retry_after <= 60
+
+
+def test_clients_are_limited_independently(limiter):
+    """
+    Tests that one client reaching its limit does not affect another.
+    """
+    limiter.acquire("client-a")
+    limiter.acquire("client-a")
+
+    assert limiter.acquire("client-a") is not None
+    assert limiter.acquire("client-b") is None
+
+
+def test_window_slides(limiter):
+    """
+    Tests that requests older than the window no longer count.
+    """
+    limiter._window_seconds = 0.05
+    limiter.acquire("client-a")
+    limiter.acquire("client-a")
+    assert limiter.acquire("client-a") is not None
+
+    time.sleep(0.1)
+
+    assert limiter.acquire("client-a") is None
+
+
+def test_redis_rejected_requests_are_not_counted():
+    """
+    Tests that rejected requests are removed from the window.
+    """
+    fake_redis_client = FakeStrictRedis(decode_responses=True)
+    limiter = RedisRateLimiter(client=fake_redis_client, limit=1, window_seconds=60)
+    limiter.acquire("client-a")
+    limiter.acquire("client-a")
+    limiter.acquire("client-a")
+
+    assert fake_redis_client.zcard("rate_limit:client-a") == 1
+
+
+def test_request_cost_counts_as_several_requests(limiter):
+    """
+    Tests that a request with a cost uses that many requests of the window, capped to the limit.
+    """
+    assert limiter.acquire("client-a", cost=2) is None
+    assert limiter.acquire("client-a") is not None
+    assert limiter.acquire("client-b") is None
+
+    retry_after = limiter.acquire("client-b", cost=2)
+    assert retry_after is not None
+    assert 0 < retry_after <= 60
+    assert limiter.acquire("client-b") is None
+    assert limiter.acquire("client-c", cost=50) is None
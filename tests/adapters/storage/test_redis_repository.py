@@ -1,8 +1,10 @@
+from datetime import datetime, timedelta
+
 import pytest
 from fakeredis import FakeStrictRedis
 
 from src.chatbot.adapters.storage.redis_repository import RedisConversationRepository
-from src.chatbot.domain.models import Conversation
+from src.chatbot.domain.models import ChatMessage, Conversation, TokenUsage
 
 
 @pytest.fixture
@@ -82,3 +84,227 @@ def test_save_updates_existing_conversation(mock_redis_repo: RedisConversationRe
     assert retrieved_conversation.topic == "version2"
     assert retrieved_conversation.model_dump() != convo_v1.model_dump()
     assert retrieved_conversation.model_dump() == convo_v2.model_dump()
+
+
+def test_add_usage_increments_counters(mock_redis_repo: RedisConversationRepository):
+    """
+    Tests that usage is accumulated with atomic counters, per conversation and in total,
+    without touching the stored conversation.
+
+    Args:
+        mock_redis_repo: The mocked RedisConversationRepository instance.
+    """
+    conversation = Conversation(id="usage-convo", topic="usage", strategy="strat")
+    mock_redis_repo.save(conversation)
+
+    mock_redis_repo.add_usage("usage-convo", TokenUsage(prompt_tokens=100, completion_tokens=20, cost=0.5, calls=2))
+    mock_redis_repo.add_usage("usage-convo", TokenUsage(prompt_tokens=50, completion_tokens=10, cost=0.25, calls=1))
+    mock_redis_repo.add_usage("other-convo", TokenUsage(prompt_tokens=10, completion_tokens=5, cost=0.1, calls=1))
+
+    usage = mock_redis_repo.get_usage("usage-convo")
+    assert usage.prompt_tokens == 150
+    assert usage.completion_tokens == 30
+    assert usage.cost == pytest.approx(0.75)
+    assert usage.calls == 3
+    assert mock_redis_repo.get_usage("unknown") is None
+    assert mock_redis_repo.get_total_usage().prompt_tokens == 160
+    assert mock_redis_repo.find_by_id("usage-convo").model_dump() == conversation.model_dump()
+
+
+def _conversation_with_messages(conversation_id: str, count: int) -> Conversation:
+    """
+    Builds a conversation with the given number of messages.
+
+    Args:
+        conversation_id (str): The ID of the conversation.
+        count (int): The number of messages.
+    """
+    return Conversation(
+        id=conversation_id,
+        topic="paging",
+        strategy="strat",
+        messages=[ChatMessage(role="user" if i % 2 == 0 else "bot", message=f"msg {i}") for i in range(count)]
+    )
+
+
+def test_find_messages_reads_a_page(mock_redis_repo: RedisConversationRepository):
+    """
+    Tests that pages of messages are read from the message list, and the count without loading them.
+
+    Args:
+        mock_redis_repo: The mocked RedisConversationRepository instance.
+    """
+    mock_redis_repo.save(_conversation_with_messages("paged-convo", 7))
+
+    page = mock_redis_repo.find_messages("paged-convo", offset=2, limit=3)
+
+    assert [msg.message for msg in page] == ["msg 2", "msg 3", "msg 4"]
+    assert mock_redis_repo.find_messages("paged-convo", offset=6, limit=3)[0].message == "msg 6"
+    assert mock_redis_repo.find_messages("paged-convo", offset=10, limit=3) == []
+    assert mock_redis_repo.count_messages("paged-convo") == 7
+    assert mock_redis_repo.client.llen("conversation:paged-convo:messages") == 7
+    total, page = mock_redis_repo.find_message_page("paged-convo", offset=5, limit=3)
+    assert (total, [msg.message for msg in page]) == (7, ["msg 5", "msg 6"])
+
+
+def test_find_messages_of_unknown_conversation(mock_redis_repo: RedisConversationRepository):
+    """
+    Tests that range reads of an unknown conversation return None.
+
+    Args:
+        mock_redis_repo: The mocked RedisConversationRepository instance.
+    """
+    assert mock_redis_repo.find_messages("unknown", offset=0, limit=10) is None
+    assert mock_redis_repo.count_messages("unknown") is None
+    assert mock_redis_repo.find_message_page("unknown", offset=0, limit=10) is None
+
+
+def test_save_replaces_message_list(mock_redis_repo: RedisConversationRepository):
+    """
+    Tests that saving a conversation with fewer messages does not leave stale messages behind.
+
+    Args:
+        mock_redis_repo: The mocked RedisConversationRepository instance.
+    """
+    mock_redis_repo.save(_conversation_with_messages("shrinking-convo", 6))
+    mock_redis_repo.save(_conversation_with_messages("shrinking-convo", 2))
+
+    assert len(mock_redis_repo.find_by_id("shrinking-convo").messages) == 2
+    assert mock_redis_repo.count_messages("shrinking-convo") == 2
+
+
+def test_save_of_a_read_conversation_only_pushes_new_messages(mock_redis_repo: RedisConversationRepository):
+    """
+    Tests that saving a conversation read from Redis appends its new messages without rewriting the others,
+    and that a retried save does not duplicate them.
+
+    Args:
+        mock_redis_repo: The mocked RedisConversationRepository instance.
+    """
+    mock_redis_repo.save(_conversation_with_messages("growing-convo", 4))
+    messages_key = "conversation:growing-convo:messages"
+    mock_redis_repo.client.lset(messages_key, 0, ChatMessage(role="user", message="kept").model_dump_json())
+
+    conversation = mock_redis_repo.find_by_id("growing-convo")
+    conversation.messages.append(ChatMessage(role="user", message="msg 4"))
+    conversation.messages.append(ChatMessage(role="bot", message="msg 5"))
+    mock_redis_repo.save(conversation)
+    conversation._persisted_messages = 4
+    mock_redis_repo.save(conversation)
+
+    stored = mock_redis_repo.find_by_id("growing-convo")
+    assert [msg.message for msg in stored.messages] == ["kept", "msg 1", "msg 2", "msg 3", "msg 4", "msg 5"]
+
+
+def test_save_without_new_messages_leaves_message_list_untouched(mock_redis_repo: RedisConversationRepository):
+    """
+    Tests that a save adding no message, like a summary update, keeps messages appended meanwhile.
+
+    Args:
+        mock_redis_repo: The mocked RedisConversationRepository instance.
+    """
+    mock_redis_repo.save(_conversation_with_messages("summarized-convo", 4))
+    conversation = mock_redis_repo.find_by_id("summarized-convo")
+    mock_redis_repo.client.rpush(
+        "conversation:summarized-convo:messages", ChatMessage(role="user", message="msg 4").model_dump_json()
+    )
+
+    conversation.summary = "A summary"
+    mock_redis_repo.save(conversation)
+
+    stored = mock_redis_repo.find_by_id("summarized-convo")
+    assert stored.summary == "A summary"
+    assert len(stored.messages) == 5
+
+
+def test_update_summary_keeps_turns_saved_meanwhile(mock_redis_repo: RedisConversationRepository):
+    """
+    Tests that a summary update only replaces the summary fields, keeping the turns and metadata saved
+    since the summarized conversation was read, and is refused if another summary was stored meanwhile.
+
+    Args:
+        mock_redis_repo: The mocked RedisConversationRepository instance.
+    """
+    mock_redis_repo.save(_conversation_with_messages("summarized-convo", 4))
+    concurrent_turn = mock_redis_repo.find_by_id("summarized-convo")
+    concurrent_turn.messages.append(ChatMessage(role="user", message="msg 4"))
+    concurrent_turn.topic = "new topic"
+    mock_redis_repo.save(concurrent_turn)
+
+    assert mock_redis_repo.update_summary("summarized-convo", "A summary", 2, expected_summarized_count=0)
+    assert not mock_redis_repo.update_summary("summarized-convo", "Stale", 3, expected_summarized_count=0)
+    assert not mock_redis_repo.update_summary("unknown", "A summary", 2, expected_summarized_count=0)
+
+    stored = mock_redis_repo.find_by_id("summarized-convo")
+    assert (stored.summary, stored.summarized_count, stored.topic) == ("A summary", 2, "new topic")
+    assert len(stored.messages) == 5
+
+
+def test_legacy_conversation_is_readable_and_migrated_on_save(mock_redis_repo: RedisConversationRepository):
+    """
+    Tests that a conversation stored as a single JSON document under its bare ID is still read,
+    and moved to the new layout when saved.
+
+    Args:
+        mock_redis_repo: The mocked RedisConversationRepository instance.
+    """
+    legacy = _conversation_with_messages("legacy-convo", 4)
+    mock_redis_repo.client.set("legacy-convo", legacy.model_dump_json())
+
+    assert mock_redis_repo.find_by_id("legacy-convo").model_dump() == legacy.model_dump()
+    assert mock_redis_repo.count_messages("legacy-convo") == 4
+    assert [msg.message for msg in mock_redis_repo.find_messages("legacy-convo", 1, 2)] == ["msg 1", "msg 2"]
+    total, page = mock_redis_repo.find_message_page("legacy-convo", 3, 2)
+    assert (total, [msg.message for msg in page]) == (4, ["msg 3"])
+
+    mock_redis_repo.save(legacy)
+
+    assert mock_redis_repo.client.get("legacy-convo") is None
+    assert mock_redis_repo.find_by_id("legacy-convo").model_dump() == legacy.model_dump()
+
+
+def test_iter_conversations_includes_legacy_conversations(mock_redis_repo: RedisConversationRepository, caplog):
+    """
+    Tests that the export iterator yields conversations of both layouts, and skips other unprefixed keys.
+
+    Args:
+        mock_redis_repo: The mocked RedisConversationRepository instance.
+        caplog: Pytest's log capture fixture.
+    """
+    mock_redis_repo.save_many([_conversation_with_messages(f"convo-{i}", 2) for i in range(3)])
+    mock_redis_repo.client.set("legacy-convo", _conversation_with_messages("legacy-convo", 4).model_dump_json())
+    mock_redis_repo.client.set("unrelated", "not a conversation")
+
+    conversations = list(mock_redis_repo.iter_conversations(batch_size=2))
+
+    assert sorted(c.id for c in conversations) == ["convo-0", "convo-1", "convo-2", "legacy-convo"]
+    assert len(next(c for c in conversations if c.id == "legacy-convo").messages) == 4
+    assert "Skipped 1 unprefixed keys" in caplog.text
+
+
+def test_indexes_answer_counts_and_listings_over_time_windows(mock_redis_repo: RedisConversationRepository):
+    """
+    Tests that saved conversations are indexed by creation time, topic and bot stance.
+
+    Args:
+        mock_redis_repo: The mocked RedisConversationRepository instance.
+    """
+    now = datetime(2024, 9, 5, 12, 0, 0)
+    for index, (topic, strategy, age) in enumerate([
+        ("Vaccines", "anti-vaccine", timedelta(minutes=10)),
+        ("vaccines", "pro-vaccine", timedelta(minutes=30)),
+        ("Vaccines", "anti-vaccine", timedelta(hours=3)),
+        ("Flat Earth", "pro-flat-earth", timedelta(minutes=5)),
+    ]):
+        mock_redis_repo.save(Conversation(id=f"c{index}", topic=topic, strategy=strategy, created_at=now - age))
+    mock_redis_repo.save(Conversation(id="c0", topic="Vaccines", strategy="anti-vaccine", created_at=now - timedelta(minutes=10)))
+
+    last_hour = now - timedelta(hours=1)
+    assert mock_redis_repo.count_conversations(topic="VACCINES", since=last_hour) == 2
+    assert mock_redis_repo.count_conversations(stance="anti-vaccine") == 2
+    assert mock_redis_repo.count_conversations(since=last_hour, until=now) == 3
+    assert mock_redis_repo.list_conversation_ids(topic="vaccines") == ["c2", "c1", "c0"]
+    assert mock_redis_repo.list_conversation_ids(since=last_hour, offset=1, limit=1) == ["c0"]
+
+    with pytest.raises(ValueError):
+        mock_redis_repo.count_conversations(topic="vaccines", stance="anti-vaccine")
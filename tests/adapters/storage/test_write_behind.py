@@ -0,0 +1,186 @@
+import threading
+import time
+
+import pytest
+
+from src.chatbot.adapters.storage.in_memory import InMemoryConversationRepository
+from src.chatbot.adapters.storage.write_behind import WriteBehindConversationRepository
+from src.chatbot.domain.models import ChatMessage, Conversation
+
+
+class GatedRepository(InMemoryConversationRepository):
+    """In-memory repository whose bulk writes wait for a gate and can be made to fail."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.failures = 0
+        self.batches = []
+
+    def save_many(self, conversations, batch_size=500):
+        self.gate.wait()
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Redis unavailable")
+        conversations = list(conversations)
+        self.batches.append([conversation.id for conversation in conversations])
+        return super().save_many(conversations, batch_size)
+
+
+@pytest.fixture
+def backend() -> GatedRepository:
+    """
+    Fixture that provides the repository the write-behind buffer writes to.
+    """
+    return GatedRepository()
+
+
+@pytest.fixture
+def repository(backend: GatedRepository):
+    """
+    Fixture that provides a write-behind repository over the gated backend.
+
+    Args:
+        backend (GatedRepository): The wrapped repository.
+    """
+    repo = WriteBehindConversationRepository(backend, max_pending=2, linger_seconds=0.01, retry_seconds=0.01)
+    yield repo
+    backend.gate.set()
+    repo.close(timeout=5)
+
+
+def _conversation(conversation_id: str, messages: int = 1) -> Conversation:
+    """
+    Builds a conversation with the given number of messages.
+    """
+    return Conversation(
+        id=conversation_id,
+        topic="Vaccines",
+        strategy="anti-vaccine",
+        messages=[ChatMessage(role="user", message=f"msg {i}") for i in range(messages)]
+    )
+
+
+def _wait_until(predicate, timeout: float = 5.0):
+    """
+    Polls until the predicate holds, failing the test after the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+def test_save_returns_before_write_and_reads_from_buffer(repository, backend):
+    """
+    Tests that a save is acknowledged before it is written and is readable meanwhile.
+    """
+    backend.gate.clear()
+    repository.save(_conversation("convo-1", messages=3))
+
+    assert backend.find_by_id("convo-1") is None
+    assert repository.find_by_id("convo-1").id == "convo-1"
+    assert repository.count_messages("convo-1") == 3
+    assert [m.message for m in repository.find_messages("convo-1", 1, 5)] == ["msg 1", "msg 2"]
+    assert repository.find_message_page("convo-1", 2, 5)[0] == 3
+
+    backend.gate.set()
+    assert repository.flush(timeout=5)
+    assert backend.count_messages("convo-1") == 3
+    assert repository.pending() == 0
+
+
+def test_saves_of_a_buffered_conversation_are_coalesced(repository, backend):
+    """
+    Tests that several saves of a conversation waiting to be flushed are written once, with the latest version.
+    """
+    backend.gate.clear()
+    repository.save(_conversation("in-flight"))
+    _wait_until(lambda: repository._flushing)
+    for messages in range(1, 5):
+        repository.save(_conversation("convo-1", messages=messages))
+
+    backend.gate.set()
+    assert repository.flush(timeout=5)
+    assert backend.batches.count(["convo-1"]) == 1
+    assert backend.count_messages("convo-1") == 4
+
+
+def test_returned_conversations_are_copies(repository):
+    """
+    Tests that mutating a saved or read conversation does not change the buffered copy.
+    """
+    conversation = _conversation("convo-1")
+    repository.save(conversation)
+    conversation.messages.append(ChatMessage(role="bot", message="changed"))
+    repository.find_by_id("convo-1").messages.clear()
+
+    assert repository.count_messages("convo-1") == 1
+
+
+def test_update_summary_applies_to_buffered_copy(repository, backend):
+    """
+    Tests that a summary update of a buffered conversation is buffered with it, and that other
+    conversations are updated in the wrapped repository.
+    """
+    backend.save(_conversation("stored"))
+    backend.gate.clear()
+    repository.save(_conversation("buffered", messages=3))
+
+    assert repository.update_summary("buffered", "A summary", 1, expected_summarized_count=0)
+    assert not repository.update_summary("buffered", "Stale", 2, expected_summarized_count=0)
+    assert repository.update_summary("stored", "Other summary", 1, expected_summarized_count=0)
+    assert backend.find_by_id("stored").summary == "Other summary"
+
+    backend.gate.set()
+    assert repository.flush(timeout=5)
+    stored = backend.find_by_id("buffered")
+    assert (stored.summary, stored.summarized_count, len(stored.messages)) == ("A summary", 1, 3)
+
+
+def test_save_blocks_when_buffer_is_full(repository, backend):
+    """
+    Tests that saving more than max_pending conversations waits for a flush.
+    """
+    backend.gate.clear()
+    repository.save(_conversation("in-flight"))
+    _wait_until(lambda: repository._flushing)
+    repository.save(_conversation("convo-1"))
+    repository.save(_conversation("convo-2"))
+
+    blocked = threading.Thread(target=repository.save, args=(_conversation("convo-3"),))
+    blocked.start()
+    blocked.join(timeout=0.2)
+    assert blocked.is_alive()
+
+    backend.gate.set()
+    blocked.join(timeout=5)
+    assert not blocked.is_alive()
+    assert repository.flush(timeout=5)
+    assert backend.find_by_id("convo-3") is not None
+
+
+def test_failed_flush_is_retried(repository, backend):
+    """
+    Tests that conversations whose flush failed stay readable and are written on retry.
+    """
+    backend.failures = 2
+    repository.save(_conversation("convo-1"))
+
+    assert repository.flush(timeout=5)
+    assert backend.find_by_id("convo-1") is not None
+
+
+def test_close_drains_buffer_and_rejects_saves(backend):
+    """
+    Tests that closing writes every buffered conversation and rejects later saves.
+    """
+    repository = WriteBehindConversationRepository(backend, linger_seconds=1.0)
+    repository.save(_conversation("convo-1"))
+    repository.save(_conversation("convo-2"))
+
+    assert repository.close(timeout=5)
+    assert backend.count_conversations() == 2
+    with pytest.raises(RuntimeError):
+        repository.save(_conversation("convo-3"))
@@ -0,0 +1,124 @@
+import asyncio
+import random
+
+import openai
+import pytest
+
+from benchmarks.fake_openai import COUNTER_ARGUMENT, FakeOpenAIServer, parse_latency
+from benchmarks.load_test import _histogram_quantile, build_repository, in_process_client, run_load_test
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """
+    Fixture that serves a fake OpenAI API without latency and points the OpenAI client at it.
+    """
+    with FakeOpenAIServer(seed=1) as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        yield server
+
+
+def test_fake_server_answers_the_chatbot_prompts(fake_openai):
+    """
+    Tests that the fake server answers classifications, topic change checks and debate turns.
+    """
+    client = openai.OpenAI(max_retries=0)
+
+    def complete(content, json_mode=False):
+        extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+        response = client.chat.completions.create(
+            model="gpt-4o-mini", messages=[{"role": "user", "content": content}], **extra
+        )
+        return response.choices[0].message.content
+
+    assert complete("Vaccines save lives", json_mode=True) == '{"topic":"Vaccines","stance":"pro-vaccine"}'
+    assert complete('Respond with "is_topic_change"', json_mode=True) == '{"is_topic_change": false}'
+    assert complete("The moon landing was fake") == COUNTER_ARGUMENT
+    assert client.models.retrieve("gpt-4o-mini").id == "gpt-4o-mini"
+
+
+def test_fake_server_streams_completions(fake_openai):
+    """
+    Tests that streamed completions are sent in chunks that add up to the answer.
+    """
+    stream = openai.OpenAI(max_retries=0).chat.completions.create(
+        model="gpt-4o-mini", messages=[{"role": "user", "content": "Hi"}], stream=True
+    )
+
+    deltas = [chunk.choices[0].delta.content for chunk in stream if chunk.choices]
+
+    assert len(deltas) > 2
+    assert "".join(delta or "" for delta in deltas) == COUNTER_ARGUMENT
+
+
+def test_fake_server_injects_errors():
+    """
+    Tests that completions fail at the configured error rate.
+    """
+    with FakeOpenAIServer(error_rate=1.0, error_status=503) as server:
+        client = openai.OpenAI(base_url=server.base_url, max_retries=0)
+        with pytest.raises(openai.InternalServerError):
+            client.chat.completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": "Hi"}])
+        assert (server.requests, server.errors) == (1, 1)
+
+
+def test_parse_latency():
+    """
+    Tests the latency distributions.
+    """
+    rng = random.Random(1)
+
+    assert parse_latency("0", rng)() == 0.0
+    assert parse_latency("constant:0.25", rng)() == 0.25
+    assert 0.1 <= parse_latency("uniform:0.1,0.2", rng)() <= 0.2
+    assert parse_latency("lognormal:0.3,0.5", rng)() > 0
+    with pytest.raises(ValueError):
+        parse_latency("pareto:1", rng)
+
+
+def test_histogram_quantile_interpolates_within_buckets():
+    """
+    Tests that quantiles are interpolated within the bucket they fall in.
+    """
+    buckets = [(0.1, 50.0), (0.2, 100.0), (float("inf"), 100.0)]
+
+    assert _histogram_quantile(buckets, 0.5) == pytest.approx(0.1)
+    assert _histogram_quantile(buckets, 0.75) == pytest.approx(0.15)
+    assert _histogram_quantile([(0.1, 0.0), (float("inf"), 0.0)], 0.5) == 0.0
+
+
+@pytest.mark.parametrize("repository", ["memory", "fakeredis"])
+def test_load_test_reports_turns_and_stages(fake_openai, repository):
+    """
+    Tests a short load test run against each repository.
+    """
+    async def run():
+        async with in_process_client(build_repository(repository)) as client:
+            return await run_load_test(client, repository, users=2, debates=3, turns=2, in_process=True)
+
+    report = asyncio.run(run())
+
+    assert not report.approximate_stages
+    assert report.turns == 6
+    assert report.failures == 0
+    assert report.latency.count == 6
+    assert report.stages["generation"].count == 6
+    assert report.stages["repository_write"].count == 6
+    assert report.stages["classification"].count == 3
+
+
+def test_in_process_stage_percentiles_are_exact(monkeypatch):
+    """
+    Tests that in process, stage percentiles come from the exact durations rather than the histogram
+    buckets, so a constant completion latency is reported as such and no stage outlasts the turns.
+    """
+    async def run():
+        async with in_process_client(build_repository("memory")) as client:
+            return await run_load_test(client, "memory", users=2, debates=4, turns=2, in_process=True)
+
+    with FakeOpenAIServer(latency="constant:0.03", seed=1) as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        report = asyncio.run(run())
+
+    assert 0.03 <= report.stages["generation"].p50 < 0.05
+    assert report.stages["request"].p50 <= report.latency.p50
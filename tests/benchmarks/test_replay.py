@@ -0,0 +1,78 @@
+from benchmarks.replay import load_recording, replay
+from chatbot.adapters.storage.in_memory import InMemoryConversationRepository
+
+
+def _record(offset, conversation_id, response_conversation_id, calls, status=200):
+    """
+    Builds a recorded chat turn.
+    """
+    return {
+        "offset": offset,
+        "client": "client",
+        "message": "xxxx",
+        "conversation_id": conversation_id,
+        "status": status,
+        "duration_ms": 10.0,
+        "replayed": False,
+        "response_conversation_id": response_conversation_id,
+        "provider_calls": calls,
+    }
+
+
+CLASSIFY = {"operation": "classify_topic_and_stance", "duration_ms": 5.0, "result": {"topic": "Vaccines", "stance": "pro-vaccine"}}
+RESPOND = {"operation": "get_debate_response", "duration_ms": 20.0, "result": "xxx xx"}
+ON_TOPIC = {"operation": "is_topic_change", "duration_ms": 5.0, "result": False}
+
+
+def test_replay_chains_conversation_turns_and_skips_unreplayable_ones():
+    """
+    Tests that turns of a conversation are replayed in order, with the recorded provider answers.
+    """
+    repository = InMemoryConversationRepository()
+    records = [
+        _record(0.0, None, "a", [CLASSIFY, RESPOND]),
+        _record(0.01, "a", "a", [ON_TOPIC, RESPOND]),
+        _record(0.02, "a", None, [], status=429),
+        _record(0.03, "a", "a", [ON_TOPIC, RESPOND]),
+        _record(0.04, "started-before", "started-before", [ON_TOPIC, RESPOND]),
+    ]
+
+    report = replay(records, repository, speed=10)
+
+    assert (report.turns, report.skipped, report.failures, report.unrecorded_calls) == (3, 2, 0, 0)
+    assert report.pooled_openings == 0
+    [conversation_id] = repository.list_conversation_ids()
+    conversation = repository.find_by_id(conversation_id)
+    assert conversation.topic == "Vaccines"
+    assert [message.message for message in conversation.messages] == ["xxxx", "xxx xx"] * 3
+    assert report.latency.p50 >= 0.002
+    assert report.cpu_ms_per_turn > 0
+
+
+def test_replay_answers_pooled_openings_from_the_pool():
+    """
+    Tests that new conversations recorded as answered from the opening pool are replayed through the pool.
+    """
+    repository = InMemoryConversationRepository()
+    records = [
+        _record(0.0, None, "a", [CLASSIFY]),
+        _record(0.01, "a", "a", [ON_TOPIC, RESPOND]),
+        _record(0.2, None, "b", [CLASSIFY, RESPOND]),
+    ]
+
+    report = replay(records, repository, speed=10)
+
+    assert (report.turns, report.pooled_openings, report.unrecorded_calls) == (3, 1, 0)
+    assert sorted(repository.find_by_id(id).strategy for id in repository.list_conversation_ids()) == [
+        "anti-vaccine", "anti-vaccine"
+    ]
+
+
+def test_load_recording_orders_records_by_offset(tmp_path):
+    """
+    Tests that records are read in the order of their arrival.
+    """
+    path = tmp_path / "traffic.ndjson"
+    path.write_text('{"offset": 2.0}\n{"offset": 1.0}\n\n')
+
+    assert [record["offset"] for record in load_recording(str(path))] == [1.0, 2.0]
@@ -11,3 +11,16 @@ def set_openai_api_key(monkeypatch):
     from raising an error during its initialization in a test environment.
     """
     monkeypatch.setenv("OPENAI_API_KEY", "DUMMY_KEY_FOR_TESTING")
+
+
+@pytest.fixture(autouse=True)
+def disable_rate_limiting(monkeypatch):
+    """
+    Disable the Redis-backed rate limiter for all tests.
+
+    The API builds its limiter when it is imported, so setting RATE_LIMIT_REQUESTS does not reach it:
+    the limiter itself is removed from the API module. There is no Redis server in the test environment,
+    so tests that exercise rate limiting set an in-memory limiter instead.
+    """
+    monkeypatch.setenv("RATE_LIMIT_REQUESTS", "0")
+    monkeypatch.setattr("chatbot.adapters.api.main.rate_limiter", None)
@@ -1,9 +1,13 @@
 import pytest
 from unittest.mock import Mock, MagicMock
 
-from chatbot.domain.models import ChatMessage, Conversation
-from chatbot.domain.ports import ConversationRepository, GenerativeAIProvider
-from chatbot.domain.services import ChatService
+from chatbot.adapters.storage.in_memory import InMemoryConversationRepository
+from chatbot.adapters.storage.jobs import InMemoryJobQueue
+from chatbot.adapters.storage.opening_pool import InMemoryOpeningArgumentPool
+from chatbot.domain.models import ChatMessage, Conversation, Job
+from chatbot.domain.ports import ChatUseCase, ConversationRepository, GenerativeAIProvider
+from chatbot.domain.services import OPENING_POOL_USAGE_ID, ChatService, JobWorker, OpeningPoolRefiller
+from chatbot.domain.usage import record_usage
 
 
 @pytest.fixture
@@ -134,3 +138,200 @@ def test_process_message_for_invalid_conversation_id(
     mock_ai_provider.classify_topic_and_stance.assert_not_called()
     mock_ai_provider.get_debate_response.assert_not_called()
     mock_repository.save.assert_not_called()
+
+
+def test_process_message_answers_known_stance_from_opening_pool(
+    mock_repository: Mock, mock_ai_provider: Mock
+):
+    """
+    Tests that a new conversation on a known stance is answered from the opening pool
+    without generating a live debate response.
+    Args:
+        mock_repository (Mock): The mocked ConversationRepository.
+        mock_ai_provider (Mock): The mocked GenerativeAIProvider.
+    """
+    pool = InMemoryOpeningArgumentPool()
+    pool.push("Moon Landing", "anti-moon-landing", ["The shadows in the photos are inconsistent."])
+    mock_ai_provider.classify_topic_and_stance.return_value = {
+        "topic": "Moon Landing",
+        "stance": "pro-moon-landing"
+    }
+    chat_service = ChatService(
+        repository=mock_repository, ai_provider=mock_ai_provider, opening_pool=pool
+    )
+
+    result_conversation = chat_service.process_message(message="The moon landing was real.")
+
+    mock_ai_provider.get_debate_response.assert_not_called()
+    mock_repository.save.assert_called_once_with(result_conversation)
+    assert result_conversation.strategy == "anti-moon-landing"
+    assert result_conversation.messages[1].message == "The shadows in the photos are inconsistent."
+    assert pool.size("Moon Landing", "anti-moon-landing") == 0
+
+
+def test_process_message_pops_opening_pool_of_canonical_topic(
+    mock_repository: Mock, mock_ai_provider: Mock
+):
+    """
+    Tests that the opening pool is read under the canonical topic of the bot stance, where the refiller
+    stocks it, whatever wording the classifier used for the topic.
+    Args:
+        mock_repository (Mock): The mocked ConversationRepository.
+        mock_ai_provider (Mock): The mocked GenerativeAIProvider.
+    """
+    pool = InMemoryOpeningArgumentPool()
+    pool.push("Vaccines", "anti-vaccine", ["Side effects are underreported."])
+    mock_ai_provider.classify_topic_and_stance.return_value = {
+        "topic": "Vaccine safety",
+        "stance": "pro-vaccine"
+    }
+    chat_service = ChatService(
+        repository=mock_repository, ai_provider=mock_ai_provider, opening_pool=pool
+    )
+
+    result_conversation = chat_service.process_message(message="Vaccines are safe.")
+
+    mock_ai_provider.get_debate_response.assert_not_called()
+    assert result_conversation.topic == "Vaccine safety"
+    assert result_conversation.messages[1].message == "Side effects are underreported."
+
+
+def test_process_message_falls_back_to_llm_when_opening_pool_is_empty(
+    mock_repository: Mock, mock_ai_provider: Mock
+):
+    """
+    Tests that an empty opening pool falls back to a live debate response.
+    Args:
+        mock_repository (Mock): The mocked ConversationRepository.
+        mock_ai_provider (Mock): The mocked GenerativeAIProvider.
+    """
+    mock_ai_provider.classify_topic_and_stance.return_value = {
+        "topic": "Moon Landing",
+        "stance": "pro-moon-landing"
+    }
+    mock_ai_provider.get_debate_response.return_value = "That's a naive perspective."
+    chat_service = ChatService(
+        repository=mock_repository, ai_provider=mock_ai_provider, opening_pool=InMemoryOpeningArgumentPool()
+    )
+
+    result_conversation = chat_service.process_message(message="The moon landing was real.")
+
+    mock_ai_provider.get_debate_response.assert_called_once()
+    assert result_conversation.messages[1].message == "That's a naive perspective."
+
+
+def test_opening_pool_refiller_tops_up_pools_below_low_water(mock_ai_provider: Mock):
+    """
+    Tests that the refiller fills pools below the low-water mark up to the high-water mark
+    and leaves pools that are stocked enough untouched.
+    Args:
+        mock_ai_provider (Mock): The mocked GenerativeAIProvider.
+    """
+    pool = InMemoryOpeningArgumentPool()
+    pool.push("Vaccines", "anti-vaccine", ["a", "b", "c"])
+    pool.push("Vaccines", "pro-vaccine", ["a"])
+    mock_ai_provider.get_opening_argument.return_value = "Generated argument."
+
+    refiller = OpeningPoolRefiller(
+        pool=pool, ai_provider=mock_ai_provider, repository=InMemoryConversationRepository(), low_water=2, high_water=3
+    )
+    generated = refiller.refill_once()
+
+    assert pool.size("Vaccines", "anti-vaccine") == 3
+    assert pool.size("Vaccines", "pro-vaccine") == 3
+    assert pool.size("Flat Earth", "anti-flat-earth") == 3
+    assert generated == 2 + 3 * 6
+
+
+def test_opening_pool_refiller_records_usage_of_generated_arguments(mock_ai_provider: Mock):
+    """
+    Tests that the usage of the generated opening arguments is added to the totals under its own bucket.
+    Args:
+        mock_ai_provider (Mock): The mocked GenerativeAIProvider.
+    """
+    def opening_argument(topic, position):
+        record_usage(prompt_tokens=50, completion_tokens=100, cost=0.001)
+        return "Generated argument."
+
+    repository = InMemoryConversationRepository()
+    mock_ai_provider.get_opening_argument.side_effect = opening_argument
+    refiller = OpeningPoolRefiller(
+        pool=InMemoryOpeningArgumentPool(), ai_provider=mock_ai_provider, repository=repository,
+        low_water=1, high_water=1
+    )
+
+    generated = refiller.refill_once()
+
+    assert repository.get_usage(OPENING_POOL_USAGE_ID).calls == generated == 8
+    assert repository.get_total_usage().prompt_tokens == 50 * 8
+
+
+def test_process_message_records_usage_of_the_turn(
+    chat_service: ChatService, mock_repository: Mock, mock_ai_provider: Mock
+):
+    """
+    Tests that the usage reported by every provider call of a turn is added to the conversation once.
+    Args:
+        chat_service (ChatService): The ChatService instance under test.
+        mock_repository (Mock): The mocked ConversationRepository.
+        mock_ai_provider (Mock): The mocked GenerativeAIProvider.
+    """
+    def classify(message):
+        record_usage(prompt_tokens=100, completion_tokens=10, cost=0.001)
+        return {"topic": "Vaccines", "stance": "pro-vaccine"}
+
+    def debate(**kwargs):
+        record_usage(prompt_tokens=200, completion_tokens=50, cost=0.002)
+        return "Counter-argument."
+
+    mock_ai_provider.classify_topic_and_stance.side_effect = classify
+    mock_ai_provider.get_debate_response.side_effect = debate
+
+    result_conversation = chat_service.process_message(message="Vaccines are safe.")
+
+    mock_repository.add_usage.assert_called_once()
+    conversation_id, usage = mock_repository.add_usage.call_args.args
+    assert conversation_id == result_conversation.id
+    assert (usage.prompt_tokens, usage.completion_tokens, usage.calls) == (300, 60, 2)
+    assert usage.cost == pytest.approx(0.003)
+
+
+def test_job_worker_stores_result_of_processed_job():
+    """
+    Tests that the worker processes a queued turn and stores the resulting conversation on the job.
+    """
+    queue = InMemoryJobQueue()
+    job = Job(message="Vaccines are safe.")
+    queue.enqueue(job)
+    conversation = Conversation(id="convo-1", topic="Vaccines", strategy="anti-vaccine")
+    mock_chat_service = MagicMock(spec=ChatUseCase)
+    mock_chat_service.process_message.return_value = conversation
+
+    worker = JobWorker(queue=queue, chat_service=mock_chat_service, dequeue_timeout_seconds=0.01)
+
+    assert worker.run_once() is True
+    assert worker.run_once() is False
+    stored = queue.get(job.id)
+    assert stored.status == "succeeded"
+    assert stored.result.id == "convo-1"
+    assert stored.finished_at is not None
+    assert stored.updated_at == stored.finished_at
+    mock_chat_service.process_message.assert_called_once_with(message="Vaccines are safe.", conversation_id=None)
+
+
+def test_job_worker_records_failure():
+    """
+    Tests that a turn that raises marks its job as failed with the error detail.
+    """
+    queue = InMemoryJobQueue()
+    job = Job(message="Hello", conversation_id="missing")
+    queue.enqueue(job)
+    mock_chat_service = MagicMock(spec=ChatUseCase)
+    mock_chat_service.process_message.side_effect = ValueError("Conversation not found")
+
+    JobWorker(queue=queue, chat_service=mock_chat_service, dequeue_timeout_seconds=0.01).run_once()
+
+    stored = queue.get(job.id)
+    assert stored.status == "failed"
+    assert stored.error == "Conversation not found"
+    assert stored.result is None
@@ -1,7 +1,10 @@
 import pytest
 from unittest.mock import Mock
+from chatbot.adapters.storage.in_memory import InMemoryConversationRepository
 from chatbot.domain.models import Conversation, ChatMessage
-from chatbot.domain.services import ChatService, MAX_CONVERSATION_MESSAGES, MAX_USER_MESSAGES
+from chatbot.domain.services import (
+    ChatService, MAX_CONVERSATION_MESSAGES, MAX_USER_MESSAGES, RECENT_HISTORY_MESSAGES
+)
 
 
 @pytest.fixture
@@ -70,3 +73,175 @@ def test_process_message_stops_when_conversation_limit_is_reached(
     mock_ai_provider.get_debate_response.assert_not_called()
 
     mock_repository.save.assert_called_once_with(final_conversation)
+
+
+def _debate_messages(count: int):
+    """
+    Builds an alternating user/bot message history of the given length.
+
+    Args:
+        count (int): The number of messages to build.
+    """
+    return [
+        ChatMessage(role="user" if i % 2 == 0 else "bot", message=f"msg {i}") for i in range(count)
+    ]
+
+
+def test_process_message_folds_old_turns_into_summary(monkeypatch, mock_ai_provider: Mock):
+    """
+    Tests that once the history outgrows the recent window, the older turns are summarized
+    and stored on the conversation.
+
+    Args:
+        monkeypatch: Pytest's monkeypatch fixture, used to raise the message limit.
+        mock_ai_provider (Mock): The mocked AI provider.
+    """
+    monkeypatch.setattr("chatbot.domain.services.MAX_CONVERSATION_MESSAGES", 20)
+    repository = InMemoryConversationRepository()
+    conversation = Conversation(id="long-convo", topic="testing", strategy="strategy")
+    conversation.messages = _debate_messages(8)
+    repository.save(conversation)
+
+    mock_ai_provider.is_topic_change.return_value = False
+    mock_ai_provider.get_debate_response.return_value = "Counter-argument."
+    mock_ai_provider.summarize.return_value = "They argued about testing."
+
+    ChatService(repository=repository, ai_provider=mock_ai_provider).process_message(
+        message="Another point", conversation_id="long-convo"
+    )
+
+    stored = repository.find_by_id("long-convo")
+    mock_ai_provider.summarize.assert_called_once_with(
+        previous_summary="", messages=stored.messages[:5]
+    )
+    assert stored.summary == "They argued about testing."
+    assert stored.summarized_count == 5
+    assert len(stored.messages) == 10
+
+
+def test_process_message_sends_summary_with_recent_history(
+        chat_service: ChatService,
+        mock_repository: Mock,
+        mock_ai_provider: Mock
+):
+    """
+    Tests that the stored summary is passed to the AI provider along with the recent turns only.
+
+    Args:
+        chat_service (ChatService): The ChatService instance under test.
+        mock_repository (Mock): The mocked repository.
+        mock_ai_provider (Mock): The mocked AI provider.
+    """
+    conversation = Conversation(
+        id="summarized-convo", topic="testing", strategy="strategy",
+        summary="Earlier arguments.", summarized_count=2
+    )
+    conversation.messages = _debate_messages(6)
+    mock_repository.find_by_id.return_value = conversation
+    mock_ai_provider.is_topic_change.return_value = False
+    mock_ai_provider.get_debate_response.return_value = "Counter-argument."
+
+    chat_service.process_message(message="New point", conversation_id="summarized-convo")
+
+    kwargs = mock_ai_provider.get_debate_response.call_args.kwargs
+    assert kwargs["summary"] == "Earlier arguments."
+    assert kwargs["history"] == conversation.messages[-(RECENT_HISTORY_MESSAGES + 1):-1]
+    mock_ai_provider.summarize.assert_not_called()
+
+
+def test_process_message_sends_messages_not_yet_summarized(
+        chat_service: ChatService,
+        mock_repository: Mock,
+        mock_ai_provider: Mock
+):
+    """
+    Tests that the messages older than the recent window are still sent while they are not summarized.
+
+    Args:
+        chat_service (ChatService): The ChatService instance under test.
+        mock_repository (Mock): The mocked repository.
+        mock_ai_provider (Mock): The mocked AI provider.
+    """
+    conversation = Conversation(
+        id="summarized-convo", topic="testing", strategy="strategy", summary="Opening.", summarized_count=1
+    )
+    conversation.messages = _debate_messages(8)
+    mock_repository.find_by_id.return_value = conversation
+    mock_ai_provider.is_topic_change.return_value = False
+    mock_ai_provider.get_debate_response.return_value = "Counter-argument."
+
+    chat_service.process_message(message="New point", conversation_id="summarized-convo")
+
+    kwargs = mock_ai_provider.get_debate_response.call_args.kwargs
+    assert kwargs["summary"] == "Opening."
+    assert kwargs["history"] == conversation.messages[1:-1]
+
+
+def test_whole_conversation_is_sent_at_default_message_limit(mock_ai_provider: Mock):
+    """
+    Tests that, at the default message limit, no summary is generated and every debate response is
+    generated from the whole conversation.
+
+    Args:
+        mock_ai_provider (Mock): The mocked AI provider.
+    """
+    repository = InMemoryConversationRepository()
+    mock_ai_provider.classify_topic_and_stance.return_value = {"topic": "testing", "stance": "unknown"}
+    mock_ai_provider.is_topic_change.return_value = False
+    mock_ai_provider.get_debate_response.return_value = "Counter-argument."
+    service = ChatService(repository=repository, ai_provider=mock_ai_provider)
+
+    conversation = service.process_message(message="point 0")
+    for i in range(1, MAX_USER_MESSAGES):
+        conversation = service.process_message(message=f"point {i}", conversation_id=conversation.id)
+
+    assert len(conversation.messages) == MAX_CONVERSATION_MESSAGES
+    assert mock_ai_provider.get_debate_response.call_args.kwargs["history"] == conversation.messages[:-1]
+    mock_ai_provider.summarize.assert_not_called()
+
+
+def test_process_message_refreshes_summary_on_executor(monkeypatch, mock_repository: Mock, mock_ai_provider: Mock):
+    """
+    Tests that, when an executor is configured, the summary refresh is submitted to it
+    instead of running on the request path.
+
+    Args:
+        monkeypatch: Pytest's monkeypatch fixture, used to raise the message limit.
+        mock_repository (Mock): The mocked repository.
+        mock_ai_provider (Mock): The mocked AI provider.
+    """
+    monkeypatch.setattr("chatbot.domain.services.MAX_CONVERSATION_MESSAGES", 20)
+    conversation = Conversation(id="long-convo", topic="testing", strategy="strategy")
+    conversation.messages = _debate_messages(8)
+    mock_repository.find_by_id.return_value = conversation
+    mock_ai_provider.is_topic_change.return_value = False
+    mock_ai_provider.get_debate_response.return_value = "Counter-argument."
+    executor = Mock()
+
+    service = ChatService(repository=mock_repository, ai_provider=mock_ai_provider, summary_executor=executor)
+    service.process_message(message="Another point", conversation_id="long-convo")
+
+    executor.submit.assert_called_once_with(service._refresh_summary, "long-convo")
+    mock_ai_provider.summarize.assert_not_called()
+
+
+def test_refresh_summary_only_updates_summary_fields(mock_repository: Mock, mock_ai_provider: Mock):
+    """
+    Tests that a refreshed summary is stored with a field-level update based on the summarized count it
+    was built upon, instead of saving back the conversation read before the AI provider call.
+
+    Args:
+        mock_repository (Mock): The mocked repository.
+        mock_ai_provider (Mock): The mocked AI provider.
+    """
+    conversation = Conversation(id="long-convo", topic="testing", strategy="strategy", summary="Opening.")
+    conversation.messages = _debate_messages(9)
+    mock_repository.find_by_id.return_value = conversation
+    mock_ai_provider.summarize.return_value = "They argued about testing."
+
+    ChatService(repository=mock_repository, ai_provider=mock_ai_provider)._refresh_summary("long-convo")
+
+    mock_repository.update_summary.assert_called_once_with(
+        "long-convo", "They argued about testing.", summarized_count=4, expected_summarized_count=0
+    )
+    mock_repository.save.assert_not_called()
@@ -0,0 +1,110 @@
+import gzip
+import io
+import json
+
+import pytest
+from fakeredis import FakeStrictRedis
+
+from chatbot import cli
+from chatbot.adapters.storage.in_memory import InMemoryConversationRepository
+from chatbot.adapters.storage.redis_repository import RedisConversationRepository
+from chatbot.domain.models import ChatMessage, Conversation
+
+
+@pytest.fixture
+def redis_repo(monkeypatch):
+    """
+    Fixture that provides a RedisConversationRepository backed by fakeredis, also returned by the bootstrap.
+
+    Args:
+        monkeypatch: Pytest's monkeypatch fixture for modifying behavior during tests.
+    """
+    fake_redis_client = FakeStrictRedis(decode_responses=True)
+    monkeypatch.setattr("redis.from_url", lambda *args, **kwargs: fake_redis_client)
+    repo = RedisConversationRepository()
+    monkeypatch.setattr(cli, "get_conversation_repository", lambda: repo)
+    yield repo
+    fake_redis_client.flushall()
+
+
+def _conversations(count: int):
+    """
+    Builds conversations with a couple of messages each.
+
+    Args:
+        count (int): The number of conversations.
+    """
+    return [
+        Conversation(
+            id=f"convo-{i}",
+            topic="Vaccines",
+            strategy="anti-vaccine",
+            messages=[ChatMessage(role="user", message=f"hello {i}"), ChatMessage(role="bot", message="no")]
+        )
+        for i in range(count)
+    ]
+
+
+def test_export_streams_every_conversation_in_batches(redis_repo: RedisConversationRepository):
+    """
+    Tests that every conversation is exported as one NDJSON line, across several SCAN batches.
+    """
+    redis_repo.save_many(_conversations(25), batch_size=10)
+    output = io.StringIO()
+
+    exported = cli.export_conversations(redis_repo, output, batch_size=7)
+
+    lines = output.getvalue().splitlines()
+    assert exported == 25
+    assert sorted(json.loads(line)["id"] for line in lines) == sorted(f"convo-{i}" for i in range(25))
+    assert json.loads(lines[0])["messages"][1] == {"role": "bot", "message": "no"}
+
+
+def test_import_round_trips_an_export(redis_repo: RedisConversationRepository):
+    """
+    Tests that an export loaded into an empty repository restores the same conversations and indexes.
+    """
+    target = InMemoryConversationRepository()
+    target.save_many(_conversations(5))
+    dump = io.StringIO()
+    cli.export_conversations(target, dump)
+
+    imported = cli.import_conversations(redis_repo, io.StringIO(dump.getvalue() + "\n"), batch_size=2)
+
+    assert imported == 5
+    assert redis_repo.find_by_id("convo-3").model_dump() == target.find_by_id("convo-3").model_dump()
+    assert redis_repo.count_conversations(topic="vaccines") == 5
+
+
+def test_main_exports_and_imports_gzip_files(redis_repo: RedisConversationRepository, tmp_path):
+    """
+    Tests the command line round trip through a gzip-compressed file.
+    """
+    redis_repo.save_many(_conversations(3))
+    dump_path = tmp_path / "conversations.ndjson.gz"
+
+    assert cli.main(["export", "--output", str(dump_path)]) == 0
+    with gzip.open(dump_path, "rt", encoding="utf-8") as dump:
+        assert len(dump.read().splitlines()) == 3
+
+    redis_repo.client.flushall()
+    assert cli.main(["import", "--input", str(dump_path)]) == 0
+    assert redis_repo.count_messages("convo-2") == 2
+
+
+def test_closing_gzip_streams_closes_their_files(tmp_path):
+    """
+    Tests that closing a gzip export or import stream also closes the file under it.
+    """
+    path = str(tmp_path / "conversations.ndjson.gz")
+
+    output = cli._open_output(path, compress=True)
+    output.write("{}\n")
+    output_file = output.buffer.myfileobj
+    output.close()
+    source = cli._open_input(path, compressed=True)
+    assert source.read() == "{}\n"
+    source_file = source.buffer.myfileobj
+    source.close()
+
+    assert output_file.closed and source_file.closed
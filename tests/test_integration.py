@@ -33,24 +33,31 @@ def override_dependencies():
 
     app.dependency_overrides.clear()
 
-def test_full_flow_new_and_continue_conversation(httpx_mock: object):
+def test_full_flow_new_and_continue_conversation(httpx_mock: object, monkeypatch: pytest.MonkeyPatch):
     """
     Tests the full conversation flow, including starting a new conversation and continuing an existing one.
 
     Args:
         httpx_mock (object): The httpx_mock fixture for mocking HTTP requests.
+        monkeypatch (pytest.MonkeyPatch): The fixture configuring the admin token the usage is read with.
     """
     openai_url = "https://api.openai.com/v1/chat/completions"
 
     httpx_mock.add_response(
         url=openai_url,
         method="POST",
-        json={"choices": [{"message": {"content": json.dumps(MOCK_CLASSIFY_RESPONSE)}}]}
+        json={
+            "choices": [{"message": {"content": json.dumps(MOCK_CLASSIFY_RESPONSE)}}],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120}
+        }
     )
     httpx_mock.add_response(
         url=openai_url,
         method="POST",
-        json={"choices": [{"message": {"content": MOCK_DEBATE_RESPONSE_1}}]}
+        json={
+            "choices": [{"message": {"content": MOCK_DEBATE_RESPONSE_1}}],
+            "usage": {"prompt_tokens": 300, "completion_tokens": 80, "total_tokens": 380}
+        }
     )
 
     initial_payload = {"message": "I believe vaccines are safe and effective."}
@@ -88,6 +95,13 @@ def test_full_flow_new_and_continue_conversation(httpx_mock: object):
     assert data_2["message"][3]["role"] == "bot"
     assert data_2["message"][3]["message"] == MOCK_DEBATE_RESPONSE_2
 
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    usage = client.get(f"/conversations/{conversation_id}/usage", headers={"X-Admin-Token": "secret"}).json()
+    assert usage["prompt_tokens"] == 400
+    assert usage["completion_tokens"] == 100
+    assert usage["calls"] == 2
+    assert usage["cost"] == pytest.approx((400 * 0.15 + 100 * 0.60) / 1_000_000)
+
 def test_health_check_integration():
     """
     Tests the health check endpoint to ensure the API is running.
@@ -95,3 +109,23 @@ def test_health_check_integration():
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
+
+
+def test_openai_ping_retrieves_configured_model(httpx_mock: object):
+    """
+    Tests that pinging the provider retrieves its model from the OpenAI API.
+
+    Args:
+        httpx_mock (object): The httpx_mock fixture for mocking HTTP requests.
+    """
+    from chatbot.adapters.llm.openai_provider import OpenAIProvider
+
+    httpx_mock.add_response(
+        url="https://api.openai.com/v1/models/gpt-4o-mini",
+        method="GET",
+        json={"id": "gpt-4o-mini", "object": "model", "created": 0, "owned_by": "openai"}
+    )
+
+    OpenAIProvider().ping()
+
+    assert len(httpx_mock.get_requests()) == 1